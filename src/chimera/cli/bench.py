@@ -0,0 +1,636 @@
+#!/usr/bin/env python
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2026-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from chimera.core.bus import Bus
+from chimera.core.lock import lock
+from chimera.core.version import chimera_version
+
+__all__ = ["Settings", "compare", "main", "run_suite"]
+
+RESULTS_VERSION = 1
+
+BENCHMARKS = ("rtt", "throughput", "lane", "payload", "fanout")
+MODES = ("inproc", "subprocess")
+
+# the object every benchmark calls, served without a Manager
+OBJECT = "/Bench/0"
+EVENT = "tick"
+
+
+@dataclass(frozen=True)
+class Settings:
+    # sequential requests timed one by one
+    requests: int = 2_000
+    # concurrent callers of the throughput and lane benchmarks
+    clients: tuple[int, ...] = (1, 8, 32)
+    # how long each throughput/lane point runs, in seconds
+    duration: float = 2.0
+    payload_size: int = 16 * 1024 * 1024
+    payload_count: int = 5
+    subscribers: int = 4
+    events: int = 2_000
+    # best of `repeat` runs of each benchmark: less noise to compare
+    repeat: int = 1
+
+
+QUICK = Settings(
+    requests=200,
+    clients=(1, 4),
+    duration=0.3,
+    payload_size=1024 * 1024,
+    payload_count=2,
+    subscribers=2,
+    events=200,
+)
+
+
+class _Target:
+    """What the benchmarks call: no work, so only the bus is measured."""
+
+    def __init__(self, bus: Bus):
+        self.bus = bus
+        self.pub = f"{bus.url.bus}{OBJECT}"
+        self._blobs: dict[int, bytes] = {}
+
+    def serve(self) -> None:
+        # stands in for the Manager: one object, resolvable and with a handle
+        self.bus.resolve_request = self._resolve_request  # type: ignore[method-assign]
+        self.bus.resolve_object = self._resolve_object  # type: ignore[method-assign]
+
+    def _method(self, method: str) -> Callable[..., Any] | None:
+        if method.startswith("_") or method in ("bus", "pub", "serve"):
+            return None
+        return getattr(self, method, None)
+
+    def _resolve_request(
+        self, object: str, method: str
+    ) -> tuple[str | None, Callable[..., Any] | None]:
+        if object != OBJECT:
+            return None, None
+        return OBJECT, self._method(method)
+
+    def _resolve_object(
+        self, object: str
+    ) -> tuple[str | None, Callable[[str], Callable[..., Any] | None] | None]:
+        if object != OBJECT:
+            return None, None
+        return OBJECT, self._method
+
+    def get_location(self) -> str:
+        return OBJECT
+
+    def noop(self) -> None:
+        pass
+
+    @lock
+    def locked(self) -> None:
+        pass
+
+    def blob(self, size: int) -> bytes:
+        blob = self._blobs.get(size)
+        if blob is None:
+            blob = self._blobs[size] = os.urandom(size)
+        return blob
+
+    def offer_blob(self, size: int) -> dict[str, Any]:
+        return self.bus.offer(self.blob(size))
+
+    def burst(self, n: int) -> None:
+        for i in range(n):
+            self.bus.publish(pub=self.pub, event=EVENT, args=[i])
+
+
+def _free_url() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"tcp://127.0.0.1:{s.getsockname()[1]}"
+
+
+def _start_bus(url: str) -> tuple[Bus, threading.Thread]:
+    bus = Bus(url)
+    thread = threading.Thread(target=bus.run_forever, name="bench-bus", daemon=True)
+    thread.start()
+    return bus, thread
+
+
+def _stop_bus(bus: Bus, thread: threading.Thread) -> None:
+    bus.shutdown()
+    thread.join(timeout=5)
+
+
+def serve(url: str) -> None:
+    """Serve the benchmark object on `url` until stdin closes: the server
+    side of the subprocess mode."""
+    bus, thread = _start_bus(url)
+    _Target(bus).serve()
+    print("ready", flush=True)
+    try:
+        sys.stdin.read()
+    finally:
+        _stop_bus(bus, thread)
+
+
+class _Server:
+    """The bus serving the benchmark object: a thread of this process
+    (inproc) or a child process of its own (subprocess), for a server that
+    does not share the client's GIL."""
+
+    def __init__(self, mode: str):
+        self.url = _free_url()
+        self._bus: tuple[Bus, threading.Thread] | None = None
+        self._process: subprocess.Popen[str] | None = None
+
+        if mode == "inproc":
+            self._bus = _start_bus(self.url)
+            _Target(self._bus[0]).serve()
+            return
+
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "chimera.cli.bench", "--serve", self.url],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        assert self._process.stdout is not None
+        if self._process.stdout.readline().strip() != "ready":
+            self.close()
+            raise RuntimeError(f"benchmark server on {self.url} did not start")
+
+    def close(self) -> None:
+        if self._bus is not None:
+            _stop_bus(*self._bus)
+        if self._process is not None:
+            assert self._process.stdin is not None
+            self._process.stdin.close()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+
+
+class _Client:
+    def __init__(self, server: str):
+        self.bus, self._thread = _start_bus(_free_url())
+        self.src = f"{self.bus.url.bus}/Proxy/0"
+        self.dst = f"{server}{OBJECT}"
+        # as a Proxy does: resolves the object and agrees on a binary codec
+        pong = self.bus.ping(src=self.src, dst=self.dst)
+        if pong is None or not pong.ok:
+            self.close()
+            raise RuntimeError(f"cannot reach {self.dst}")
+        self.handle = pong.handle
+
+    def call(self, method: str, *args: Any) -> Any:
+        response = self.bus.request(
+            src=self.src,
+            dst=self.dst,
+            method=method,
+            args=list(args),
+            timeout=60,
+            handle=self.handle,
+        )
+        if response.error:
+            raise RuntimeError(f"{method}: {response.error}")
+        return response.result
+
+    def close(self) -> None:
+        _stop_bus(self.bus, self._thread)
+
+
+def _metric(value: float, unit: str, better: str) -> dict[str, Any]:
+    return {"value": value, "unit": unit, "better": better}
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _bench_rtt(client: _Client, settings: Settings) -> dict[str, dict[str, Any]]:
+    for _ in range(min(100, settings.requests)):
+        client.call("noop")
+
+    samples = []
+    for _ in range(settings.requests):
+        t0 = time.perf_counter()
+        client.call("noop")
+        samples.append(time.perf_counter() - t0)
+
+    return {
+        "p50": _metric(_percentile(samples, 0.5) * 1e6, "μs", "lower"),
+        "p99": _metric(_percentile(samples, 0.99) * 1e6, "μs", "lower"),
+    }
+
+
+def _calls_per_second(
+    client: _Client, method: str, clients: int, duration: float
+) -> float:
+    start = threading.Barrier(clients + 1)
+    deadline = 0.0
+
+    def caller() -> int:
+        start.wait()
+        n = 0
+        while time.perf_counter() < deadline:
+            client.call(method)
+            n += 1
+        return n
+
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        futures = [pool.submit(caller) for _ in range(clients)]
+        deadline = time.perf_counter() + duration
+        t0 = time.perf_counter()
+        start.wait()
+        total = sum(future.result() for future in futures)
+        elapsed = time.perf_counter() - t0
+
+    return total / elapsed
+
+
+def _bench_calls(method: str) -> Callable[[_Client, Settings], dict[str, Any]]:
+    def bench(client: _Client, settings: Settings) -> dict[str, dict[str, Any]]:
+        return {
+            f"c{clients}": _metric(
+                _calls_per_second(client, method, clients, settings.duration),
+                "req/s",
+                "higher",
+            )
+            for clients in settings.clients
+        }
+
+    return bench
+
+
+def _bench_payload(client: _Client, settings: Settings) -> dict[str, dict[str, Any]]:
+    size = settings.payload_size
+    mib = settings.payload_count * size / (1024 * 1024)
+    # first call builds the blob on the server
+    client.call("blob", size)
+
+    t0 = time.perf_counter()
+    for _ in range(settings.payload_count):
+        assert len(client.call("blob", size)) == size
+    inline = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(settings.payload_count):
+        handle = client.call("offer_blob", size)
+        data = b"".join(client.bus.pull(handle, src=client.src))
+        assert len(data) == size
+    streamed = time.perf_counter() - t0
+
+    return {
+        "inline": _metric(mib / inline, "MiB/s", "higher"),
+        "stream": _metric(mib / streamed, "MiB/s", "higher"),
+    }
+
+
+def _bench_fanout(client: _Client, settings: Settings) -> dict[str, dict[str, Any]]:
+    n = settings.events
+    server = client.dst.removesuffix(OBJECT)
+    subscribers = [_Client(server) for _ in range(settings.subscribers)]
+    received = [0] * len(subscribers)
+    last = [0.0]
+    progress = threading.Condition()
+
+    def counter(index: int) -> Callable[[int], None]:
+        def callback(i: int) -> None:
+            with progress:
+                received[index] += 1
+                last[0] = time.perf_counter()
+                progress.notify_all()
+
+        return callback
+
+    try:
+        pub = client.dst
+        for index, subscriber in enumerate(subscribers):
+            subscriber.bus.subscribe(
+                sub=subscriber.src, pub=pub, event=EVENT, callback=counter(index)
+            )
+            # same connection, handled in order: subscribed once this returns
+            subscriber.call("noop")
+
+        t0 = time.perf_counter()
+        client.call("burst", n)
+        with progress:
+            # until everything arrived, or nothing did for a while (lost)
+            while sum(received) < n * len(subscribers):
+                before = sum(received)
+                progress.wait(timeout=2)
+                if sum(received) == before:
+                    break
+            delivered = sum(received)
+            elapsed = max(last[0] - t0, 1e-9)
+    finally:
+        for subscriber in subscribers:
+            subscriber.close()
+
+    return {
+        "deliveries": _metric(delivered / elapsed, "events/s", "higher"),
+        "lost": _metric(n * len(subscribers) - delivered, "events", "lower"),
+    }
+
+
+BENCHES: dict[str, Callable[[_Client, Settings], dict[str, dict[str, Any]]]] = {
+    "rtt": _bench_rtt,
+    "throughput": _bench_calls("noop"),
+    "lane": _bench_calls("locked"),
+    "payload": _bench_payload,
+    "fanout": _bench_fanout,
+}
+
+
+def _best(runs: list[dict[str, dict[str, Any]]]) -> dict[str, dict[str, Any]]:
+    best = {}
+    for name in runs[0]:
+        pick = min if runs[0][name]["better"] == "lower" else max
+        best[name] = pick((run[name] for run in runs), key=lambda m: m["value"])
+    return best
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(
+    settings: Settings = Settings(),
+    *,
+    modes: tuple[str, ...] = MODES,
+    benches: tuple[str, ...] = BENCHMARKS,
+    progress: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    """Run the benchmarks against a fresh server per mode and return the
+    results document: {"version", "meta", "results"}, results keyed
+    "mode.bench.metric", each {"value", "unit", "better"}."""
+    results: dict[str, dict[str, Any]] = {}
+    for mode in modes:
+        server = _Server(mode)
+        client = _Client(server.url)
+        try:
+            for bench in benches:
+                if progress:
+                    progress(f"{mode} {bench}")
+                runs = [
+                    BENCHES[bench](client, settings) for _ in range(settings.repeat)
+                ]
+                for name, metric in _best(runs).items():
+                    results[f"{mode}.{bench}.{name}"] = metric
+        finally:
+            client.close()
+            server.close()
+
+    return {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "commit": _git_commit(),
+            "chimera": chimera_version,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "date": datetime.datetime.now(datetime.UTC).isoformat(timespec="seconds"),
+            "settings": {
+                key: list(value) if isinstance(value, tuple) else value
+                for key, value in settings.__dict__.items()
+            },
+        },
+        "results": results,
+    }
+
+
+def compare(
+    base: dict[str, Any], new: dict[str, Any], threshold: float = 10.0
+) -> list[dict[str, Any]]:
+    """Every metric in both documents, with its change in percent (positive
+    is better) and a status: "regression" when worse by more than
+    `threshold` percent, "improved" when better by as much, "ok" otherwise."""
+    rows = []
+    for name, metric in new["results"].items():
+        old = base["results"].get(name)
+        if old is None:
+            continue
+        before, after = old["value"], metric["value"]
+        higher = metric["better"] == "higher"
+        if before == after:
+            change = 0.0
+        elif before == 0:
+            # from zero (lost events, say) there is no percentage
+            change = float("inf") if (after > 0) == higher else float("-inf")
+        else:
+            change = (after - before) / abs(before) * 100
+            if not higher:
+                change = -change
+
+        if change < -threshold:
+            status = "regression"
+        elif change > threshold:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append(
+            {
+                "name": name,
+                "unit": metric["unit"],
+                "base": before,
+                "new": after,
+                "change": change,
+                "status": status,
+            }
+        )
+    return rows
+
+
+def _table(title: str, *columns: str) -> Table:
+    table = Table(
+        title=title,
+        title_justify="left",
+        title_style="bold",
+        box=box.SIMPLE,
+        pad_edge=False,
+    )
+    for column in columns:
+        table.add_column(column)
+    return table
+
+
+def _print_results(console: Console, document: dict[str, Any]) -> None:
+    meta = document["meta"]
+    table = _table(
+        f"chimera {meta['chimera']} ({meta['commit'] or 'no commit'}), "
+        f"Python {meta['python']}, {meta['cpus']} CPUs",
+        "benchmark",
+        "value",
+        "unit",
+    )
+    for name, metric in document["results"].items():
+        table.add_row(name, f"{metric['value']:,.1f}", metric["unit"])
+    console.print(table)
+
+
+def _print_comparison(
+    console: Console, base: dict[str, Any], new: dict[str, Any], rows: list[Any]
+) -> None:
+    table = _table(
+        f"{base['meta']['commit'] or 'base'} → {new['meta']['commit'] or 'new'}",
+        "benchmark",
+        "base",
+        "new",
+        "unit",
+        "change",
+        "",
+    )
+    styles = {"regression": "red", "improved": "green", "ok": ""}
+    for row in rows:
+        table.add_row(
+            row["name"],
+            f"{row['base']:,.1f}",
+            f"{row['new']:,.1f}",
+            row["unit"],
+            f"{row['change']:+.1f}%",
+            row["status"] if row["status"] != "ok" else "",
+            style=styles[row["status"]],
+        )
+    console.print(table)
+
+
+def _load(path: str) -> dict[str, Any]:
+    with open(path) as f:
+        document = json.load(f)
+    if document.get("version") != RESULTS_VERSION:
+        raise SystemExit(f"{path}: not a chimera-bench results file")
+    return document
+
+
+def _csv(value: str) -> tuple[str, ...]:
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+def main(args: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="chimera-bench",
+        description="Bus benchmarks: request latency and throughput, @lock "
+        "lanes, large payloads and event fan-out, against a server in this "
+        "process and in a subprocess.",
+    )
+    parser.add_argument("--version", action="version", version=chimera_version)
+    parser.add_argument(
+        "-o", "--output", metavar="FILE", help="Write the results as JSON to FILE"
+    )
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASE", "NEW"),
+        help="Compare two results files instead of running; exits 1 on regressions",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="Change, in percent, past which a metric counts as a regression "
+        "[default=%(default)s]",
+    )
+    parser.add_argument(
+        "--only",
+        type=_csv,
+        default=BENCHMARKS,
+        help=f"Benchmarks to run, from {','.join(BENCHMARKS)}",
+    )
+    parser.add_argument(
+        "--mode",
+        type=_csv,
+        default=MODES,
+        help=f"Where the server runs, from {','.join(MODES)}",
+    )
+    parser.add_argument(
+        "--clients",
+        type=lambda value: tuple(int(n) for n in _csv(value)),
+        help="Concurrent callers of the throughput and lane benchmarks",
+    )
+    parser.add_argument(
+        "--repeat", type=int, help="Keep the best of N runs of each benchmark"
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Short runs, for a smoke test"
+    )
+    parser.add_argument("--serve", metavar="URL", help=argparse.SUPPRESS)
+    options = parser.parse_args(args)
+
+    logging.getLogger("chimera").setLevel(logging.WARNING)
+
+    if options.serve:
+        serve(options.serve)
+        return 0
+
+    console = Console()
+
+    if options.compare:
+        base, new = (_load(path) for path in options.compare)
+        rows = compare(base, new, options.threshold)
+        _print_comparison(console, base, new, rows)
+        regressions = [row for row in rows if row["status"] == "regression"]
+        if regressions:
+            console.print(f"[red]{len(regressions)} regression(s)[/red]")
+            return 1
+        return 0
+
+    for name in options.only:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name}")
+    for name in options.mode:
+        if name not in MODES:
+            parser.error(f"unknown mode: {name}")
+
+    settings = QUICK if options.quick else Settings()
+    if options.clients:
+        settings = replace(settings, clients=options.clients)
+    if options.repeat:
+        settings = replace(settings, repeat=options.repeat)
+
+    with console.status("") as status:
+        document = run_suite(
+            settings,
+            modes=options.mode,
+            benches=options.only,
+            progress=lambda step: status.update(f"running {step}..."),
+        )
+
+    _print_results(console, document)
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(document, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,6 +18,7 @@ from chimera.core.chimera_config import ChimeraConfig
 from chimera.core.constants import CHIMERA_CONFIG_DEFAULT_FILENAME
 from chimera.core.exceptions import ChimeraException, OptionConversionException
 from chimera.core.manager import Manager
+from chimera.core.metrics import MetricsServer, render_prometheus
 from chimera.core.path import ChimeraPath
 from chimera.core.site import Site
 from chimera.core.url import URL
@@ -32,6 +33,7 @@ class ChimeraCLI:
 
         self._shutdown_requested = threading.Event()
         self._shutdown_done = False
+        self._metrics_server: MetricsServer | None = None
 
         try:
             self.config = ChimeraConfig.from_file(self.options.config_file)
@@ -158,6 +160,13 @@ class ChimeraCLI:
             self._add(url, path=self.paths.controllers, start=True, config=config)
         log.info("Controllers started...")
 
+        if self.config.peers:
+            log.info(f"Connecting to peers: {', '.join(self.config.peers)}")
+            self.bus.dial(self.config.peers)
+
+        if self.config.metrics_port is not None:
+            self._start_metrics(self.config.metrics_port)
+
         log.info("System up and running.")
 
         try:
@@ -177,6 +186,19 @@ class ChimeraCLI:
         except Exception:
             log.exception(f"error starting {location.path}")
 
+    def _start_metrics(self, port: int) -> None:
+        bus = self.bus
+        try:
+            self._metrics_server = MetricsServer(
+                lambda: render_prometheus(bus.metrics.snapshot(), bus.url.bus), port
+            )
+        except OSError as e:
+            # observability only: never a reason not to run
+            log.error(f"Cannot serve metrics on port {port}. ({e})")
+            return
+        self._metrics_server.start()
+        log.info(f"Metrics: http://127.0.0.1:{port}/metrics")
+
     def _on_sigint(self, signum, frame):
         # no logging in a signal handler: the interrupted thread may hold the
         # logging lock
@@ -197,6 +219,8 @@ class ChimeraCLI:
         # stop objects first, while the bus still routes: the scheduler aborts
         # its running program over live RPC, instruments stop cleanly
         self.manager.shutdown()
+        if self._metrics_server is not None:
+            self._metrics_server.shutdown()
         # the bus goes down last: this wakes the selector and run_forever returns
         self.bus.shutdown()
         log.info("System shut down.")
@@ -11,6 +11,9 @@ from rich import box
 from rich.console import Console
 from rich.table import Table
 
+from chimera.core.constants import MANAGER_LOCATION
+from chimera.core.metrics import quantile
+from chimera.core.proxy import Proxy
 from chimera.core.version import chimera_version
 
 from .cli import ChimeraCLI, ParameterType, action
@@ -26,6 +29,26 @@ def _fmt_age(seconds: float) -> str:
     return f"{int(seconds // 86400)}d{int((seconds % 86400) // 3600):02d}h"
 
 
+def _fmt_seconds(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    if seconds == float("inf"):
+        return "slower"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f}μs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f}ms"
+    return f"{seconds:.2f}s"
+
+
+def _fmt_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GiB"
+
+
 def _table(title: str, *columns: str) -> Table:
     table = Table(
         title=title,
@@ -64,7 +87,23 @@ class ChimeraCtl(ChimeraCLI):
                 default=False,
                 help="Dump the raw status as JSON",
                 help_group="CTL",
-            )
+            ),
+            dict(
+                name="output",
+                short="o",
+                type="string",
+                help="Write the trace to FILE instead of the screen",
+                help_group="CTL",
+                metavar="FILE",
+            ),
+            dict(
+                name="clear",
+                long="clear",
+                type=ParameterType.BOOLEAN,
+                default=False,
+                help="Empty the trace buffers after dumping them",
+                help_group="CTL",
+            ),
         )
 
     def run(self, cmdline_args: list[str]):
@@ -73,6 +112,7 @@ class ChimeraCtl(ChimeraCLI):
         # subcommand-style front end over the flag-based framework:
         #   chimera-ctl [status]
         #   chimera-ctl config [object]
+        #   chimera-ctl trace
         if len(args) > 1 and not args[1].startswith("-"):
             subcommand = args.pop(1)
             match subcommand:
@@ -82,6 +122,8 @@ class ChimeraCtl(ChimeraCLI):
                     if len(args) > 1 and not args[1].startswith("-"):
                         self._config_target = args.pop(1)
                     args.insert(1, "--show-config")
+                case "trace":
+                    args.insert(1, "--trace")
                 case _:
                     self.exit(f"Unknown command: {subcommand}")
 
@@ -139,6 +181,36 @@ class ChimeraCtl(ChimeraCLI):
                 table.add_row(key, str(value), f"[dim]{type(value).__name__}[/dim]")
             self._print_table(table, "no config")
 
+    @action(
+        help="Dump the spans of traced requests as Chrome-trace JSON, for "
+        "chrome://tracing or ui.perfetto.dev (chimera-ctl trace)",
+        help_group="CTL",
+    )
+    def trace(self, options: optparse.Values):
+        events = list(self.manager.get_trace(clear=options.clear)["traceEvents"])
+
+        # every bus records only its own side of a call: collect the other
+        # managers this one talks to, for the whole chain in one file
+        us = self.bus.url.bus
+        for peer in self.manager.get_status()["bus"]["peers"]:
+            if peer == us:
+                continue
+            try:
+                manager = Proxy(f"{peer}{MANAGER_LOCATION}", self.bus, timeout=10)
+                events.extend(manager.get_trace(clear=options.clear)["traceEvents"])
+            except Exception as e:
+                # a client (chimera-cam, another ctl...) has no Manager
+                self.err(f"no trace from {peer} ({e})")
+
+        dump = json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
+        if options.output:
+            with open(options.output, "w") as output:
+                output.write(dump)
+            spans = sum(1 for event in events if event["ph"] == "X")
+            self.out(f"{spans} spans written to {options.output}")
+        else:
+            self.out(dump)
+
     def _print_status(self, status: dict[str, Any]) -> None:
         console = self._console
         system = status["system"]
@@ -169,20 +241,59 @@ class ChimeraCtl(ChimeraCLI):
 
         self._print_pool("Handler pool", bus["handler_pool"])
         self._print_pool("Control pool", bus["control_pool"])
+        # servers that predate the shared lane pool run a thread per lane
+        if "lane_pool" in bus:
+            self._print_pool("Lane pool", bus["lane_pool"])
 
         lanes = _table(
-            f"Locked-method lanes ({len(bus['lanes'])})", "object", "queued", "thread"
+            f"Locked-method lanes ({len(bus['lanes'])})",
+            "object",
+            "queued",
+            "running",
+            "readers",
         )
         for lane in bus["lanes"]:
-            lanes.add_row(lane["path"], str(lane["queued"]), str(lane["id"] or "-"))
+            lanes.add_row(
+                lane["path"],
+                str(lane["queued"]),
+                "yes" if lane.get("running") else "-",
+                str(lane.get("readers", 0)),
+            )
         self._print_table(lanes, "no active lanes")
 
         # our own ephemeral bus shows up as a peer of the manager: mark it
         us = self.bus.url.bus
-        peers = _table(f"Peers ({len(bus['peers'])})", "bus")
+        # servers that predate codec negotiation report no codecs: json
+        codecs = bus.get("codecs", {})
+        # ... and reach every peer over tcp
+        transports = bus.get("transports", {})
+        send_queues = bus.get("send_queues", {})
+        # ... and keep no metrics
+        metrics = bus.get("metrics")
+        bytes_in = metrics["bytes_in"] if metrics else {}
+        bytes_out = metrics["bytes_out"] if metrics else {}
+        peers = _table(
+            f"Peers ({len(bus['peers'])})",
+            "bus",
+            "codec",
+            "transport",
+            "send queue",
+            "dropped",
+            "in",
+            "out",
+        )
         for peer in bus["peers"]:
             marker = " [dim](us)[/dim]" if peer == us else ""
-            peers.add_row(f"{peer}{marker}")
+            send_queue = send_queues.get(peer)
+            peers.add_row(
+                f"{peer}{marker}",
+                codecs.get(peer, "json"),
+                transports.get(peer, "tcp"),
+                str(send_queue["depth"]) if send_queue else "-",
+                str(send_queue["dropped"]) if send_queue else "-",
+                _fmt_bytes(bytes_in.get(peer, 0)),
+                _fmt_bytes(bytes_out.get(peer, 0)),
+            )
         self._print_table(peers, "no connected peers")
 
         mailboxes = bus["mailboxes"]
@@ -193,15 +304,26 @@ class ChimeraCtl(ChimeraCLI):
             pending.add_row(str(entry["id"]), entry["dst_bus"], _fmt_age(entry["age"]))
         self._print_table(pending, "no pending requests")
 
+        fanout = {
+            (entry["publisher"], entry["event"]): entry
+            for entry in (metrics["events"] if metrics else [])
+        }
         publishing = _table(
             f"Events, publisher side ({len(bus['subscribers'])})",
             "publisher",
             "event",
             "subscribers",
+            "published",
+            "sent",
         )
         for entry in bus["subscribers"]:
+            counts = fanout.get((entry["publisher"], entry["event"]))
             publishing.add_row(
-                entry["publisher"], entry["event"], str(entry["subscribers"])
+                entry["publisher"],
+                entry["event"],
+                str(entry["subscribers"]),
+                str(counts["published"]) if counts else "-",
+                str(counts["deliveries"]) if counts else "-",
             )
         self._print_table(publishing, "no subscribed events")
 
@@ -217,6 +339,9 @@ class ChimeraCtl(ChimeraCLI):
             )
         self._print_table(subscribed, "no event callbacks")
 
+        if metrics:
+            self._print_metrics(metrics)
+
         console.rule("[bold]Objects[/bold]")
         objects = _table(
             f"Objects ({len(status['objects'])})",
@@ -252,6 +377,63 @@ class ChimeraCtl(ChimeraCLI):
         )
         console.print()
 
+    def _print_metrics(self, metrics: dict[str, Any]) -> None:
+        uptime = metrics["uptime"]
+
+        # the calls that took the most time overall first: that is where
+        # the night goes
+        entries = sorted(metrics["requests"], key=lambda entry: -entry["run"]["sum"])
+        requests = _table(
+            f"Requests since start ({_fmt_age(uptime)})",
+            "object",
+            "method",
+            "calls",
+            "errors",
+            "wait p50",
+            "wait p99",
+            "run p50",
+            "run p99",
+            "run total",
+        )
+        for entry in entries:
+            wait, run = entry["queue"], entry["run"]
+            requests.add_row(
+                entry["object"],
+                entry["method"],
+                str(run["count"]),
+                str(entry["errors"]),
+                _fmt_seconds(quantile(wait, 0.5)),
+                _fmt_seconds(quantile(wait, 0.99)),
+                _fmt_seconds(quantile(run, 0.5)),
+                _fmt_seconds(quantile(run, 0.99)),
+                _fmt_seconds(run["sum"]),
+            )
+        self._print_table(requests, "no requests served")
+
+        received, sent = metrics["received"], metrics["sent"]
+        messages = _table("Messages", "type", "received", "sent", "rate")
+        for kind in sorted(set(received) | set(sent)):
+            total = received.get(kind, 0) + sent.get(kind, 0)
+            messages.add_row(
+                kind,
+                str(received.get(kind, 0)),
+                str(sent.get(kind, 0)),
+                f"{total / uptime:.1f}/s" if uptime else "-",
+            )
+        self._print_table(messages, "no messages")
+
+        codec = _table("Codec", "", "frames", "p50", "p99", "total")
+        for name in ("encode", "decode"):
+            histogram = metrics[name]
+            codec.add_row(
+                name,
+                str(histogram["count"]),
+                _fmt_seconds(quantile(histogram, 0.5)),
+                _fmt_seconds(quantile(histogram, 0.99)),
+                _fmt_seconds(histogram["sum"]),
+            )
+        self._print_table(codec, "no frames")
+
     def _print_pool(self, name: str, pool: dict[str, Any]) -> None:
         threads = pool["threads"]
         title = (
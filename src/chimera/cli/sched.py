@@ -8,6 +8,7 @@ import re
 import shutil
 import string
 import sys
+import threading
 import time
 from textwrap import indent
 
@@ -485,11 +486,26 @@ class ChimeraSched(ChimeraCLI):
             else:
                 self.out("%s (%s)" % (red(str(status)), red(str(message))))
 
+        off = threading.Event()
+        seen = threading.Event()
+        seen_lock = threading.Lock()
+
         def state_changed_clbk(new_state, old_state):
-            if new_state == State.OFF:
+            # state_changed is retained: the first call, right after
+            # subscribing, is the state the scheduler is in now. Callbacks
+            # may run on several bus threads, so only one sees it as first.
+            with seen_lock:
+                current = not seen.is_set()
+                seen.set()
+            if new_state != State.OFF:
+                return
+            if current:
+                self.out("%s no programs to do" % blue("[scheduler]"))
+            else:
                 self.out("=" * 40)
                 self.out("%s finished all programs" % blue("[scheduler]"))
                 self.out("=" * 40)
+            off.set()
 
         self.scheduler.program_begin += program_begin_clbk
         self.scheduler.program_complete += program_complete_clbk
@@ -497,13 +513,8 @@ class ChimeraSched(ChimeraCLI):
         self.scheduler.action_complete += action_complete_clbk
         self.scheduler.state_changed += state_changed_clbk
 
-        if self.scheduler.state() == State.OFF:
-            self.out("%s no programs to do" % blue("[scheduler]"))
-
-        while True:
-            if self.scheduler.state() == State.OFF:
-                self.exit()
-            time.sleep(0.1)
+        off.wait()
+        self.exit()
 
 
 def main():
@@ -75,20 +75,27 @@ class ChimeraWeather(ChimeraCLI):
         else:
             last_meas = green(t.iso)
 
-        for attr in (
-            "temperature",
-            "dew_point",
-            "humidity",
-            "wind_speed",
-            "wind_direction",
-            "pressure",
-            "rain_rate",
-            "sky_transparency",
-        ):
+        # one round trip for every sensor instead of two per sensor
+        with self.weatherstation.batch() as batch:
+            readings = {
+                attr: (getattr(batch, attr)(), batch.get_units(attr))
+                for attr in (
+                    "temperature",
+                    "dew_point",
+                    "humidity",
+                    "wind_speed",
+                    "wind_direction",
+                    "pressure",
+                    "rain_rate",
+                    "sky_transparency",
+                )
+            }
+
+        for attr, (value, units) in readings.items():
             try:
-                v = getattr(self.weatherstation, attr)()
+                v = value.result()
                 self.out(
-                    f"{attr.replace('_', ' ').removeprefix('sky ')}:\t{v:.2f}\t{self.weatherstation.get_units(attr)}"
+                    f"{attr.replace('_', ' ').removeprefix('sky ')}:\t{v:.2f}\t{units.result()}"
                 )
             except Exception as e:
                 if "not found" in str(e):  # skip if not implemented
@@ -1,4 +1,5 @@
 import logging
+import time
 
 from chimera.core.exceptions import ChimeraValueError
 from chimera.interfaces.camera import Bitpix, Shutter
@@ -48,6 +49,10 @@ class ImageRequest(dict):
         # URLs of proxies from which to get metadata after taking each image
         self.metadata_post = []
 
+        # seconds to wait for the metadata of each frame; sources slower
+        # than that are left out of its headers
+        self.metadata_timeout = 5.0
+
         # Headers accumulated during processing of each frame
         # (=headers+metadata_pre+metadata_post)
         self.headers = []
@@ -154,10 +159,50 @@ class ImageRequest(dict):
         self._get_headers(chimera_obj, self.metadata_post)
 
     def _get_headers(self, chimera_obj, locations):
+        # cameras keep the snapshots instruments publish: fresh ones are
+        # used as they are, no round trip
+        snapshots = getattr(chimera_obj, "metadata_snapshots", None)
+        max_age = chimera_obj["metadata_max_age"] if snapshots is not None else 0
+        collected = {}
+
+        # ask every other source at once, then merge in the order they are
+        # listed: the frame waits for the slowest source, not for all of
+        # them in turn
+        pending = []
         for location in locations:
             if location not in self._proxies:
                 self._proxies[location] = chimera_obj.get_proxy(location)
+            if max_age > 0:
+                snapshots.watch(location, self._proxies[location])
+                metadata = snapshots.get(location, max_age)
+                if metadata is not None:
+                    collected[location] = metadata
+                    continue
+                if not chimera_obj["metadata_pull"]:
+                    log.debug(f"No recent metadata from {location}, left out")
+                    continue
+            try:
+                pending.append(
+                    (location, self._proxies[location].get_metadata.future(self))
+                )
+            except Exception:
+                log.warning(f"Unable to get metadata from {location}")
+
+        deadline = time.monotonic() + self.metadata_timeout
+        for location, future in pending:
             try:
-                self.headers += self._proxies[location].get_metadata(self)
+                collected[location] = future.result(
+                    timeout=max(0.0, deadline - time.monotonic())
+                )
+            except TimeoutError:
+                # skipped remotely if it has not started yet
+                future.cancel()
+                log.warning(
+                    f"Metadata from {location} took longer than "
+                    f"{self.metadata_timeout:.1f}s, left out of the headers"
+                )
             except Exception:
                 log.warning(f"Unable to get metadata from {location}")
+
+        for location in locations:
+            self.headers += collected.get(location, [])
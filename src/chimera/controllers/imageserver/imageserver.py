@@ -1,3 +1,4 @@
+import mmap
 import os
 from collections import OrderedDict
 
@@ -97,6 +98,21 @@ class ImageServer(ChimeraObject):
         if img:
             return img.get_proxy()
 
+    def get_stream_by_id(self, id):
+        """Offer the FITS file of image `id` for pulling over the bus, as an
+        alternative to HTTP for remote consumers (guiders, quick-look):
+        b"".join(bus.pull(handle, src=...)) is the file, read in bounded
+        chunks straight from disk."""
+        img = self.get_image_by_id(id)
+        if not img:
+            return None
+
+        with open(img.filename, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.__bus__.offer(
+            data, meta={"id": id, "filename": os.path.basename(img.filename)}
+        )
+
     def get_http_by_id(self, id):
         return f"http://{self['http_host']}:{int(self['http_port'])}/image/{id}"
 
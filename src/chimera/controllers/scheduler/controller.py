@@ -64,6 +64,9 @@ class Scheduler(ChimeraObject):
         "algorithm": SchedulingAlgorithm.SEQUENTIAL,
         # left tracking, an unattended mount walks into a limit
         "stop_tracking_on_program_end": True,
+        # record each program and action as a trace span, with every
+        # instrument call they make (chimera-ctl trace)
+        "trace": False,
     }
 
     def __init__(self):
@@ -133,6 +136,6 @@ class Scheduler(ChimeraObject):
     def action_complete(self, action_id, status, message=None):
         pass
 
-    @event
+    @event(retain=True)
     def state_changed(self, new_state, old_state):
         pass
@@ -1,3 +1,4 @@
+import contextlib
 import logging
 import threading
 import time
@@ -25,6 +26,7 @@ from chimera.core.exceptions import (
     ProgramExecutionAborted,
     ProgramExecutionException,
 )
+from chimera.core.trace import span
 
 log = logging.getLogger(__name__)
 
@@ -51,6 +53,10 @@ class ProgramExecutor:
             self._inject_instrument(handler)
 
     def execute(self, program):
+        with self._span(f"program {program.name}"):
+            self._execute(program)
+
+    def _execute(self, program):
         self.must_stop.clear()
 
         try:
@@ -69,7 +75,8 @@ class ProgramExecutor:
                     log.debug(f"[start] {log_msg} ")
                     self.controller.action_begin(action.id, log_msg)
 
-                    self.current_handler.process(action)
+                    with self._span(f"action {log_msg}"):
+                        self.current_handler.process(action)
 
                     # instruments just returns in case of abort, so we need to check handler
                     # returned 'cause of abort or not
@@ -93,6 +100,12 @@ class ProgramExecutor:
             self.current_action = None
             self.current_handler = None
 
+    def _span(self, name):
+        # off unless the Scheduler's trace option is on
+        if not self.controller["trace"]:
+            return contextlib.nullcontext()
+        return span(self.controller.__bus__.tracer, name)
+
     def stop(self):
         # flag first: a worker between actions must see the stop even when
         # there is no action in flight to abort
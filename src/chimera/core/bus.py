@@ -1,21 +1,42 @@
+import asyncio
+import collections
+import contextlib
 import enum
+import itertools
 import logging
+import operator
 import os
 import queue
+import select
 import selectors
 import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterator, Sequence
 from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any, NamedTuple
 
 import msgspec
 
-from chimera.core.constants import LOCK_ATTRIBUTE_NAME, MANAGER_LOCATION
-from chimera.core.exceptions import BusDeadException, RequestTimeoutException
+from chimera.core.cancel import CancelToken, current_deadline, use_cancel_token
+from chimera.core.codec import DEFAULT_CODEC, Codec, create_codec, decode_message
+from chimera.core.constants import (
+    LOCK_ATTRIBUTE_NAME,
+    LOCK_SHARED_ATTRIBUTE_NAME,
+    MANAGER_LOCATION,
+)
+from chimera.core.exceptions import (
+    BusDeadException,
+    RequestTimeoutException,
+    StreamException,
+)
+from chimera.core.metrics import Metrics
 from chimera.core.protocol import (
+    Cancel,
+    Chunk,
+    Credit,
     Event,
+    Filter,
     Messages,
     Ping,
     Pong,
@@ -24,17 +45,34 @@ from chimera.core.protocol import (
     Request,
     Response,
     Subscribe,
+    Trace,
     Unsubscribe,
 )
+from chimera.core.trace import Tracer, current_trace, use_trace
 from chimera.core.transport import SendResult, Transport
-from chimera.core.transport_factory import create_transport
-from chimera.core.url import URL, create_url, parse_url
+from chimera.core.transport_factory import (
+    LOCAL_TRANSPORTS,
+    create_listener,
+    create_transport,
+)
+from chimera.core.url import URL, create_url, parse_path, parse_url
 
 log = logging.getLogger(__name__)
 
 # consecutive missed health pongs before a peer is declared gone
 _MAX_MISSED_PONGS = 3
 
+# seconds the lane pool may make no progress, with work waiting, before it
+# takes one more thread
+_LANE_STALL = 0.1
+
+# offered payloads travel in slices this big: small enough for pings and
+# aborts to slip in between, big enough to amortize the per-message cost
+STREAM_CHUNK_SIZE = 256 * 1024
+# chunks a consumer lets be in flight: its memory bound while pulling, and
+# far below the 128-message send buffer other traffic shares
+STREAM_WINDOW = 8
+
 
 class PushResult(enum.StrEnum):
     """Outcome of Bus._push. Truthiness answers "may the caller still expect
@@ -43,9 +81,11 @@ class PushResult(enum.StrEnum):
     failures are falsy, so `if not self._push(...)` reads as before."""
 
     OK = "ok"
-    # send buffer still full after retries: message dropped, peer alive
+    # the socket is backed up: queued for the peer's writer thread
+    QUEUED = "queued"
+    # the peer's send queue is full: message dropped, peer alive
     DROPPED = "dropped"
-    # the message payload cannot be JSON-encoded for the wire
+    # the message payload cannot be encoded for the wire
     ENCODE_FAILED = "encode_failed"
     # could not create a transport to the destination bus
     NO_PEER = "no_peer"
@@ -53,30 +93,55 @@ class PushResult(enum.StrEnum):
     SEND_DEAD = "send_dead"
     # this bus is shutting down and accepts no new messages
     BUS_DEAD = "bus_dead"
+    # block=False only: sending now would wait (a dial, or room in a full
+    # send queue); nothing was sent, push again from a thread that may wait
+    WOULD_BLOCK = "would_block"
 
     def __bool__(self) -> bool:
-        return self in (PushResult.OK, PushResult.DROPPED)
+        return self in (PushResult.OK, PushResult.QUEUED, PushResult.DROPPED)
+
+
+class SendPolicy(enum.StrEnum):
+    """What a message does when its peer's send queue is full."""
+
+    # wait for room (or for the peer to be evicted): replies, requests and
+    # everything a caller or a flow-control window is waiting on
+    BLOCK = "block"
+    # give up at once: a probe that is stale by the time it would go out
+    DROP = "drop"
+    # replace the newest copy of the same event still in the queue, latest
+    # value wins (or drop if there is none): under overload a subscriber
+    # only needs the freshest sample of a telemetry stream
+    CONFLATE = "conflate"
+
+
+_SEND_POLICIES: dict[type, SendPolicy] = {
+    Ping: SendPolicy.DROP,
+    Event: SendPolicy.CONFLATE,
+}
 
 
 def pool_stats(pool: ThreadPoolExecutor) -> dict[str, Any]:
     """JSON-safe snapshot of a ThreadPoolExecutor: limits, backlog and
     per-thread state."""
-    threads = [
+    return {
+        "max_workers": pool._max_workers,
+        "queued": pool._work_queue.qsize(),
+        "threads": _thread_stats(list(pool._threads)),
+    }
+
+
+def _thread_stats(threads: list[threading.Thread]) -> list[dict[str, Any]]:
+    return [
         {
             "id": thread.native_id,
             "name": thread.name,
             "alive": thread.is_alive(),
             "daemon": thread.daemon,
         }
-        for thread in list(pool._threads)
+        for thread in threads
     ]
 
-    return {
-        "max_workers": pool._max_workers,
-        "queued": pool._work_queue.qsize(),
-        "threads": threads,
-    }
-
 
 type PublisherId = str
 type SubscriberId = URL
@@ -103,11 +168,183 @@ class Subscriber:
     callback: int
 
 
+class _FanOut:
+    """Where one EventId's publications go: the distinct subscriber buses,
+    kept up to date on every (un)subscribe so a publish reads a ready-made
+    tuple instead of deriving it from the subscriber set."""
+
+    def __init__(self):
+        # subscriber bus -> subscriptions it holds on this event
+        self.counts: dict[str, int] = {}
+        self.buses: tuple[str, ...] = ()
+
+    def add(self, bus: str) -> None:
+        count = self.counts.get(bus, 0)
+        self.counts[bus] = count + 1
+        if count == 0:
+            self.buses = (*self.buses, bus)
+
+    def remove(self, bus: str, count: int = 1) -> None:
+        left = self.counts.get(bus, 0) - count
+        if left > 0:
+            self.counts[bus] = left
+            return
+        self.counts.pop(bus, None)
+        self.buses = tuple(b for b in self.buses if b != bus)
+
+
+FILTER_OPS: dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda value, options: value in options,
+    "not in": lambda value, options: value not in options,
+}
+
+_MISSING = object()
+
+
+def _event_arg(args: list[Any], kwargs: dict[str, Any], arg: int | str) -> Any:
+    if isinstance(arg, int):
+        return args[arg] if -len(args) <= arg < len(args) else _MISSING
+    return kwargs.get(arg, _MISSING)
+
+
+class _EventFilter:
+    """A subscription's Filter, with what it remembers of the last emission
+    it let through. Publishes of one event may be handled concurrently."""
+
+    def __init__(self, filter: Filter):
+        self.filter = filter
+        self.interval = 1.0 / filter.max_rate if filter.max_rate else 0.0
+        self.lock = threading.Lock()
+        self.last_sent = float("-inf")
+        self.last_values: dict[int | str, Any] = {}
+
+    def accept(self, args: list[Any], kwargs: dict[str, Any]) -> bool:
+        for arg, op, expected in self.filter.where:
+            value = _event_arg(args, kwargs, arg)
+            if value is _MISSING:
+                return False
+            try:
+                if not FILTER_OPS[op](value, expected):
+                    return False
+            except TypeError:
+                # not comparable (a string against a number, ...)
+                return False
+
+        with self.lock:
+            now = time.monotonic()
+            if now - self.last_sent < self.interval:
+                return False
+
+            if self.filter.deadband:
+                changed = {}
+                for arg, band in self.filter.deadband:
+                    value = _event_arg(args, kwargs, arg)
+                    if value is _MISSING:
+                        continue
+                    last = self.last_values.get(arg, _MISSING)
+                    if last is _MISSING:
+                        changed[arg] = value
+                    elif isinstance(value, (int, float)) and isinstance(
+                        last, (int, float)
+                    ):
+                        if abs(value - last) > band:
+                            changed[arg] = value
+                    elif value != last:
+                        changed[arg] = value
+                if not changed:
+                    return False
+                # the band is measured from the last delivered value: a slow
+                # drift still gets through once it adds up
+                self.last_values.update(changed)
+
+            self.last_sent = now
+            return True
+
+
+def validate_filter(filter: Filter) -> None:
+    for _, op, _ in filter.where:
+        if op not in FILTER_OPS:
+            raise ValueError(
+                f"unknown filter operator '{op}', expected one of: "
+                f"{', '.join(FILTER_OPS)}"
+            )
+    if filter.max_rate is not None and filter.max_rate <= 0:
+        raise ValueError(f"max_rate must be positive, got {filter.max_rate}")
+
+
 class Callback(NamedTuple):
     id: int
     callable: Callable[..., None]
 
 
+class Call(NamedTuple):
+    """One request of a Bus.request_many batch."""
+
+    dst: str | URL
+    method: str
+    args: list[Any] | None = None
+    kwargs: dict[str, Any] | None = None
+    handle: int | None = None
+
+
+class _Handle(NamedTuple):
+    """An object resolved once, for requests that name it by handle."""
+
+    path: str
+    cls: str
+    resolve: Callable[[str], Callable[..., Any] | None]
+
+
+# how much of a local payload its signature looks at: containers down to
+# _SHAPE_DEPTH levels, their first _SHAPE_ITEMS items each
+_SHAPE_DEPTH = 4
+_SHAPE_ITEMS = 8
+
+
+def _shape(value: Any, depth: int = 0) -> Any:
+    # the types a payload is made of, nested: a dict whose values turn from
+    # floats into unencodable objects gets a new signature, so it is checked
+    # again. Sampled to stay cheap; strict_local checks everything
+    kind = type(value)
+    if depth >= _SHAPE_DEPTH:
+        return kind
+    if kind is dict:
+        items = itertools.islice(value.items(), _SHAPE_ITEMS)
+        return (
+            kind,
+            *dict.fromkeys((type(k), _shape(v, depth + 1)) for k, v in items),
+        )
+    if kind in (list, tuple, set, frozenset):
+        items = itertools.islice(value, _SHAPE_ITEMS)
+        return (kind, *dict.fromkeys(_shape(v, depth + 1) for v in items))
+    return kind
+
+
+def _budget(timeout: float | None) -> int | None:
+    # a request's budget: what is left of its own timeout, or of the
+    # deadline of the request being executed here (calls made on its
+    # behalf), whichever is sooner
+    now = time.monotonic_ns()
+    deadline = None if timeout is None else now + int(timeout * 1e9)
+    inherited = current_deadline()
+    if inherited is not None and (deadline is None or inherited < deadline):
+        deadline = inherited
+    return None if deadline is None else max(0, deadline - now)
+
+
+def _child_trace(parent: Trace | None) -> Trace | None:
+    # a call made inside a trace is a new span of it
+    if parent is None:
+        return None
+    return Trace(id=parent.id, span=Protocol.id())
+
+
 def _is_locked_method(method: Callable[..., Any]) -> bool:
     """@lock methods are serialized per object by the dispatch layer. The
     resolved callable is a MethodWrapperDispatcher whose .func is the raw
@@ -117,28 +354,196 @@ def _is_locked_method(method: Callable[..., Any]) -> bool:
     return getattr(func, LOCK_ATTRIBUTE_NAME, False) is True
 
 
+def _is_shared_method(method: Callable[..., Any]) -> bool:
+    # @lock(shared=True): a read, run alongside the other reads in its lane
+    func = getattr(method, "func", method)
+    return getattr(func, LOCK_SHARED_ATTRIBUTE_NAME, False) is True
+
+
+# (publisher, event, subscription tokens) of a conflatable event frame
+_ConflationKey = tuple[str, str, tuple[int, ...]]
+
+
+class _Outgoing:
+    """An encoded frame waiting in a peer's send queue."""
+
+    __slots__ = ("data", "kind", "key")
+
+    def __init__(self, data: bytes, kind: str, key: _ConflationKey | None):
+        self.data = data
+        self.kind = kind
+        # (publisher, event, subscriptions) for conflatable events
+        self.key = key
+
+
 class _Peer:
     """One outbound connection: its own transport, its own lock and its own
     health state — a slow or black-holed peer stalls only its own senders,
-    never traffic to healthy peers."""
+    never traffic to healthy peers.
+
+    Frames go straight to the socket while it takes them. Once it pushes
+    back, they wait in a bounded FIFO that a writer thread drains as the
+    socket frees up; later frames queue behind them to keep the order."""
 
     def __init__(self, transport: Transport):
         self.transport = transport
         self.lock = threading.Lock()
+        # signalled when the queue gets a frame, frees room or is closed
+        self.cond = threading.Condition(self.lock)
+        self.pending: collections.deque[_Outgoing] = collections.deque()
+        # newest queued frame of each conflatable event
+        self.conflatable: dict[_ConflationKey, _Outgoing] = {}
+        self.writer: threading.Thread | None = None
+        self.closed = False
         self.missed_pongs = 0
+        # last frame sent (health pings aside): idle reaping and LRU order
+        self.last_used = time.monotonic()
+        self.queued = 0
+        self.dropped = 0
+        self.conflated = 0
+
+    def close(self) -> None:
+        with self.cond:
+            self.closed = True
+            self.pending.clear()
+            self.conflatable.clear()
+            self.cond.notify_all()
+        self.transport.close()
 
 
 class _ObjectLane:
-    """A per-object FIFO for @lock methods: one worker thread executes them
-    one at a time, in arrival order. A hung method stacks bounded queue
-    entries here instead of pool workers."""
+    """A per-object mailbox for @lock methods, run on the shared lane pool
+    like an actor: one exclusive method at a time, in arrival order, with
+    no thread of its own. A hung method stacks a bounded number of pending
+    requests here instead of pool workers. Its state changes under `lock`."""
 
-    def __init__(self, maxsize: int):
-        self.queue: queue.Queue[tuple[Request, Callable[..., Any]] | None] = (
-            queue.Queue(maxsize=maxsize)
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (request, method, when it was routed), not started yet
+        self.queue: collections.deque[tuple[Request, Callable[..., Any], float]] = (
+            collections.deque()
         )
+        # requests waiting in the queue that are still live: a cancelled one
+        # stays queued (and is skipped) but frees its slot at once. Changed
+        # under Bus._queued_lock
+        self.pending = 0
         self.closed = False
-        self.thread: threading.Thread | None = None
+        # an exclusive method is running; shared (@lock(shared=True)) ones
+        # run side by side, never alongside it
+        self.running = False
+        self.readers = 0
+        self.last_active = time.monotonic()
+
+    def idle(self) -> bool:
+        return not self.queue and not self.running and not self.readers
+
+
+class _LanePool:
+    """The threads lanes run on: `size` of them, plus one more whenever the
+    pool makes no progress while work waits. A lane request that blocks
+    its thread (a nested call to another locked object, a long expose)
+    never stalls the lanes queued behind it: once every thread is held like
+    that, the next queued request gets a thread of its own, which goes
+    away again after `idle_timeout` idle."""
+
+    def __init__(self, size: int, *, idle_timeout: float, name: str):
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.name = name
+        self._cond = threading.Condition()
+        # (when it was submitted, what to run)
+        self._tasks: collections.deque[tuple[float, Callable[[], None]]] = (
+            collections.deque()
+        )
+        self._threads: set[threading.Thread] = set()
+        self._idle = 0
+        # tasks finished so far: unchanged for _LANE_STALL means stalled
+        self._done = 0
+        self._watching = False
+        self._closed = False
+        self._ids = itertools.count()
+
+    def submit(self, fn: Callable[..., None], /, *args: Any) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("lane pool is shut down")
+            self._tasks.append((time.monotonic(), lambda: fn(*args)))
+            if self._idle >= len(self._tasks):
+                self._cond.notify()
+            elif len(self._threads) < self.size:
+                self._spawn()
+            elif not self._watching:
+                self._watching = True
+                threading.Thread(
+                    target=self._watch, name=f"{self.name}-watch", daemon=True
+                ).start()
+
+    def owns(self, thread: threading.Thread) -> bool:
+        with self._cond:
+            return thread in self._threads
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "max_workers": self.size,
+                "queued": len(self._tasks),
+                "threads": _thread_stats(list(self._threads)),
+            }
+
+    def shutdown(self) -> None:
+        """Drop what is queued; running tasks finish on their own."""
+        with self._cond:
+            self._closed = True
+            self._tasks.clear()
+            self._cond.notify_all()
+
+    def _spawn(self) -> None:
+        # under _cond: the thread is ours before it runs anything
+        thread = threading.Thread(
+            target=self._work, name=f"{self.name}_{next(self._ids)}", daemon=True
+        )
+        self._threads.add(thread)
+        thread.start()
+
+    def _work(self) -> None:
+        me = threading.current_thread()
+        while True:
+            with self._cond:
+                while not self._tasks and not self._closed:
+                    self._idle += 1
+                    woken = self._cond.wait(self.idle_timeout)
+                    self._idle -= 1
+                    if not woken and len(self._threads) > self.size:
+                        break
+                if not self._tasks:
+                    self._threads.discard(me)
+                    return
+                _, task = self._tasks.popleft()
+
+            try:
+                task()
+            except Exception:
+                log.exception("bus: lane task failed")
+
+            with self._cond:
+                self._done += 1
+
+    def _watch(self) -> None:
+        with self._cond:
+            done = self._done
+            while self._tasks and not self._closed:
+                self._cond.wait(_LANE_STALL)
+                if not self._tasks or self._idle:
+                    continue
+                stalled = time.monotonic() - self._tasks[0][0] >= _LANE_STALL
+                if stalled and self._done == done:
+                    log.warning(
+                        f"bus: every lane thread is blocked, starting one more "
+                        f"({len(self._threads) + 1} running)"
+                    )
+                    self._spawn()
+                done = self._done
+            self._watching = False
 
 
 class _Mailbox:
@@ -158,6 +563,88 @@ class _Mailbox:
         self._queue.put(message)
 
 
+class _FutureMailbox:
+    """A single-waiter reply box for an asyncio caller: put() resolves a
+    future on the caller's event loop, so the wait costs a coroutine, not a
+    blocked thread."""
+
+    def __init__(self, dst_bus: str, loop: asyncio.AbstractEventLoop):
+        self.dst_bus = dst_bus
+        self.created = time.monotonic()
+        self._loop = loop
+        self.future: asyncio.Future[Messages | None] = loop.create_future()
+
+    def put(self, message: Messages | None) -> None:
+        # called from the selector loop or a handler thread
+        try:
+            self._loop.call_soon_threadsafe(self._resolve, message)
+        except RuntimeError:
+            # the caller's loop is closed: nobody is waiting anymore
+            pass
+
+    def _resolve(self, message: Messages | None) -> None:
+        # a cancelled or timed-out waiter already left
+        if not self.future.done():
+            self.future.set_result(message)
+
+
+class _CallbackMailbox:
+    """A reply box that hands the reply (or None) to a callback on the
+    delivering thread: a caller holding a concurrent.futures.Future waits on
+    nothing at all."""
+
+    def __init__(self, dst_bus: str, callback: Callable[[Messages | None], None]):
+        self.dst_bus = dst_bus
+        self.created = time.monotonic()
+        self._callback = callback
+
+    def put(self, message: Messages | None) -> None:
+        try:
+            self._callback(message)
+        except Exception:
+            log.exception("bus: error completing a request future")
+
+
+class _OutStream:
+    """A payload offered for pulling: sent one chunk per credit the consumer
+    grants, and only then, so a slow consumer never piles chunks into the
+    send buffer it shares with control traffic."""
+
+    def __init__(self, id: int, src: str, data: memoryview, chunk_size: int):
+        self.id = id
+        # the stream's own URL: chunks come from here
+        self.src = src
+        self.data = data
+        self.chunk_size = chunk_size
+        self.lock = threading.Lock()
+        # the first Credit binds the stream to its consumer
+        self.consumer: str | None = None
+        self.credit = 0
+        self.seq = 0
+        self.sent = 0
+        self.done = False
+        self.last_active = time.monotonic()
+
+    def next_chunk(self) -> Chunk:
+        data = self.data[self.sent : self.sent + self.chunk_size]
+        self.sent += len(data)
+        chunk = Protocol.chunk(
+            src=self.src,
+            dst=self.consumer or "",
+            id=self.id,
+            seq=self.seq,
+            # a zero-copy slice: local consumers get it as is, remote ones
+            # get it encoded straight from the producer's buffer
+            data=data,  # type: ignore[arg-type]
+            eof=self.sent >= len(self.data),
+        )
+        self.seq += 1
+        return chunk
+
+
+type _AnyMailbox = _Mailbox | _FutureMailbox | _CallbackMailbox
+
+
 class _Mailboxes:
     """Reply mailboxes keyed by request id.
 
@@ -169,18 +656,32 @@ class _Mailboxes:
     """
 
     def __init__(self):
-        self._boxes: dict[int, _Mailbox] = {}
+        self._boxes: dict[int, _AnyMailbox] = {}
         self._lock = threading.Lock()
         self._closed = False
 
     def register(self, key: int, dst_bus: str) -> _Mailbox:
-        mailbox = _Mailbox(dst_bus)
+        return self._add(key, _Mailbox(dst_bus))
+
+    def register_future(
+        self, key: int, dst_bus: str, loop: asyncio.AbstractEventLoop
+    ) -> _FutureMailbox:
+        return self._add(key, _FutureMailbox(dst_bus, loop))
+
+    def register_callback(
+        self, key: int, dst_bus: str, callback: Callable[[Messages | None], None]
+    ) -> _CallbackMailbox:
+        return self._add(key, _CallbackMailbox(dst_bus, callback))
+
+    def _add[T: _AnyMailbox](self, key: int, mailbox: T) -> T:
         with self._lock:
-            if self._closed:
-                # bus is dead: the waiter wakes immediately with None
-                mailbox.put(None)
-                return mailbox
-            self._boxes[key] = mailbox
+            closed = self._closed
+            if not closed:
+                self._boxes[key] = mailbox
+        if closed:
+            # bus is dead: the waiter wakes immediately with None. Outside
+            # the lock, a callback mailbox runs its callback right here
+            mailbox.put(None)
         return mailbox
 
     def unregister(self, key: int) -> None:
@@ -204,11 +705,16 @@ class _Mailboxes:
                 for key, box in self._boxes.items()
             ]
 
-    def fail_peer(self, dst_bus: str) -> None:
-        """Wake every request pending on dst_bus with None: the peer is gone
-        and its replies will never arrive."""
+    def fail_peer(self, dst_bus: str, before: float) -> None:
+        """Wake every request pending on dst_bus since before `before` with
+        None: the peer is gone and its replies will never arrive. Requests
+        registered later went (or will go) to a fresh connection."""
         with self._lock:
-            keys = [key for key, box in self._boxes.items() if box.dst_bus == dst_bus]
+            keys = [
+                key
+                for key, box in self._boxes.items()
+                if box.dst_bus == dst_bus and box.created <= before
+            ]
             boxes = [self._boxes.pop(key) for key in keys]
         for mailbox in boxes:
             mailbox.put(None)
@@ -231,8 +737,20 @@ class Bus:
         control_pool_size: int = 16,
         lane_queue_size: int = 32,
         lane_idle_timeout: float = 60.0,
+        lane_readers: int = 4,
+        lane_pool_size: int = 32,
         health_interval: float = 30.0,
         health_timeout: float = 2.0,
+        send_queue_size: int = 1024,
+        send_timeout: float = 30.0,
+        peer_idle_timeout: float = 600.0,
+        max_peers: int = 256,
+        codec: str = "msgpack",
+        strict_local: bool = False,
+        local_transports: Sequence[str] = LOCAL_TRANSPORTS,
+        stream_idle_timeout: float = 60.0,
+        trace_buffer_size: int = 10_000,
+        resolve_ttl: float = 60.0,
     ):
         self.url = create_url(url, cls="Bus")
 
@@ -263,15 +781,51 @@ class Bus:
         self._teardown_claimed = threading.Event()
         self._teardown_finished = threading.Event()
 
-        # per-object FIFO lanes for @lock methods
+        # per-object FIFO lanes for @lock methods, all run on one pool:
+        # threads do not grow with the number of locked objects, only while
+        # every one of them is blocked (see _LanePool)
+        self._lane_pool = _LanePool(
+            lane_pool_size,
+            idle_timeout=lane_idle_timeout,
+            name=f"chimera-bus-lane-{self.url.port}",
+        )
         self._lanes: dict[str, _ObjectLane] = {}
         self._lanes_lock = threading.Lock()
         self._lane_queue_size = lane_queue_size
         self._lane_idle_timeout = lane_idle_timeout
+        self._lane_readers = lane_readers
+
+        # routed requests not yet started (lane or handler pool backlog),
+        # by id, with their lane if any: a Cancel removes the entry and the
+        # request is skipped. Running ones, by id, with the token a Cancel
+        # sets (see chimera.core.cancel)
+        self._queued: dict[int, tuple[Request, _ObjectLane | None]] = {}
+        self._running_requests: dict[int, tuple[Request, CancelToken]] = {}
+        self._queued_lock = threading.Lock()
+
+        # objects handed out in Pongs, by handle (see Request.handle), and
+        # the handle of each object path. Handles are random, so a handle
+        # from an earlier run of this bus never names the wrong object
+        self._handles: dict[int, _Handle] = {}
+        self._handle_ids: dict[str, int] = {}
+        self._handles_lock = threading.Lock()
+
+        # what proxies on this bus resolved their target url to (see
+        # Proxy.resolve), with its handle and when the entry expires: new
+        # proxies for the same url skip their ping. Dropped with the peer,
+        # or by the proxy that got a 404 from it
+        self._resolutions: dict[str, tuple[URL, int | None, float]] = {}
+        self._resolutions_lock = threading.Lock()
+        self._resolve_ttl = resolve_ttl
 
         # inbound messages to be dispatched by _process_queue
         self._inbox: queue.SimpleQueue[Messages | None] = queue.SimpleQueue()
 
+        # request latencies, message and byte counts (see stats())
+        self.metrics = Metrics()
+        # spans of traced requests, the last trace_buffer_size of them
+        self.tracer = Tracer(self.url.bus, trace_buffer_size)
+
         # reply mailboxes for in-flight requests/pings, keyed by request id
         self._mailboxes = _Mailboxes()
 
@@ -280,6 +834,17 @@ class Bus:
 
         # subscribers represent the publisher-side of the pubsub model, where we don't have references to the callbacks
         self._subscribers: dict[EventId, set[Subscriber]] = {}
+        # ... and, derived from it, the buses each event fans out to
+        self._fanout: dict[EventId, _FanOut] = {}
+        # subscriptions that asked for a Filter, evaluated on publish
+        self._filters: dict[EventId, dict[Subscriber, _EventFilter]] = {}
+        # last (ts, args, kwargs) of each retained event
+        # (@event(retain=True)), and the new subscribers still waiting for
+        # it. _retain_lock orders a snapshot before any later emission to
+        # the same subscriber
+        self._retained: dict[EventId, tuple[int, list[Any], dict[str, Any]]] = {}
+        self._snapshots: dict[EventId, set[Subscriber]] = {}
+        self._retain_lock = threading.Lock()
 
         # client-side map from what the user subscribed to the wire token,
         # keyed by (pub, event): unsubscribe finds the entry by callable
@@ -291,21 +856,61 @@ class Bus:
 
         self._pubsub_lock = threading.Lock()
 
-        self._inbound: Transport = create_transport(self.url.bus)
+        # peers on this host dial the ipc/inproc shortcuts, everyone else
+        # the tcp url; either way that url is the bus identity on the wire
+        self._inbound: Transport = create_listener(self.url.bus, local_transports)
         self._inbound.bind()
 
         # outbound peers, one connection each; the map lock guards only the
         # map — dialing and sending happen under each peer's own lock
         self._peers: dict[str, _Peer] = {}
         self._peers_lock = threading.Lock()
+        # frames each peer may have waiting for a backed-up socket
+        self._send_queue_size = send_queue_size
+        # longest a sender waits for room in a full queue (a request, at
+        # most its own budget): a wedged peer must not hold it forever
+        self._send_timeout = send_timeout
+        # outbound links are closed after peer_idle_timeout without traffic,
+        # and the least recently used one when a new dial exceeds max_peers:
+        # short-lived CLI buses must not leave sockets behind for good. A
+        # closed link is dialed again by the next send
+        self._peer_idle_timeout = peer_idle_timeout
+        self._max_peers = max_peers
+        # buses named by dial(): kept open however quiet they get
+        self._dialed: set[str] = set()
 
         # health check: the backstop for silent partitions that never emit a
         # pipe-removal event (no FIN/RST — pipe eviction cannot see those)
         self._health_interval = health_interval
         self._health_timeout = health_timeout
 
-        self._encoder = msgspec.json.Encoder()
-        self._decoder = msgspec.json.Decoder(Messages)
+        # wire codecs: json is always understood; the preferred codec is
+        # offered in every Ping/Pong and used towards each peer only once
+        # that peer offered it back (buses that predate negotiation never do,
+        # so they keep getting json)
+        self._json = create_codec(DEFAULT_CODEC)
+        self._codec = create_codec(codec)
+        self._codecs_offer = list(dict.fromkeys([self._codec.name, DEFAULT_CODEC]))
+        # negotiated codec per peer bus, guarded by _peers_lock; kept apart
+        # from _peers because a Ping can teach us a codec before we ever
+        # dialed back
+        self._peer_codecs: dict[str, Codec] = {}
+        # peers that took part in negotiation at all (sent an offer): they
+        # are recent enough to understand Cancel
+        self._negotiated_peers: set[str] = set()
+
+        # local messages are handed over as objects, never encoded; whether
+        # they would survive the wire is checked once per signature (see
+        # _local_signature). Strict mode encodes every local message and
+        # refuses the ones a remote bus could not receive (for development)
+        self._strict_local = strict_local
+        self._checked_signatures: set[tuple[Any, ...]] = set()
+
+        # payloads offered for pulling, by stream id; one nobody pulled from
+        # for stream_idle_timeout is dropped by the health thread
+        self._streams: dict[int, _OutStream] = {}
+        self._streams_lock = threading.Lock()
+        self._stream_idle_timeout = stream_idle_timeout
 
     def _wake_selector(self) -> None:
         try:
@@ -355,6 +960,8 @@ class Bus:
         self._running.clear()
         self._mailboxes.close_all()
         self._inbox.put(None)
+        with self._streams_lock:
+            self._streams.clear()
 
         dispatch = getattr(self, "_dispatch_thread", None)
         if dispatch is not None and dispatch is not threading.current_thread():
@@ -364,25 +971,16 @@ class Bus:
         if health is not None and health is not threading.current_thread():
             health.join(timeout=5)
 
-        # stop the lanes: a sentinel wakes each worker; short join only —
-        # they are daemon threads, so a truly hung instrument method cannot
-        # block the interpreter from exiting
+        # stop the lanes: what is still queued is dropped (its callers'
+        # mailboxes are closed already), running methods finish on their own
         with self._lanes_lock:
             lanes = list(self._lanes.values())
             self._lanes.clear()
-            for lane in lanes:
-                lane.closed = True
         for lane in lanes:
-            try:
-                lane.queue.put_nowait(None)
-            except queue.Full:
-                pass
-        for lane in lanes:
-            if (
-                lane.thread is not None
-                and lane.thread is not threading.current_thread()
-            ):
-                lane.thread.join(timeout=1)
+            with lane.lock:
+                lane.closed = True
+                lane.queue.clear()
+        self._lane_pool.shutdown()
 
         # a pool worker asking for teardown must not join its own pool;
         # queued handler work is cancelled (their done-callbacks see
@@ -403,10 +1001,11 @@ class Bus:
         # snapshot under the lock: a concurrent peer eviction may still
         # mutate the map while we tear down
         with self._peers_lock:
-            outbound = [peer.transport for peer in self._peers.values()]
+            outbound = list(self._peers.values())
             self._peers.clear()
-        for socket in outbound:
-            socket.close()
+        for peer in outbound:
+            # wakes its writer and any sender blocked on a full queue
+            peer.close()
 
         self._teardown_finished.set()
 
@@ -420,6 +1019,7 @@ class Bus:
         return (
             current in self._handler_pool._threads
             or current in self._control_pool._threads
+            or self._lane_pool.owns(current)
         )
 
     def stats(self) -> dict[str, Any]:
@@ -445,14 +1045,41 @@ class Bus:
 
         with self._peers_lock:
             peers = list(self._peers.keys())
+            codecs = {bus: self._peer_codecs.get(bus, self._json).name for bus in peers}
+            transports = {
+                bus: (peer.transport.address or bus).split("://")[0]
+                for bus, peer in self._peers.items()
+            }
+            send_queues = {
+                bus: {
+                    "depth": len(peer.pending),
+                    "queued": peer.queued,
+                    "dropped": peer.dropped,
+                    "conflated": peer.conflated,
+                }
+                for bus, peer in self._peers.items()
+            }
+
+        now = time.monotonic()
+        with self._streams_lock:
+            streams = [
+                {
+                    "stream": stream.src,
+                    "consumer": stream.consumer,
+                    "sent": stream.sent,
+                    "size": len(stream.data),
+                    "idle": now - stream.last_active,
+                }
+                for stream in self._streams.values()
+            ]
 
         with self._lanes_lock:
             lanes = [
                 {
                     "path": path,
-                    "queued": lane.queue.qsize(),
-                    "alive": lane.thread.is_alive() if lane.thread else False,
-                    "id": lane.thread.native_id if lane.thread else None,
+                    "queued": lane.pending,
+                    "running": lane.running,
+                    "readers": lane.readers,
                 }
                 for path, lane in self._lanes.items()
             ]
@@ -466,11 +1093,27 @@ class Bus:
             "inbox_size": self._inbox.qsize(),
             "mailboxes": self._mailboxes.stats(),
             "peers": peers,
+            # wire codec negotiated with each peer
+            "codecs": codecs,
+            # how each peer was reached: tcp, ipc or inproc
+            "transports": transports,
+            # frames waiting on a backed-up socket now, and totals since
+            # the peer connected
+            "send_queues": send_queues,
             "subscribers": subscribers,
             "callbacks": callbacks,
             "handler_pool": pool_stats(self._handler_pool),
             "control_pool": pool_stats(self._control_pool),
+            "lane_pool": self._lane_pool.stats(),
             "lanes": lanes,
+            # objects resolved by a Pong, that requests may name by handle
+            "handles": len(self._handles),
+            # target urls proxies here resolve without a ping
+            "resolutions": len(self._resolutions),
+            # payloads offered and not fully pulled yet
+            "streams": streams,
+            # counters and latency histograms since the bus started
+            "metrics": self.metrics.snapshot(),
         }
 
     def __del__(self):
@@ -485,8 +1128,11 @@ class Bus:
                     for sub in self._subscribers[event_id]
                     if sub.subscriber.bus == bus_url
                 }
+                if dead_subscribers:
+                    self._drop_route(event_id, bus_url, len(dead_subscribers))
                 for sub in dead_subscribers:
                     self._subscribers[event_id].discard(sub)
+                    self._drop_filter(event_id, sub)
                     # Also clean up from callbacks if this is our local bus
                     if event_id in self._callbacks and sub in self._callbacks[event_id]:
                         del self._callbacks[event_id][sub]
@@ -502,15 +1148,22 @@ class Bus:
     def _ping_peer(self, dst_bus: str) -> bool:
         """True if the peer answered anything at all within the health
         timeout — even a not-found Pong proves the bus over there is alive."""
-        ping = Protocol.ping(src=self.url.url, dst=f"{dst_bus}{MANAGER_LOCATION}")
+        ping = Protocol.ping(
+            src=self.url.url,
+            dst=f"{dst_bus}{MANAGER_LOCATION}",
+            codecs=self._codecs_offer,
+        )
         mailbox = self._mailboxes.register(ping.id, ping.dst_bus)
         try:
             if not self._push(ping):
                 return False
             try:
-                return mailbox.get(timeout=self._health_timeout) is not None
+                pong = mailbox.get(timeout=self._health_timeout)
             except queue.Empty:
                 return False
+            if isinstance(pong, Pong):
+                self._negotiate_codec(dst_bus, pong.codecs)
+            return pong is not None
         finally:
             self._mailboxes.unregister(ping.id)
 
@@ -533,12 +1186,85 @@ class Bus:
                 self._evict_peer(dst_bus)
 
     def _health_loop(self) -> None:
-        while not self._shutdown_done.wait(self._health_interval):
+        # idle lanes are swept on their own, possibly shorter, cadence
+        tick = min(self._health_interval, self._lane_idle_timeout)
+        next_check = time.monotonic() + self._health_interval
+        while not self._shutdown_done.wait(tick):
             try:
+                self._reap_idle_lanes()
+                if time.monotonic() < next_check:
+                    continue
+                next_check = time.monotonic() + self._health_interval
+                self._reap_idle_peers()
                 self._health_check_once()
+                self._expire_streams()
             except Exception:
                 log.exception("bus: health check failed")
 
+    def _reap_idle_lanes(self) -> None:
+        deadline = time.monotonic() - self._lane_idle_timeout
+        # enqueue holds _lanes_lock while queueing: nothing slips in unseen
+        with self._lanes_lock:
+            for resource, lane in list(self._lanes.items()):
+                with lane.lock:
+                    if lane.idle() and lane.last_active < deadline:
+                        lane.closed = True
+                        del self._lanes[resource]
+
+    def _reap_idle_peers(self) -> None:
+        deadline = time.monotonic() - self._peer_idle_timeout
+        with self._peers_lock:
+            idle = [
+                bus
+                for bus, peer in self._peers.items()
+                if peer.last_used < deadline
+                and not peer.pending
+                and bus not in self._dialed
+            ]
+        for bus in idle:
+            log.debug(f"bus: closing idle connection to {bus}")
+            # gone quiet for that long: most likely a CLI that exited, so
+            # its codec is forgotten too (the next Ping renegotiates)
+            self._close_peer(bus, forget=True)
+
+    def _close_peer(self, dst_bus: str, *, forget: bool = False) -> None:
+        """Close our outbound link to a peer that is still alive as far as we
+        know: unlike _evict_peer, its subscriptions and pending requests stay
+        (replies travel on its own link to us)."""
+        with self._peers_lock:
+            peer = self._peers.pop(dst_bus, None)
+            if forget:
+                self._peer_codecs.pop(dst_bus, None)
+                self._negotiated_peers.discard(dst_bus)
+        if peer is not None:
+            peer.close()
+        if forget:
+            # resolving again renegotiates the codec
+            self._forget_resolutions(dst_bus)
+            self.metrics.forget_peer(dst_bus)
+
+    def dial(self, buses: Sequence[str]) -> None:
+        """Connect to these buses ahead of the first message, in the
+        background, and keep them connected: pre-dialing the peers a config
+        names saves their first request the connect and codec round trips."""
+        for bus in buses:
+            bus = create_url(bus, cls="Bus").bus
+            self._dialed.add(bus)
+            self._control_pool.submit(self._ping_peer, bus)
+
+    def _expire_streams(self) -> None:
+        deadline = time.monotonic() - self._stream_idle_timeout
+        with self._streams_lock:
+            expired = [
+                id
+                for id, stream in self._streams.items()
+                if stream.last_active < deadline
+            ]
+            for id in expired:
+                del self._streams[id]
+        for id in expired:
+            log.debug(f"bus: stream {id} idle, dropped")
+
     def _schedule_peer_eviction(self, dst_bus: str) -> None:
         # called from a transport worker thread on connection loss: hand off
         # immediately, socket operations are not allowed in that context
@@ -558,21 +1284,28 @@ class Bus:
         subscribers must re-subscribe)."""
         with self._peers_lock:
             peer = self._peers.pop(dst_bus, None)
+            # whatever comes back on that address negotiates again
+            self._peer_codecs.pop(dst_bus, None)
+            self._negotiated_peers.discard(dst_bus)
+            evicted_at = time.monotonic()
 
         if peer is None:
             # already evicted, or racing our own shutdown
             return
 
         log.debug(f"bus: peer disconnected, evicting: {dst_bus}")
-        peer.transport.close()
+        peer.close()
+        self._forget_resolutions(dst_bus)
+        self.metrics.forget_peer(dst_bus)
         self._cleanup_dead_subscribers(dst_bus)
-        self._mailboxes.fail_peer(dst_bus)
+        self._mailboxes.fail_peer(dst_bus, before=evicted_at)
 
-    def _push(self, message: Messages) -> PushResult:
+    def _push(self, message: Messages, *, block: bool = True) -> PushResult:
         """Hand a message to its destination. Falsy results mean the message
         definitively could not be delivered — and say why; backpressure drops
         (DROPPED) are truthy: the peer is alive and a caller timeout covers
-        the loss."""
+        the loss. With block=False (event loop threads) it returns
+        WOULD_BLOCK instead of dialing or waiting for queue room."""
         if self.is_dead():
             log.warning("push failed, bus is dead, not accepting new messages")
             return PushResult.BUS_DEAD
@@ -581,15 +1314,12 @@ class Bus:
             # NOTE: we don't need to serialize/deserialize messages sent locally
             #       but we must check if they are serializable, otherwise code won't
             #       work when sending to remote buses.
-            try:
-                _ = self._encoder.encode(message)
-            except Exception:
-                log.exception(
-                    f"bus: serialization issue, won't work on remote buses: {message}"
-                )
+            if not self._check_local(message):
+                return PushResult.ENCODE_FAILED
+            self.metrics.sent(type(message).__name__)
 
             # FIXME: this could block if you send too much without receiving.
-            if isinstance(message, Response) or isinstance(message, Pong):
+            if isinstance(message, Response | Pong | Chunk):
                 if not self._mailboxes.deliver(message.id, message):
                     # nobody is waiting: late reply after a timeout/unregister,
                     # or a stray id — drop it loudly, never resurrect a queue
@@ -601,48 +1331,272 @@ class Bus:
                 self._inbox.put(message)
             return PushResult.OK
         else:
-            # encode outside every lock
-            try:
-                message_bytes = self._encoder.encode(message)
-            except Exception:
-                log.exception(f"bus: failed to encode message: {message}")
+            # encode outside every lock (but the tiny codec lookup)
+            message_bytes = self._encode(message)
+            if message_bytes is None:
                 return PushResult.ENCODE_FAILED
+            return self._send(message.dst_bus, message_bytes, message, block=block)
 
-            peer = self._get_peer(message.dst_bus)
-            if peer is None:
-                return PushResult.NO_PEER
-
-            with peer.lock:
+    def _send(
+        self,
+        dst_bus: str,
+        message_bytes: bytes,
+        message: Messages,
+        *,
+        block: bool = True,
+    ) -> PushResult:
+        """Put an encoded frame on the wire to dst_bus (see _push): directly
+        if the socket takes it, through the peer's send queue otherwise."""
+        if block:
+            peer = self._get_peer(dst_bus)
+        else:
+            with self._peers_lock:
+                peer = self._peers.get(dst_bus)
+            if peer is None or self._would_block(peer, message):
+                return PushResult.WOULD_BLOCK
+        if peer is None:
+            return PushResult.NO_PEER
+
+        kind = type(message).__name__
+        self.metrics.sent(kind, dst_bus, len(message_bytes))
+        with peer.cond:
+            if not isinstance(message, Ping):
+                peer.last_used = time.monotonic()
+            if not peer.pending and not peer.closed:
                 result = peer.transport.send(message_bytes)
-                if result is SendResult.AGAIN:
-                    # backpressure beyond the socket buffer: a short bounded
-                    # retry absorbs sustained bursts; only this peer's
-                    # senders wait
-                    for _ in range(3):
-                        time.sleep(0.01)
-                        result = peer.transport.send(message_bytes)
-                        if result is not SendResult.AGAIN:
-                            break
-
-            match result:
-                case SendResult.OK:
+                if result is SendResult.OK:
                     return PushResult.OK
-                case SendResult.AGAIN:
-                    # still full: drop this message but never evict — a slow
-                    # peer is not a dead one
-                    log.warning(
-                        f"bus: send buffer full for {message.dst_bus}, "
-                        f"dropping {type(message).__name__}"
-                    )
-                    return PushResult.DROPPED
-                case SendResult.DEAD:
+                if result is SendResult.DEAD:
                     # if the peer is really gone the transport will notify
                     # us and _evict_peer does the cleanup
-                    log.warning(
-                        f"bus: send failed to {message.dst_bus}, "
-                        f"dropping {type(message).__name__}"
-                    )
+                    log.warning(f"bus: send failed to {dst_bus}, dropping {kind}")
                     return PushResult.SEND_DEAD
+            # backpressure (or frames already waiting): the writer takes over
+            return self._enqueue(dst_bus, peer, message_bytes, message, block=block)
+
+    def _would_block(self, peer: _Peer, message: Messages) -> bool:
+        # a hint, read without the lock: _enqueue checks again
+        policy = _SEND_POLICIES.get(type(message), SendPolicy.BLOCK)
+        return (
+            policy is SendPolicy.BLOCK
+            and len(peer.pending) >= self._send_queue_size
+            and not peer.closed
+        )
+
+    def _enqueue(
+        self,
+        dst_bus: str,
+        peer: _Peer,
+        message_bytes: bytes,
+        message: Messages,
+        *,
+        block: bool = True,
+    ) -> PushResult:
+        # caller holds peer.cond
+        kind = type(message).__name__
+        policy = _SEND_POLICIES.get(type(message), SendPolicy.BLOCK)
+
+        wait_until = None
+        key = None
+        if policy is SendPolicy.CONFLATE and isinstance(message, Event):
+            # a frame addressed to some subscriptions only (filters,
+            # retained replay) must not replace one for other subscriptions
+            key = (message.src, message.event, tuple(message.callbacks or ()))
+
+        while len(peer.pending) >= self._send_queue_size and not peer.closed:
+            waiting = peer.conflatable.get(key) if key is not None else None
+            if waiting is not None:
+                # only when full: with room, every sample still goes out
+                waiting.data = message_bytes
+                peer.conflated += 1
+                return PushResult.QUEUED
+            if policy is not SendPolicy.BLOCK:
+                peer.dropped += 1
+                log.warning(f"bus: send queue full for {dst_bus}, dropping {kind}")
+                return PushResult.DROPPED
+            if not block:
+                return PushResult.WOULD_BLOCK
+            # a slow peer throttles its own senders; a dead one is evicted
+            # by the transport or the health check, which wakes us
+            if wait_until is None:
+                timeout = self._send_timeout
+                if isinstance(message, Request) and message.budget is not None:
+                    timeout = min(timeout, message.budget / 1e9)
+                wait_until = time.monotonic() + timeout
+            remaining = wait_until - time.monotonic()
+            if remaining > 0:
+                peer.cond.wait(remaining)
+                continue
+            # wedged but not (yet) found dead: give up on this frame
+            peer.dropped += 1
+            log.warning(f"bus: send queue for {dst_bus} stuck, dropping {kind}")
+            return PushResult.SEND_DEAD
+
+        if peer.closed:
+            log.warning(f"bus: peer {dst_bus} gone, dropping {kind}")
+            return PushResult.SEND_DEAD
+
+        outgoing = _Outgoing(message_bytes, kind, key)
+        peer.pending.append(outgoing)
+        if key is not None:
+            peer.conflatable[key] = outgoing
+        peer.queued += 1
+
+        if peer.writer is None:
+            peer.writer = threading.Thread(
+                target=self._peer_writer,
+                args=(dst_bus, peer),
+                name=f"chimera-bus-writer-{self.url.port}",
+                daemon=True,
+            )
+            peer.writer.start()
+        peer.cond.notify_all()
+        return PushResult.QUEUED
+
+    def _peer_writer(self, dst_bus: str, peer: _Peer) -> None:
+        """Drain a peer's send queue: every wakeup sends as many frames as
+        the socket takes, then waits for it to become writable again."""
+        while True:
+            with peer.cond:
+                while not peer.pending and not peer.closed:
+                    peer.cond.wait()
+                if peer.closed:
+                    return
+
+                sent = 0
+                while peer.pending:
+                    outgoing = peer.pending[0]
+                    result = peer.transport.send(outgoing.data)
+                    if result is SendResult.AGAIN:
+                        break
+                    peer.pending.popleft()
+                    if (
+                        outgoing.key is not None
+                        and peer.conflatable.get(outgoing.key) is outgoing
+                    ):
+                        del peer.conflatable[outgoing.key]
+                    sent += 1
+                    if result is SendResult.DEAD:
+                        log.warning(
+                            f"bus: send failed to {dst_bus}, dropping {outgoing.kind}"
+                        )
+                if sent:
+                    # room for senders blocked on a full queue
+                    peer.cond.notify_all()
+                backed_up = bool(peer.pending)
+
+            if backed_up:
+                self._wait_writable(peer.transport)
+
+    @staticmethod
+    def _wait_writable(transport: Transport) -> None:
+        # outside the peer lock: senders keep queueing meanwhile
+        fd = transport.send_fd()
+        if fd is None or fd < 0:
+            time.sleep(0.01)
+            return
+        try:
+            select.select([fd], [], [], 0.1)
+        except (OSError, ValueError):
+            # closed under us: the next round sees peer.closed
+            time.sleep(0.01)
+
+    @staticmethod
+    def _local_signature(message: Messages) -> tuple[Any, ...] | None:
+        """What makes a local message's payload (un)serializable: the method
+        or event and the nested types of its arguments or result (see
+        _shape). None for framework messages, which are built from strings
+        and ints only. A bad value past the sampled items or levels goes
+        unnoticed until strict_local (or a remote bus) meets it."""
+        match message:
+            case Request():
+                return (
+                    Request,
+                    message.dst,
+                    message.method,
+                    _shape(message.args),
+                    _shape(message.kwargs),
+                )
+            case Response():
+                return (Response, message.src, _shape(message.result))
+            case Publish():
+                return (
+                    Publish,
+                    message.pub,
+                    message.event,
+                    _shape(message.args),
+                    _shape(message.kwargs),
+                )
+            case _:
+                # Event payloads were checked as their Publish
+                return None
+
+    def _check_local(self, message: Messages) -> bool:
+        if self._strict_local:
+            try:
+                _ = self._json.encode(message)
+            except Exception:
+                log.exception(f"bus: not serializable, refusing (strict): {message}")
+                return False
+            return True
+
+        signature = self._local_signature(message)
+        if signature is None or signature in self._checked_signatures:
+            return True
+
+        # first message of this kind: a racing duplicate check is harmless
+        self._checked_signatures.add(signature)
+        try:
+            _ = self._json.encode(message)
+        except Exception:
+            log.exception(
+                f"bus: serialization issue, won't work on remote buses: {message}"
+            )
+        return True
+
+    def _encode(self, message: Messages) -> bytes | None:
+        with self._peers_lock:
+            codec = self._peer_codecs.get(message.dst_bus, self._json)
+
+        try:
+            t0 = time.perf_counter()
+            data = codec.encode(message)
+            self.metrics.encoded(time.perf_counter() - t0)
+            return data
+        except Exception:
+            if codec is self._json:
+                log.exception(f"bus: failed to encode message: {message}")
+                return None
+
+        # the binary codec is stricter on a few payloads (ints wider than 64
+        # bits): frames are self-describing, so json still reaches the peer
+        try:
+            return self._json.encode(message)
+        except Exception:
+            log.exception(f"bus: failed to encode message: {message}")
+            return None
+
+    def _negotiate_codec(self, bus: str, offered: list[str] | None) -> None:
+        """Pick the codec for messages to `bus` from what it offered in a
+        Ping/Pong: our preferred one if it takes it, json otherwise."""
+        if bus == self.url.bus:
+            # local messages never hit the wire
+            return
+
+        codec = self._codec if offered and self._codec.name in offered else self._json
+        with self._peers_lock:
+            if offered is None:
+                self._negotiated_peers.discard(bus)
+            else:
+                self._negotiated_peers.add(bus)
+            current = self._peer_codecs.get(bus, self._json)
+            if codec is self._json:
+                self._peer_codecs.pop(bus, None)
+            else:
+                self._peer_codecs[bus] = codec
+
+        if codec is not current:
+            log.debug(f"bus: using {codec.name} codec for {bus}")
 
     def _get_peer(self, dst_bus: str) -> _Peer | None:
         with self._peers_lock:
@@ -652,7 +1606,6 @@ class Bus:
 
         # dial outside the map lock: a black-holed peer blocking in connect
         # must not freeze senders to healthy peers (H1)
-        # TODO: define some policy to handle closing of these sockets when not in use
         transport = create_transport(dst_bus)
         # peer loss is detected by the transport (pipe removal) and handled
         # off the transport thread; the send path itself never evicts
@@ -674,7 +1627,22 @@ class Bus:
                 return existing
             peer = _Peer(transport)
             self._peers[dst_bus] = peer
-            return peer
+
+            lru = None
+            if len(self._peers) > self._max_peers:
+                # prefer a link with nothing queued: closing drops its queue
+                lru = min(
+                    (bus for bus in self._peers if bus != dst_bus),
+                    key=lambda bus: (
+                        bool(self._peers[bus].pending),
+                        self._peers[bus].last_used,
+                    ),
+                )
+
+        if lru is not None:
+            log.debug(f"bus: {self._max_peers} peers open, closing {lru}")
+            self._close_peer(lru)
+        return peer
 
     def _pop(self, /, timeout: float | None = None) -> Messages | None:
         message = self._inbox.get(block=True, timeout=timeout)
@@ -749,11 +1717,18 @@ class Bus:
                 # crash the loop — recv() returns None in both cases
                 while (recv_bytes := self._inbound.recv()) is not None:
                     # FIXME: this could fail, check and push back errors if needed.
+                    t0 = time.perf_counter()
                     try:
-                        message: Messages = self._decoder.decode(recv_bytes)
+                        message: Messages = decode_message(recv_bytes)
                     except msgspec.DecodeError:
                         log.exception(f"bus: failed to decode message: {recv_bytes}")
                         continue
+                    self.metrics.received(
+                        type(message).__name__,
+                        message.src_bus,
+                        len(recv_bytes),
+                        time.perf_counter() - t0,
+                    )
 
                     # FIXME: check for simple mistakes, like messages to the wrong receiver
                     self._push(message)
@@ -771,6 +1746,7 @@ class Bus:
         ping = Protocol.ping(
             src=parse_url(src).url,
             dst=parse_url(dst).url,
+            codecs=self._codecs_offer,
         )
 
         mailbox = self._mailboxes.register(ping.id, ping.dst_bus)
@@ -786,6 +1762,7 @@ class Bus:
             if response is None or not isinstance(response, Pong):
                 return None
 
+            self._negotiate_codec(ping.dst_bus, response.codecs)
             return response
         finally:
             self._mailboxes.unregister(ping.id)
@@ -801,29 +1778,255 @@ class Bus:
         # no default timeout: instrument operations (slew, expose, ...) can
         # legitimately take unbounded time; callers opt in per call or proxy
         timeout: float | None = None,
+        # dst's handle on its bus, from the Pong that resolved it
+        handle: int | None = None,
     ) -> Response:
+        parent = current_trace()
         request = Protocol.request(
             src=parse_url(src).url,
             dst=parse_url(dst).url,
             method=method,
             args=args or [],
             kwargs=kwargs or {},
+            handle=handle,
+            trace=_child_trace(parent),
+            budget=_budget(timeout),
         )
 
+        started = time.perf_counter()
         mailbox = self._mailboxes.register(request.id, request.dst_bus)
         try:
-            if not self._push(request):
-                raise BusDeadException(
-                    f"cannot send request {method} to {request.dst}: "
-                    "bus or peer is dead"
+            self._send_request(request)
+            return self._wait_response(request, mailbox, timeout)
+        except RequestTimeoutException:
+            # nobody waits for it anymore: don't let it run late
+            self._cancel_remote(request)
+            raise
+        finally:
+            self._mailboxes.unregister(request.id)
+            if parent is not None:
+                self._record_call(request, parent, started)
+
+    def request_many(
+        self,
+        *,
+        src: str | URL,
+        calls: list[Call],
+        timeout: float | None = None,
+    ) -> list[Response]:
+        """Pipelined requests: every call is sent before waiting for the
+        first reply, so N calls cost about one round trip instead of N.
+        Responses come back in call order; `timeout` bounds the whole batch.
+        Raises like request() if any call cannot be sent or answered."""
+        src_url = parse_url(src).url
+        parent = current_trace()
+        budget = _budget(timeout)
+        requests = [
+            Protocol.request(
+                src=src_url,
+                dst=parse_url(call.dst).url,
+                method=call.method,
+                args=call.args or [],
+                kwargs=call.kwargs or {},
+                handle=call.handle,
+                trace=_child_trace(parent),
+                budget=budget,
+            )
+            for call in calls
+        ]
+        started = time.perf_counter()
+
+        mailboxes = [
+            self._mailboxes.register(request.id, request.dst_bus)
+            for request in requests
+        ]
+        try:
+            for sent, request in enumerate(requests):
+                try:
+                    self._send_request(request)
+                except Exception:
+                    # the ones already out must not run for nobody
+                    for earlier in requests[:sent]:
+                        self._cancel_remote(earlier)
+                    raise
+
+            ends = None if timeout is None else time.monotonic() + timeout
+            responses = []
+            try:
+                for request, mailbox in zip(requests, mailboxes):
+                    remaining = None
+                    if ends is not None:
+                        remaining = max(0.0, ends - time.monotonic())
+                    responses.append(self._wait_response(request, mailbox, remaining))
+            except RequestTimeoutException:
+                for request in requests[len(responses) :]:
+                    self._cancel_remote(request)
+                raise
+            return responses
+        finally:
+            for request in requests:
+                self._mailboxes.unregister(request.id)
+                if parent is not None:
+                    self._record_call(request, parent, started)
+
+    def request_future(
+        self,
+        *,
+        src: str | URL,
+        dst: str | URL,
+        method: str,
+        args: list[Any] | None = None,
+        kwargs: dict[str, Any] | None = None,
+        handle: int | None = None,
+    ) -> Future[Response]:
+        """Send a request and return at once: the Future completes when the
+        Response arrives, with no thread waiting for it. Done-callbacks run
+        on the bus thread that delivered the reply, so keep them short. Bound
+        the wait with future.result(timeout); cancel() drops the reply and
+        asks the target to skip the request, or to cancel its token if it
+        is running."""
+        parent = current_trace()
+        request = Protocol.request(
+            src=parse_url(src).url,
+            dst=parse_url(dst).url,
+            method=method,
+            args=args or [],
+            kwargs=kwargs or {},
+            handle=handle,
+            trace=_child_trace(parent),
+            budget=_budget(None),
+        )
+
+        started = time.perf_counter()
+        future: Future[Response] = Future()
+
+        def complete(response: Messages | None) -> None:
+            self._mailboxes.unregister(request.id)
+            if parent is not None:
+                self._record_call(request, parent, started)
+            if not future.set_running_or_notify_cancel():
+                # cancelled: the reply has no taker
+                return
+            if response is None or not isinstance(response, Response):
+                future.set_exception(
+                    BusDeadException(
+                        f"bus died while waiting for {method} on {request.dst}"
+                    )
                 )
+            else:
+                future.set_result(response)
+
+        def cancelled(future: Future[Response]) -> None:
+            if future.cancelled():
+                self._mailboxes.unregister(request.id)
+                self._cancel_remote(request)
+
+        self._mailboxes.register_callback(request.id, request.dst_bus, complete)
+        future.add_done_callback(cancelled)
+
+        try:
+            self._send_request(request)
+        except Exception as e:
+            self._mailboxes.unregister(request.id)
+            # a dead bus may have completed it already, at registration
+            if not future.done() and future.set_running_or_notify_cancel():
+                future.set_exception(e)
+
+        return future
+
+    def _cancel_remote(
+        self, request: Request, loop: asyncio.AbstractEventLoop | None = None
+    ) -> None:
+        """Ask the target bus to drop a request that has not started yet, or
+        to cancel the token of a running one. Best effort: buses that predate
+        negotiation cannot decode a Cancel, so they never get one. From an
+        event loop (`loop` given) it never waits: a Cancel that would is
+        sent from a worker thread, unawaited."""
+        if request.dst_bus != self.url.bus:
+            with self._peers_lock:
+                if request.dst_bus not in self._negotiated_peers:
+                    return
+        cancel = Protocol.cancel(request)
+        if loop is None:
+            self._push(cancel)
+        elif self._push(cancel, block=False) is PushResult.WOULD_BLOCK:
+            loop.run_in_executor(None, self._push, cancel)
+
+    async def aping(
+        self,
+        *,
+        src: str | URL,
+        dst: str | URL,
+        timeout: float = 5.0,
+    ) -> None | Pong:
+        """asyncio flavour of ping(): awaits the Pong without a thread."""
+        ping = Protocol.ping(
+            src=parse_url(src).url,
+            dst=parse_url(dst).url,
+            codecs=self._codecs_offer,
+        )
+
+        mailbox = self._mailboxes.register_future(
+            ping.id, ping.dst_bus, asyncio.get_running_loop()
+        )
+        try:
+            if not await self._asend(ping):
+                return ping.pong(ok=False)
 
             try:
-                response = mailbox.get(timeout=timeout)
-            except queue.Empty:
+                response = await asyncio.wait_for(mailbox.future, timeout)
+            except TimeoutError:
+                return ping.pong(ok=False)
+            if response is None or not isinstance(response, Pong):
+                return None
+
+            self._negotiate_codec(ping.dst_bus, response.codecs)
+            return response
+        finally:
+            self._mailboxes.unregister(ping.id)
+
+    async def arequest(
+        self,
+        *,
+        src: str | URL,
+        dst: str | URL,
+        method: str,
+        args: list[Any] | None = None,
+        kwargs: dict[str, Any] | None = None,
+        timeout: float | None = None,
+        handle: int | None = None,
+    ) -> Response:
+        """asyncio flavour of request(): the reply resolves a future on the
+        running loop, so one loop keeps any number of calls in flight."""
+        parent = current_trace()
+        request = Protocol.request(
+            src=parse_url(src).url,
+            dst=parse_url(dst).url,
+            method=method,
+            args=args or [],
+            kwargs=kwargs or {},
+            handle=handle,
+            trace=_child_trace(parent),
+            budget=_budget(timeout),
+        )
+
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        mailbox = self._mailboxes.register_future(request.id, request.dst_bus, loop)
+        try:
+            self._check_sent(request, await self._asend(request))
+
+            try:
+                response = await asyncio.wait_for(mailbox.future, timeout)
+            except TimeoutError:
+                self._cancel_remote(request, loop)
                 raise RequestTimeoutException(
                     f"no response for {method} on {request.dst} after {timeout}s"
                 ) from None
+            except asyncio.CancelledError:
+                # the awaiting task was cancelled: so is the request
+                self._cancel_remote(request, loop)
+                raise
 
             if response is None or not isinstance(response, Response):
                 raise BusDeadException(
@@ -833,6 +2036,63 @@ class Bus:
             return response
         finally:
             self._mailboxes.unregister(request.id)
+            if parent is not None:
+                self._record_call(request, parent, started)
+
+    def _record_call(self, request: Request, parent: Trace, started: float) -> None:
+        # the caller's side of a traced request: send to reply (or giving up)
+        assert request.trace is not None
+        self.tracer.record(
+            f"call {request.method}",
+            "call",
+            started,
+            time.perf_counter(),
+            request.trace,
+            parent.span,
+            {"dst": request.dst},
+        )
+
+    def _send_request(self, request: Request) -> None:
+        self._check_sent(request, self._push(request))
+
+    async def _asend(self, message: Messages) -> PushResult:
+        # from the event loop: never waits there, a send that would is
+        # handed to a worker thread
+        result = self._push(message, block=False)
+        if result is PushResult.WOULD_BLOCK:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, self._push, message)
+        return result
+
+    @staticmethod
+    def _check_sent(request: Request, push_result: PushResult) -> None:
+        if push_result is PushResult.ENCODE_FAILED:
+            raise TypeError(
+                f"cannot send request {request.method} to {request.dst}: "
+                "arguments are not serializable"
+            )
+        if not push_result:
+            raise BusDeadException(
+                f"cannot send request {request.method} to {request.dst}: "
+                "bus or peer is dead"
+            )
+
+    def _wait_response(
+        self, request: Request, mailbox: _Mailbox, timeout: float | None
+    ) -> Response:
+        try:
+            response = mailbox.get(timeout=timeout)
+        except queue.Empty:
+            raise RequestTimeoutException(
+                f"no response for {request.method} on {request.dst} after {timeout}s"
+            ) from None
+
+        if response is None or not isinstance(response, Response):
+            raise BusDeadException(
+                f"bus died while waiting for {request.method} on {request.dst}"
+            )
+
+        return response
 
     def subscribe(
         self,
@@ -841,7 +2101,15 @@ class Bus:
         pub: str | URL,
         event: str,
         callback: Callable[..., None],
+        filter: Filter | None = None,
     ):
+        """Call `callback` on every emission of `event` by `pub`, or only on
+        the ones that pass `filter`, which the publisher's bus evaluates: the
+        rest never leave it. Subscribing an already subscribed callback again
+        does nothing, whatever the filter."""
+        if filter is not None:
+            validate_filter(filter)
+
         pub_url = parse_url(pub)
         sub_url = parse_url(sub)
         event_id = EventId(pub_url.url, event)
@@ -869,6 +2137,7 @@ class Bus:
                 pub=pub_url.url,
                 event=event,
                 callback=token,
+                filter=filter,
             )
         )
         if not push_result:
@@ -935,7 +2204,10 @@ class Bus:
         event: str,
         args: list[Any] | None = None,
         kwargs: dict[str, Any] | None = None,
+        retain: bool = False,
     ) -> None:
+        """Emit `event` from `pub`. A retained emission is also kept as the
+        event's last value: every later subscriber gets it first thing."""
         # TODO: should we return something to confirm delivery?
         self._push(
             Protocol.publish(
@@ -943,9 +2215,127 @@ class Bus:
                 event=event,
                 args=args or [],
                 kwargs=kwargs or {},
+                retain=retain,
             )
         )
 
+    def forget_retained(self, object: str, event: str | None = None) -> None:
+        """Drop the last values retained for the events of an object (by
+        path) that is going away, or for just one `event` of it that is no
+        longer current."""
+        with self._pubsub_lock:
+            for event_id in list(self._retained):
+                if event is not None and event_id.event != event:
+                    continue
+                if parse_url(event_id.publisher).path == object:
+                    del self._retained[event_id]
+                    self._snapshots.pop(event_id, None)
+
+    def submit(self, fn: Callable[[], None]) -> None:
+        """Run `fn` soon on the handler pool: work the calling thread must
+        not wait for, and which may block like any handler. Dropped once
+        the bus is shutting down."""
+        with contextlib.suppress(RuntimeError):
+            self._handler_pool.submit(fn)
+
+    def offer(
+        self,
+        data: Any,
+        *,
+        meta: dict[str, Any] | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> dict[str, Any]:
+        """Make a large binary payload (bytes, an mmap, a contiguous numpy
+        array: anything with the buffer protocol) available for pulling, and
+        return its handle. Return the handle from a method; the caller passes
+        it to pull(). Nothing is copied: keep `data` unchanged until pulled.
+
+        The handle is a plain dict so it travels in any Response:
+        {"stream": id, "src": url, "size": bytes, "meta": meta}."""
+        view = memoryview(data).cast("B")
+        id = Protocol.id()
+        stream = _OutStream(id, f"{self.url.bus}/Stream/{id}", view, chunk_size)
+        with self._streams_lock:
+            self._streams[id] = stream
+        return {"stream": id, "src": stream.src, "size": len(view), "meta": meta}
+
+    def pull(
+        self,
+        handle: dict[str, Any],
+        *,
+        src: str | URL,
+        window: int = STREAM_WINDOW,
+        timeout: float | None = 30.0,
+    ) -> Iterator[bytes]:
+        """Iterate over the chunks of an offered payload, in order. At most
+        `window` chunks are in flight or buffered, whatever the payload size;
+        each consumed chunk lets the producer send another. `timeout` bounds
+        the wait for each chunk. Leaving the loop early aborts the transfer.
+
+        For a whole payload: b"".join(bus.pull(handle, src=...))."""
+        id = handle["stream"]
+        producer = parse_url(handle["src"])
+        src = parse_url(src).url
+        window = max(1, window)
+
+        if producer.bus != self.url.bus:
+            with self._peers_lock:
+                negotiated = producer.bus in self._negotiated_peers
+            if not negotiated:
+                # agree on a binary codec first: json would base64 each chunk
+                self.ping(src=src, dst=producer.url)
+
+        mailbox = self._mailboxes.register(id, producer.bus)
+        finished = False
+        try:
+            self._grant(src, producer.url, id, window)
+
+            seq = 0
+            consumed = 0
+            while True:
+                try:
+                    chunk = mailbox.get(timeout=timeout)
+                except queue.Empty:
+                    raise RequestTimeoutException(
+                        f"no data from stream {producer.url} after {timeout}s"
+                    ) from None
+
+                if chunk is None or not isinstance(chunk, Chunk):
+                    raise BusDeadException(
+                        f"bus died while pulling from stream {producer.url}"
+                    )
+                if chunk.error is not None:
+                    finished = True
+                    raise StreamException(chunk.error)
+                if chunk.seq != seq:
+                    raise StreamException(
+                        f"stream {producer.url}: lost chunk {seq} (got {chunk.seq})"
+                    )
+                seq += 1
+                finished = chunk.eof
+
+                if chunk.data:
+                    yield chunk.data
+                if finished:
+                    return
+
+                # top the window up in batches: one Credit per few chunks
+                consumed += 1
+                if consumed >= (window + 1) // 2:
+                    self._grant(src, producer.url, id, consumed)
+                    consumed = 0
+        finally:
+            self._mailboxes.unregister(id)
+            if not finished:
+                # early exit, timeout or a dead bus: free the producer side
+                self._push(Protocol.cancel_stream(src=src, dst=producer.url, id=id))
+
+    def _grant(self, src: str, dst: str, id: int, credit: int) -> None:
+        if not self._push(Protocol.credit(src=src, dst=dst, id=id, credit=credit)):
+            raise BusDeadException(
+                f"cannot pull from stream {dst}: bus or peer is dead"
+            )
+
     #
     # bus server-side handling
     #
@@ -964,6 +2354,10 @@ class Bus:
                         self._handle_subscribe(message)
                     case Unsubscribe():
                         self._handle_unsubscribe(message)
+                    case Cancel():
+                        self._handle_cancel(message)
+                    case Credit():
+                        _ = self._control_pool.submit(self._handle_credit, message)
                     case Ping():
                         _ = self._control_pool.submit(self._handle_ping, message)
                     case Publish():
@@ -992,47 +2386,187 @@ class Bus:
     ) -> tuple[str | None, Callable[..., Any] | None]:
         return None, None
 
+    def resolve_object(
+        self, object: str
+    ) -> tuple[str | None, Callable[[str], Callable[..., Any] | None] | None]:
+        """The object's path and a method lookup bound to it, or (None, None)
+        if there is no such object: what a handle dispatches through. The
+        default hands out no handles."""
+        return None, None
+
+    def invalidate_handle(self, object: str) -> None:
+        """Forget the handle of an object (by path) that is going away:
+        requests still carrying it fall back to resolving their dst."""
+        with self._handles_lock:
+            handle = self._handle_ids.pop(object, None)
+            if handle is not None:
+                del self._handles[handle]
+        # ... and local proxies for it resolve again
+        with self._resolutions_lock:
+            for url, (resolved, _, _) in list(self._resolutions.items()):
+                if resolved.bus == self.url.bus and resolved.path == object:
+                    del self._resolutions[url]
+
+    def cached_resolution(self, url: str) -> tuple[URL, int | None] | None:
+        """The resolved url and handle a proxy for `url` got from its ping,
+        if that was less than resolve_ttl ago."""
+        with self._resolutions_lock:
+            entry = self._resolutions.get(url)
+            if entry is None:
+                return None
+            resolved, handle, expires = entry
+            if time.monotonic() >= expires:
+                del self._resolutions[url]
+                return None
+            return resolved, handle
+
+    def cache_resolution(self, url: str, resolved: URL, handle: int | None) -> None:
+        with self._resolutions_lock:
+            self._resolutions[url] = (
+                resolved,
+                handle,
+                time.monotonic() + self._resolve_ttl,
+            )
+
+    def forget_resolution(self, url: str) -> None:
+        """Drop the cached resolution of `url`: its object was not found."""
+        with self._resolutions_lock:
+            self._resolutions.pop(url, None)
+
+    def _forget_resolutions(self, dst_bus: str) -> None:
+        with self._resolutions_lock:
+            for url, (resolved, _, _) in list(self._resolutions.items()):
+                if resolved.bus == dst_bus or url.startswith(dst_bus + "/"):
+                    del self._resolutions[url]
+
+    def _handle_for(self, object: str) -> int | None:
+        # resolved under the lock: an object removed meanwhile is either
+        # not found here or invalidated right after, never left behind
+        with self._handles_lock:
+            path, resolve = self.resolve_object(object)
+            if path is None or resolve is None:
+                return None
+
+            handle = self._handle_ids.get(path)
+            if handle is None:
+                handle = Protocol.id()
+                cls, _ = parse_path(path)
+                self._handles[handle] = _Handle(path, cls, resolve)
+                self._handle_ids[path] = handle
+            return handle
+
     def _route_request(self, request: Request) -> None:
         """Runs inline on the dispatch thread: resolve and route, never
         execute. Resolution is a dict lookup (framework code, microseconds);
         routing must not depend on the handler pool, or a wedged pool would
         starve the locked-method lanes it feeds."""
         try:
-            dst = parse_url(request.dst)
-
-            # FIXME: this should return a full url/path so we can send it back to the caller saying exactly who handled the request
-            resource, method = self.resolve_request(dst.path, request.method)
+            # lock-free read: entries are only ever added or removed whole
+            handle = (
+                self._handles.get(request.handle)
+                if request.handle is not None
+                else None
+            )
+            if handle is not None:
+                cls, resource = handle.cls, handle.path
+                method = handle.resolve(request.method)
+            else:
+                dst = parse_url(request.dst)
+                cls = dst.cls
+                # FIXME: this should return a full url/path so we can send it back to the caller saying exactly who handled the request
+                resource, method = self.resolve_request(dst.path, request.method)
 
             if not resource:
                 self._control_pool.submit(
-                    self._push, request.not_found(f"'{dst.cls}' not found")
+                    self._push, request.not_found(f"'{cls}' not found")
                 )
                 return
 
             if not method:
                 self._control_pool.submit(
                     self._push,
-                    request.not_found(f"'{dst.cls}.{request.method}' not found"),
+                    request.not_found(f"'{cls}.{request.method}' not found"),
                 )
                 return
 
+            queued_at = time.perf_counter()
             if _is_locked_method(method):
-                self._enqueue_lane(resource, request, method)
+                self._enqueue_lane(resource, request, method, queued_at)
             else:
-                self._handler_pool.submit(self._execute_request, request, method)
+                with self._queued_lock:
+                    self._queued[request.id] = (request, None)
+                self._handler_pool.submit(
+                    self._execute_request, request, method, resource, queued_at
+                )
         except Exception as e:
             log.exception("error routing request")
             self._control_pool.submit(self._push, request.error(e))
 
-    def _execute_request(self, request: Request, method: Callable[..., Any]) -> None:
+    def _execute_request(
+        self,
+        request: Request,
+        method: Callable[..., Any],
+        resource: str,
+        queued_at: float,
+    ) -> None:
+        deadline = None
+        if request.budget is not None:
+            # counted from arrival, in our own clock
+            waited = int((time.perf_counter() - queued_at) * 1e9)
+            deadline = time.monotonic_ns() - waited + request.budget
+        token = CancelToken(deadline)
+        with self._queued_lock:
+            queued = self._queued.pop(request.id, None)
+            if queued is None:
+                # cancelled while queued: the caller is gone, no reply
+                log.debug(f"bus: skipping cancelled {request.method} on {request.dst}")
+                return
+            lane = queued[1]
+            if lane is not None:
+                lane.pending -= 1
+            self._running_requests[request.id] = (request, token)
+
         try:
+            if deadline is not None and token.cancelled:
+                # too late to be of use: a slew or an exposure must not fire
+                # long after its caller gave up. Still answered: the
+                # link's delay is not counted, the caller may still wait
+                log.debug(f"bus: skipping expired {request.method} on {request.dst}")
+                self._push(
+                    request.expired(
+                        f"{request.method} on {request.dst}: deadline expired "
+                        "before it started"
+                    )
+                )
+                return
+
+            started = time.perf_counter()
+            error = None
+            span = _child_trace(request.trace)
             try:
-                result = method(*request.args, **request.kwargs)
+                # the method (and the calls it makes) see the token
+                with use_cancel_token(token):
+                    if span is None:
+                        result = method(*request.args, **request.kwargs)
+                    else:
+                        # calls the method makes, on any bus, join the trace
+                        with use_trace(span):
+                            result = method(*request.args, **request.kwargs)
             except Exception as e:
-                self._push(request.error(e))
-                return
+                error = e
+            finished = time.perf_counter()
+            # the call alone: the reply's encoding and send are not its cost
+            self.metrics.request(
+                resource,
+                request.method,
+                started - queued_at,
+                finished - started,
+                error is not None,
+            )
 
-            if self._push(request.ok(result)) is PushResult.ENCODE_FAILED:
+            if error is not None:
+                self._push(request.error(error))
+            elif self._push(request.ok(result)) is PushResult.ENCODE_FAILED:
                 # the payload is the problem: answer with an all-string error
                 # (always encodable) instead of leaving the caller blocked on
                 # a reply that will never arrive
@@ -1044,30 +2578,68 @@ class Bus:
                         )
                     )
                 )
+
+            if span is not None:
+                self._record_request(
+                    request, method, resource, span, queued_at, started, finished
+                )
         except Exception:
             log.exception("error executing request")
+        finally:
+            with self._queued_lock:
+                del self._running_requests[request.id]
+
+    def _record_request(
+        self,
+        request: Request,
+        method: Callable[..., Any],
+        resource: str,
+        span: Trace,
+        queued_at: float,
+        started: float,
+        finished: float,
+    ) -> None:
+        # this bus's side of a traced request, phase by phase
+        assert request.trace is not None
+        parent = request.trace.span
+        replied = time.perf_counter()
+        waited = "lane wait" if _is_locked_method(method) else "queue"
+        self.tracer.record(waited, "queue", queued_at, started, span, parent)
+        self.tracer.record(
+            f"{resource}.{request.method}",
+            "execute",
+            started,
+            finished,
+            span,
+            parent,
+            {"src": request.src},
+        )
+        self.tracer.record("reply", "reply", finished, replied, span, parent)
 
     def _enqueue_lane(
-        self, resource: str, request: Request, method: Callable[..., Any]
+        self,
+        resource: str,
+        request: Request,
+        method: Callable[..., Any],
+        queued_at: float,
     ) -> None:
         with self._lanes_lock:
             lane = self._lanes.get(resource)
             if lane is None or lane.closed:
-                lane = _ObjectLane(self._lane_queue_size)
-                lane.thread = threading.Thread(
-                    target=self._lane_worker,
-                    args=(resource, lane),
-                    name=f"chimera-bus-lane-{self.url.port}{resource}",
-                    daemon=True,
-                )
+                # just a mailbox: cheap to make, nothing to start
+                lane = _ObjectLane()
                 self._lanes[resource] = lane
-                lane.thread.start()
 
-            try:
-                lane.queue.put_nowait((request, method))
+            with self._queued_lock:
+                accepted = lane.pending < self._lane_queue_size
+                if accepted:
+                    lane.pending += 1
+                    self._queued[request.id] = (request, lane)
+            if accepted:
+                with lane.lock:
+                    lane.queue.append((request, method, queued_at))
+                    self._schedule_lane(lane, resource)
                 return
-            except queue.Full:
-                pass
 
         # outside the lock: the object is drowning, tell the caller now
         # instead of piling stale commands behind a stuck instrument
@@ -1080,27 +2652,50 @@ class Bus:
             request.busy(f"{resource} busy: {self._lane_queue_size} requests pending"),
         )
 
-    def _lane_worker(self, resource: str, lane: _ObjectLane) -> None:
-        while True:
-            try:
-                item = lane.queue.get(timeout=self._lane_idle_timeout)
-            except queue.Empty:
-                # idle: evict the lane. Re-check under the lock — enqueue
-                # holds it while putting, so nothing can slip in unseen
-                with self._lanes_lock:
-                    if not lane.queue.empty():
-                        continue
-                    lane.closed = True
-                    if self._lanes.get(resource) is lane:
-                        del self._lanes[resource]
+    def _schedule_lane(self, lane: _ObjectLane, resource: str) -> None:
+        """Start what the lane's head allows on the lane pool: the reads at
+        the front, side by side (up to lane_readers), or one exclusive
+        method once nothing else runs. Called under lane.lock whenever the
+        lane gets a request or finishes one."""
+        while lane.queue and not lane.running and not lane.closed:
+            request, method, queued_at = lane.queue[0]
+            shared = _is_shared_method(method)
+            if shared and lane.readers >= self._lane_readers:
                 return
-
-            if item is None:
-                # shutdown sentinel
+            if not shared and lane.readers:
+                return
+            try:
+                self._lane_pool.submit(
+                    self._run_lane, lane, resource, request, method, queued_at, shared
+                )
+            except RuntimeError:
+                # the bus is shutting down
                 return
+            lane.queue.popleft()
+            if shared:
+                lane.readers += 1
+            else:
+                lane.running = True
 
-            request, method = item
-            self._execute_request(request, method)
+    def _run_lane(
+        self,
+        lane: _ObjectLane,
+        resource: str,
+        request: Request,
+        method: Callable[..., Any],
+        queued_at: float,
+        shared: bool,
+    ) -> None:
+        try:
+            self._execute_request(request, method, resource, queued_at)
+        finally:
+            with lane.lock:
+                if shared:
+                    lane.readers -= 1
+                else:
+                    lane.running = False
+                lane.last_active = time.monotonic()
+                self._schedule_lane(lane, resource)
 
     def callbacks(self, /, event_id: EventId) -> dict[Subscriber, Callback]:
         with self._pubsub_lock:
@@ -1112,34 +2707,201 @@ class Bus:
 
     def _handle_ping(self, message: Ping) -> None:
         try:
+            # negotiate before answering: the Pong already goes out in the
+            # codec both ends agree on
+            self._negotiate_codec(message.src_bus, message.codecs)
+
             # resolve the dst URL and return the resolved URL in the pong
             dst_url = parse_url(message.dst)
             cls, method = self.resolve_request(dst_url.path, "get_location")
             if cls is not None and method is not None:
                 resolved_url = method()
-                pong = message.pong(ok=True, resolved_url=resolved_url)
+                pong = message.pong(
+                    ok=True,
+                    resolved_url=resolved_url,
+                    handle=self._handle_for(dst_url.path),
+                    codecs=self._codecs_offer,
+                )
                 self._push(pong)
             else:
-                self._push(message.pong(ok=False))
+                self._push(message.pong(ok=False, codecs=self._codecs_offer))
         except Exception:
             log.exception("error handling ping")
             # still answer: a reachable bus must never look silently
             # partitioned just because resolution raised (health checks
             # count any pong as proof of life)
             try:
-                self._push(message.pong(ok=False))
+                self._push(message.pong(ok=False, codecs=self._codecs_offer))
             except Exception:
                 pass
 
     def _handle_subscribe(self, message: Subscribe):
         try:
+            if message.filter is not None:
+                # a filter we cannot evaluate: no subscription at all rather
+                # than one delivering what was not asked for
+                validate_filter(message.filter)
+
             with self._pubsub_lock:
                 event_id = EventId(message.pub, message.event)
                 subscriber = Subscriber(parse_url(message.sub), message.callback)
-                self._subscribers.setdefault(event_id, set()).add(subscriber)
+                subscribers = self._subscribers.setdefault(event_id, set())
+                if subscriber in subscribers:
+                    return
+                subscribers.add(subscriber)
+                fanout = self._fanout.setdefault(event_id, _FanOut())
+                fanout.add(subscriber.subscriber.bus)
+                if message.filter is not None:
+                    self._filters.setdefault(event_id, {})[subscriber] = _EventFilter(
+                        message.filter
+                    )
+                snapshot = event_id in self._retained
+                if snapshot:
+                    self._snapshots.setdefault(event_id, set()).add(subscriber)
+
+            if snapshot:
+                # off the dispatch thread: it may wait for a retained
+                # emission being sent (see _send_snapshot)
+                _ = self._control_pool.submit(self._send_snapshot, event_id, subscriber)
         except Exception:
             log.exception("error handling subscribe")
 
+    def _send_snapshot(self, event_id: EventId, subscriber: Subscriber) -> None:
+        try:
+            # under _retain_lock: a retained emission either went out before
+            # the snapshot is taken (and is the snapshot) or goes out after
+            # it is sent, never overtaking it
+            with self._retain_lock:
+                with self._pubsub_lock:
+                    pending = self._snapshots.get(event_id)
+                    # an emission since the subscription already delivered
+                    # a fresher value
+                    if pending is None or subscriber not in pending:
+                        return
+                    pending.discard(subscriber)
+                    if not pending:
+                        del self._snapshots[event_id]
+                    if subscriber not in self._subscribers.get(event_id, ()):
+                        return
+                    _, args, kwargs = self._retained[event_id]
+                    filter = self._filters.get(event_id, {}).get(subscriber)
+
+                if filter is not None and not filter.accept(args, kwargs):
+                    return
+
+                bus = subscriber.subscriber.bus
+                event = Event(
+                    ts=Protocol.timestamp(),
+                    src=event_id.publisher,
+                    dst=bus,
+                    event=event_id.event,
+                    args=args,
+                    kwargs=kwargs,
+                    callbacks=[subscriber.callback],
+                )
+                self._deliver_event(event, bus, {})
+        except Exception:
+            log.exception("error sending retained event")
+
+    def _drop_filter(self, event_id: EventId, subscriber: Subscriber) -> None:
+        # caller holds _pubsub_lock
+        filters = self._filters.get(event_id)
+        if filters is not None:
+            filters.pop(subscriber, None)
+            if not filters:
+                del self._filters[event_id]
+
+    def _drop_route(self, event_id: EventId, bus: str, count: int = 1) -> None:
+        # caller holds _pubsub_lock
+        fanout = self._fanout.get(event_id)
+        if fanout is not None:
+            fanout.remove(bus, count)
+            if not fanout.buses:
+                del self._fanout[event_id]
+
+    def _handle_cancel(self, message: Cancel) -> None:
+        with self._streams_lock:
+            stream = self._streams.get(message.id)
+            # only its consumer may abort a stream
+            if stream is not None and stream.consumer == message.src:
+                del self._streams[message.id]
+                log.debug(f"bus: stream {stream.src} aborted by {message.src}")
+                return
+
+        with self._queued_lock:
+            queued = self._queued.get(message.id)
+            running = self._running_requests.get(message.id)
+            # only the caller may cancel its request
+            if queued is not None and queued[0].src == message.src:
+                request, lane = self._queued.pop(message.id)
+                if lane is not None:
+                    # its slot is free now, though it stays in the queue
+                    lane.pending -= 1
+            elif running is not None and running[0].src == message.src:
+                request, token = running
+                token.cancel()
+                log.debug(f"bus: cancelling running {request.method} on {request.dst}")
+                return
+            else:
+                return
+        log.debug(f"bus: cancelled queued {request.method} on {request.dst}")
+
+    def _finish_stream(self, stream: _OutStream) -> None:
+        stream.done = True
+        with self._streams_lock:
+            self._streams.pop(stream.id, None)
+
+    def _handle_credit(self, message: Credit) -> None:
+        with self._streams_lock:
+            stream = self._streams.get(message.id)
+        if stream is None:
+            self._push(
+                Protocol.chunk(
+                    src=message.dst,
+                    dst=message.src,
+                    id=message.id,
+                    seq=0,
+                    data=b"",
+                    eof=True,
+                    error=f"no stream {message.dst} (expired or already pulled)",
+                )
+            )
+            return
+
+        try:
+            # chunks go out one push each: a ping or an abort to the same
+            # peer slips in between any two of them
+            with stream.lock:
+                if stream.consumer is None:
+                    stream.consumer = message.src
+                elif stream.consumer != message.src:
+                    log.warning(
+                        f"bus: {message.src} pulling {stream.src}, "
+                        f"bound to {stream.consumer}: ignored"
+                    )
+                    return
+
+                if stream.done:
+                    # a Credit that raced the one that finished the stream
+                    return
+                stream.credit += message.credit
+                stream.last_active = time.monotonic()
+                # the eof chunk ends the loop (and the stream)
+                while stream.credit > 0:
+                    chunk = stream.next_chunk()
+                    stream.credit -= 1
+                    if chunk.eof:
+                        # forgotten before the consumer can see the end
+                        self._finish_stream(stream)
+                    if not self._push(chunk):
+                        self._finish_stream(stream)
+                    if stream.done:
+                        return
+        except Exception:
+            log.exception(f"bus: error sending stream {stream.src}")
+            with self._streams_lock:
+                self._streams.pop(stream.id, None)
+
     def _handle_unsubscribe(self, message: Unsubscribe):
         try:
             with self._pubsub_lock:
@@ -1147,8 +2909,10 @@ class Bus:
                 subscriber = Subscriber(parse_url(message.sub), message.callback)
 
                 subscribers = self._subscribers.get(event_id)
-                if subscribers is not None:
+                if subscribers is not None and subscriber in subscribers:
                     subscribers.discard(subscriber)
+                    self._drop_route(event_id, subscriber.subscriber.bus)
+                    self._drop_filter(event_id, subscriber)
                     if not subscribers:
                         del self._subscribers[event_id]
         except Exception:
@@ -1158,38 +2922,131 @@ class Bus:
         try:
             event_id = EventId(message.pub, message.event)
 
-            # snapshot under the lock: subscribe/unsubscribe mutate the set
-            # concurrently and an unlocked iteration silently drops the event
-            with self._pubsub_lock:
-                subscribers = set(self._subscribers.get(event_id, ()))
+            retain = self._retain_lock if message.retain else contextlib.nullcontext()
+            with retain:
+                self._fan_out_publish(event_id, message)
+        except Exception:
+            log.exception("error handling publish")
 
-            # no subscribers for this event
-            if not subscribers:
-                return
+    def _fan_out_publish(self, event_id: EventId, message: Publish) -> None:
+        # the tuple is replaced, never mutated, by (un)subscribe: reading
+        # it under the lock is the whole snapshot
+        with self._pubsub_lock:
+            if message.retain:
+                # publishes run concurrently: an older emission handled last
+                # must not replace the newer value (ts is this host's clock)
+                last = self._retained.get(event_id)
+                if last is None or last[0] <= message.ts:
+                    self._retained[event_id] = (
+                        message.ts,
+                        message.args,
+                        message.kwargs,
+                    )
+                    # whoever waits for a snapshot gets this emission instead
+                    self._snapshots.pop(event_id, None)
+            fanout = self._fanout.get(event_id)
+            buses = fanout.buses if fanout is not None else ()
+            filters = self._filters.get(event_id)
+            if filters:
+                filters = dict(filters)
+                subscribers = tuple(self._subscribers.get(event_id, ()))
+
+        # no subscribers for this event
+        if not buses or self.is_dead():
+            self.metrics.published(message.pub, message.event, 0)
+            return
+
+        # only the subscriptions whose filter passes, by bus: a bus left
+        # with none gets nothing at all
+        targets: dict[str, list[int]] | None = None
+        if filters:
+            targets = {}
+            for subscriber in subscribers:
+                filter = filters.get(subscriber)
+                if filter is None or filter.accept(message.args, message.kwargs):
+                    targets.setdefault(subscriber.subscriber.bus, []).append(
+                        subscriber.callback
+                    )
+            buses = tuple(targets)
+        self.metrics.published(message.pub, message.event, len(buses))
+
+        # one Event for every bus, only dst differs; its payload is
+        # encoded once per codec in use and spliced into each envelope
+        event = message.callback(
+            dst="",
+            event=message.event,
+            args=message.args,
+            kwargs=message.kwargs,
+        )
+        payloads: dict[str, tuple[msgspec.Raw, msgspec.Raw]] = {}
+        for bus in buses:
+            if targets is not None:
+                bus_event = msgspec.structs.replace(event, callbacks=targets[bus])
+            else:
+                bus_event = event
+            self._deliver_event(bus_event, bus, payloads)
+
+    def _deliver_event(
+        self,
+        event: Event,
+        bus: str,
+        payloads: dict[str, tuple[msgspec.Raw, msgspec.Raw]],
+    ) -> None:
+        if bus == self.url.bus:
+            # local delivery needs no encoding at all
+            self._push(msgspec.structs.replace(event, dst=bus))
+            return
+
+        frame = self._encode_event(event, bus, payloads)
+        if frame is not None:
+            self._send(bus, frame, event)
 
-            # unique set of buses where we have subscribers
-            urls = set([sub.subscriber.bus for sub in subscribers])
+    def _encode_event(
+        self,
+        event: Event,
+        bus: str,
+        payloads: dict[str, tuple[msgspec.Raw, msgspec.Raw]],
+    ) -> bytes | None:
+        with self._peers_lock:
+            codec = self._peer_codecs.get(bus, self._json)
 
-            for url in urls:
-                event = message.callback(
-                    dst=url,
-                    event=message.event,
-                    args=message.args,
-                    kwargs=message.kwargs,
+        for codec in dict.fromkeys([codec, self._json]):
+            try:
+                t0 = time.perf_counter()
+                payload = payloads.get(codec.name)
+                if payload is None:
+                    payload = payloads[codec.name] = (
+                        msgspec.Raw(codec.encode(event.args)),
+                        msgspec.Raw(codec.encode(event.kwargs)),
+                    )
+                data = codec.encode(
+                    msgspec.structs.replace(
+                        event, dst=bus, args=payload[0], kwargs=payload[1]
+                    )
                 )
-                self._push(event)
-        except Exception:
-            log.exception("error handling publish")
+                self.metrics.encoded(time.perf_counter() - t0)
+                return data
+            except Exception:
+                # the binary codec is stricter on a few payloads (see
+                # _encode): json still reaches the peer
+                continue
+
+        log.error(f"bus: failed to encode event: {event}")
+        return None
 
     def _handle_event(self, event: Event) -> None:
         try:
             event_id = EventId(event.src, event.event)
 
+            # the publisher's filters picked these subscriptions
+            tokens = set(event.callbacks) if event.callbacks is not None else None
+
             # snapshot under the lock (see _handle_publish)
             with self._pubsub_lock:
                 callables = [
                     callback.callable
                     for callback in self._callbacks.get(event_id, {}).values()
+                    if tokens is None or callback.id in tokens
                 ]
 
             for callable in callables:
@@ -0,0 +1,83 @@
+import contextlib
+import contextvars
+import threading
+import time
+from collections.abc import Iterator
+
+from chimera.core.exceptions import RequestCancelledException
+
+__all__ = ["CancelToken", "cancel_token", "current_deadline", "use_cancel_token"]
+
+
+class CancelToken:
+    """The cancellation state of a running request: cancelled when its
+    caller gives up (a Cancel, sent on timeout or Future.cancel()) or its
+    deadline passes. Nothing stops a running method: long ones poll
+    `cancelled` between steps, or sleep in wait(), and bail out."""
+
+    __slots__ = ("deadline", "_event")
+
+    def __init__(self, deadline: int | None = None):
+        # absolute, time.monotonic_ns(); None: no deadline
+        self.deadline = deadline
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set() or (
+            self.deadline is not None and time.monotonic_ns() >= self.deadline
+        )
+
+    def remaining(self) -> float | None:
+        """Seconds left to the deadline (0 once past), None if there is none."""
+        if self.deadline is None:
+            return None
+        return max(0.0, (self.deadline - time.monotonic_ns()) / 1e9)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Sleep up to `timeout` seconds, waking early on cancellation.
+        Returns whether the request is cancelled."""
+        remaining = self.remaining()
+        if remaining is not None and (timeout is None or remaining < timeout):
+            timeout = remaining
+        self._event.wait(timeout)
+        return self.cancelled
+
+    def check(self) -> None:
+        """Raise RequestCancelledException if cancelled."""
+        if self.cancelled:
+            raise RequestCancelledException(
+                "request cancelled"
+                if self._event.is_set()
+                else "request deadline expired"
+            )
+
+
+# the token of the request the code running here executes, set by the bus
+_current: contextvars.ContextVar[CancelToken | None] = contextvars.ContextVar(
+    "chimera_cancel_token", default=None
+)
+
+
+def cancel_token() -> CancelToken:
+    """The running request's token; outside a request, one never cancelled."""
+    token = _current.get()
+    return token if token is not None else CancelToken()
+
+
+def current_deadline() -> int | None:
+    """The running request's deadline: calls made from it inherit it."""
+    token = _current.get()
+    return token.deadline if token is not None else None
+
+
+@contextlib.contextmanager
+def use_cancel_token(token: CancelToken) -> Iterator[None]:
+    reset = _current.set(token)
+    try:
+        yield
+    finally:
+        _current.reset(reset)
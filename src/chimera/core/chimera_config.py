@@ -13,7 +13,7 @@ from chimera.core.constants import (
     MANAGER_DEFAULT_HOST,
     MANAGER_DEFAULT_PORT,
 )
-from chimera.core.url import URL, parse_url
+from chimera.core.url import URL, create_url, parse_url
 
 log = logging.getLogger(__name__)
 
@@ -127,6 +127,10 @@ class ChimeraConfig:
 
         self.host = MANAGER_DEFAULT_HOST
         self.port = MANAGER_DEFAULT_PORT
+        # buses to connect to at startup, as tcp://host:port
+        self.peers: list[str] = []
+        # local port serving bus metrics to Prometheus, off if None
+        self.metrics_port: int | None = None
 
         self._parse(text, decoder)
 
@@ -139,6 +143,13 @@ class ChimeraConfig:
 
         self.host = chimera_config.get("host", MANAGER_DEFAULT_HOST)
         self.port = chimera_config.get("port", MANAGER_DEFAULT_PORT)
+        # either host:port or tcp://host:port
+        self.peers = [
+            create_url(str(peer), cls="Manager", name=0).bus
+            for peer in chimera_config.get("peers", [])
+        ]
+        metrics_port = chimera_config.get("metrics_port")
+        self.metrics_port = int(metrics_port) if metrics_port is not None else None
 
         site_config = config.pop("site", {})
         # FIXME: raise and let user fix it
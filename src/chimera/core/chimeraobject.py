@@ -6,15 +6,17 @@ import threading
 import time
 from typing import TYPE_CHECKING
 
-from chimera.core.bus import Bus
+from chimera.core.bus import Bus, EventId
 from chimera.core.config import Config
 from chimera.core.constants import (
     CONFIG_PROXY_NAME,
     EVENTS_ATTRIBUTE_NAME,
     INSTANCE_MONITOR_ATTRIBUTE_NAME,
+    METHOD_RWLOCK_ATTRIBUTE_NAME,
     METHODS_ATTRIBUTE_NAME,
     RWLOCK_ATTRIBUTE_NAME,
 )
+from chimera.core.event import event
 from chimera.core.exceptions import ObjectNotFoundException
 from chimera.core.metaobject import MetaObject
 from chimera.core.proxy import Proxy
@@ -30,17 +32,23 @@ __all__ = ["ChimeraObject"]
 
 
 class ChimeraObject(ILifeCycle, metaclass=MetaObject):
+    # events that change what get_metadata returns: each one publishes a
+    # new snapshot of it (see publish_metadata)
+    __metadata_events__: tuple[str, ...] = ()
+    # events other state follows: emitting one calls the named method, on
+    # the emitting thread, right after it is published
+    __derived_events__: dict[str, str] = {}
+
     def __init__(self):
         super().__init__()
 
         # per-instance locks: the monitor serializes @lock methods and the
         # rwlock guards config access. They must not live in the class dict —
         # two instances of the same driver would block each other
-        setattr(
-            self,
-            INSTANCE_MONITOR_ATTRIBUTE_NAME,
-            threading.Condition(threading.RLock()),
-        )
+        monitor = threading.Condition(threading.RLock())
+        setattr(self, INSTANCE_MONITOR_ATTRIBUTE_NAME, monitor)
+        # ... readers (@lock(shared=True)) and writers (@lock) of its methods
+        setattr(self, METHOD_RWLOCK_ATTRIBUTE_NAME, ReadWriteLock())
         setattr(self, RWLOCK_ATTRIBUTE_NAME, ReadWriteLock())
 
         # configuration handling
@@ -67,6 +75,12 @@ class ChimeraObject(ILifeCycle, metaclass=MetaObject):
 
         # To override metadata default values
         self.__metadata_override_method__ = None
+        self.__metadata_version__ = 0
+        self.__metadata_lock__ = threading.Lock()
+        # a snapshot waits to be taken: later requests fold into it
+        self.__metadata_scheduled__ = False
+        # the bus retains a snapshot of ours
+        self.__metadata_retained__ = False
 
     # config implementation
     def __getitem__(self, item):
@@ -219,6 +233,50 @@ class ChimeraObject(ILifeCycle, metaclass=MetaObject):
             )
         return None
 
+    @event(retain=True)
+    def metadata_changed(self, version: int, timestamp: float, metadata: list):
+        """A new snapshot of get_metadata(), stamped with time.time() and a
+        version counting up from 1. Retained: cameras keep the last one and
+        build FITS headers from it without asking (see
+        chimera.core.metadata.MetadataSnapshots)."""
+
+    def publish_metadata(self) -> None:
+        """Publish a snapshot of get_metadata(); done after each of the
+        __metadata_events__, drivers call it on other changes too. Returns
+        at once: the snapshot is taken on the bus handler pool, and calls
+        made while one waits there fold into it. Nothing is taken while
+        nobody watches metadata_changed."""
+        event_id = EventId(self.get_location(), "metadata_changed")
+        if not self.__bus__.subscribers(event_id):
+            # a snapshot retained from before would be replayed stale
+            if self.__metadata_retained__:
+                self.__metadata_retained__ = False
+                self.__bus__.forget_retained(
+                    self.__location__.path, event="metadata_changed"
+                )
+            return
+
+        with self.__metadata_lock__:
+            if self.__metadata_scheduled__:
+                return
+            self.__metadata_scheduled__ = True
+        self.__bus__.submit(self._publish_metadata)
+
+    def _publish_metadata(self) -> None:
+        with self.__metadata_lock__:
+            # changes from here on need a snapshot of their own
+            self.__metadata_scheduled__ = False
+        try:
+            metadata = self.get_metadata(None)
+        except Exception:
+            self.log.debug("cannot take a metadata snapshot", exc_info=True)
+            return
+        with self.__metadata_lock__:
+            self.__metadata_version__ += 1
+            version = self.__metadata_version__
+        self.__metadata_retained__ = True
+        self.metadata_changed(version, time.time(), metadata)
+
     def features(self, interface: str):
         """
         Checks if self is an instance of an interface.
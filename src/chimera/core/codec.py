@@ -0,0 +1,77 @@
+from typing import Any
+
+import msgspec
+
+from chimera.core.protocol import Messages
+
+__all__ = ["Codec", "JsonCodec", "MsgpackCodec", "create_codec", "decode_message"]
+
+
+class Codec:
+    """Turns bus messages into wire frames and back. Frames carry no codec
+    header: every msgspec JSON message is an object and starts with '{',
+    which no msgpack map does, so the receiver tells them apart by the
+    first byte (see decode_message)."""
+
+    name: str
+
+    def encode(self, message: Any) -> bytes: ...
+
+    def decode(self, data: bytes) -> Messages: ...
+
+
+class JsonCodec(Codec):
+    name = "json"
+
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder(Messages)
+
+    def encode(self, message: Any) -> bytes:
+        return self._encoder.encode(message)
+
+    def decode(self, data: bytes) -> Messages:
+        return self._decoder.decode(data)
+
+
+class MsgpackCodec(Codec):
+    name = "msgpack"
+
+    def __init__(self):
+        self._encoder = msgspec.msgpack.Encoder()
+        self._decoder = msgspec.msgpack.Decoder(Messages)
+
+    def encode(self, message: Any) -> bytes:
+        return self._encoder.encode(message)
+
+    def decode(self, data: bytes) -> Messages:
+        return self._decoder.decode(data)
+
+
+# the codec every bus speaks: peers that never negotiated get json
+DEFAULT_CODEC = "json"
+
+_CODECS: dict[str, type[Codec]] = {
+    JsonCodec.name: JsonCodec,
+    MsgpackCodec.name: MsgpackCodec,
+}
+
+
+def create_codec(name: str) -> Codec:
+    try:
+        return _CODECS[name]()
+    except KeyError:
+        raise ValueError(
+            f"unknown codec '{name}', expected one of: {', '.join(_CODECS)}"
+        ) from None
+
+
+_json = JsonCodec()
+_msgpack = MsgpackCodec()
+
+
+def decode_message(data: bytes) -> Messages:
+    """Decode a frame in whichever codec the sender chose."""
+    if data[:1] == b"{":
+        return _json.decode(data)
+    return _msgpack.decode(data)
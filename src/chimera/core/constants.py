@@ -12,7 +12,9 @@ MANAGER_LOCATION = "/Manager/manager"
 
 # annotations
 EVENT_ATTRIBUTE_NAME = "__event__"
+EVENT_RETAIN_ATTRIBUTE_NAME = "__event_retain__"
 LOCK_ATTRIBUTE_NAME = "__lock__"
+LOCK_SHARED_ATTRIBUTE_NAME = "__lock_shared__"
 
 # special propxies
 EVENTS_PROXY_NAME = "__events_proxy__"
@@ -20,8 +22,12 @@ CONFIG_PROXY_NAME = "__config_proxy__"
 
 # monitor objects
 INSTANCE_MONITOR_ATTRIBUTE_NAME = "__instance_monitor__"
+METHOD_RWLOCK_ATTRIBUTE_NAME = "__method_rwlock__"
 RWLOCK_ATTRIBUTE_NAME = "__rwlock__"
 
+# bound method dispatchers, cached per instance
+DISPATCHERS_ATTRIBUTE_NAME = "__dispatchers__"
+
 # reflection
 CONFIG_ATTRIBUTE_NAME = "__config__"
 EVENTS_ATTRIBUTE_NAME = "__events__"
@@ -5,15 +5,25 @@
 from collections.abc import Callable
 from typing import Any
 
-from chimera.core.constants import EVENT_ATTRIBUTE_NAME
+from chimera.core.constants import EVENT_ATTRIBUTE_NAME, EVENT_RETAIN_ATTRIBUTE_NAME
 
 __all__ = ["event"]
 
 
-def event(method: Callable[..., Any]):
+def event(method: Callable[..., Any] | None = None, /, *, retain: bool = False):
     """
     Event annotation.
+
+    @event(retain=True) makes the publisher's bus keep the last emission
+    and deliver it to every new subscriber right after it subscribes.
     """
 
-    setattr(method, EVENT_ATTRIBUTE_NAME, True)
-    return method
+    def annotate(method: Callable[..., Any]):
+        setattr(method, EVENT_ATTRIBUTE_NAME, True)
+        if retain:
+            setattr(method, EVENT_RETAIN_ATTRIBUTE_NAME, True)
+        return method
+
+    if method is None:
+        return annotate
+    return annotate(method)
@@ -72,6 +72,11 @@ class RequestTimeoutException(ChimeraException):
     """A bus request got no response within its timeout."""
 
 
+class RequestCancelledException(ChimeraException):
+    """The request was cancelled by its caller or ran past its deadline
+    (see chimera.core.cancel)."""
+
+
 class BusDeadException(ChimeraException):
     """The bus (or the peer the request was destined to) is gone: the
     request definitively cannot be delivered or answered."""
@@ -82,6 +87,11 @@ class ObjectBusyException(ChimeraException):
     it can and new requests are rejected instead of piling up."""
 
 
+class StreamException(ChimeraException):
+    """A streamed transfer failed: the producer no longer has the stream
+    (expired or never offered) or a chunk was lost on the way."""
+
+
 class NotValidChimeraObjectException(ChimeraException):
     pass
 
@@ -5,15 +5,29 @@
 from collections.abc import Callable
 from typing import Any
 
-from chimera.core.constants import LOCK_ATTRIBUTE_NAME
+from chimera.core.constants import LOCK_ATTRIBUTE_NAME, LOCK_SHARED_ATTRIBUTE_NAME
 
 __all__ = ["lock"]
 
 
-def lock(method: Callable[..., Any]):
+def lock(method: Callable[..., Any] | None = None, /, *, shared: bool = False):
     """
     Lock annotation.
+
+    @lock(shared=True) marks a read: shared methods of an object run
+    concurrently with each other, never alongside its exclusive (@lock)
+    methods. So a shared getter still waits for a running exclusive method
+    to finish: a status read queues behind a whole expose or slew. Shared
+    methods may call exclusive ones; keep them to local state all the same,
+    a remote call made from one holds the writers back while it waits.
     """
 
-    setattr(method, LOCK_ATTRIBUTE_NAME, True)
-    return method
+    def annotate(method: Callable[..., Any]):
+        setattr(method, LOCK_ATTRIBUTE_NAME, True)
+        if shared:
+            setattr(method, LOCK_SHARED_ATTRIBUTE_NAME, True)
+        return method
+
+    if method is None:
+        return annotate
+    return annotate(method)
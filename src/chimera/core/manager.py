@@ -74,10 +74,20 @@ class Manager:
 
         self._bus = bus
         self._bus.resolve_request = self._resolve_request
+        self._bus.resolve_object = self._resolve_object
 
         self.site = site
 
         self.resources = ResourcesManager()
+
+        # (requested path, method) -> (resource path, bound callable): a hit
+        # allocates nothing, while a miss builds an attrgetter and a fresh
+        # method dispatcher. remove() clears it all, index paths included
+        # ('/Camera/1' may name another object then); the generation keeps
+        # a resolution racing a remove() from storing what it found
+        self._resolved: dict[tuple[str, str], tuple[str, Callable[..., Any]]] = {}
+        self._resolved_generation = 0
+        self._resolved_lock = threading.Lock()
         self.class_loader = ClassLoader()
         self._pool = concurrent.futures.ThreadPoolExecutor(
             thread_name_prefix=f"{self._bus.url.bus}/Manager-"
@@ -97,18 +107,59 @@ class Manager:
     def _resolve_request(
         self, object: str, method: str
     ) -> tuple[str | None, Callable[..., Any] | None]:
+        resolved = self._resolved.get((object, method))
+        if resolved is not None:
+            return resolved
+
+        generation = self._resolved_generation
+        resource = self.resources.get(object)
+        if not resource:
+            return None, None
+
+        callable = self._resolve_method(resource.instance, method)
+        if callable is not None:
+            self._cache_resolved(generation, (object, method), resource.path, callable)
+        return resource.path, callable
+
+    def _resolve_object(
+        self, object: str
+    ) -> tuple[str | None, Callable[[str], Callable[..., Any] | None] | None]:
         resource = self.resources.get(object)
         if not resource:
             return None, None
 
-        instance = resource.instance
-        method_getter = operator.attrgetter(method)
+        path, instance = resource.path, resource.instance
+
+        def resolve(method: str) -> Callable[..., Any] | None:
+            resolved = self._resolved.get((path, method))
+            if resolved is not None:
+                return resolved[1]
 
+            generation = self._resolved_generation
+            callable = self._resolve_method(instance, method)
+            if callable is not None:
+                self._cache_resolved(generation, (path, method), path, callable)
+            return callable
+
+        return path, resolve
+
+    @staticmethod
+    def _resolve_method(instance: Any, method: str) -> Callable[..., Any] | None:
         try:
-            callable = method_getter(instance)
-            return resource.path, callable
+            return operator.attrgetter(method)(instance)
         except AttributeError:
-            return resource.path, None
+            return None
+
+    def _cache_resolved(
+        self,
+        generation: int,
+        key: tuple[str, str],
+        path: str,
+        callable: Callable[..., Any],
+    ) -> None:
+        with self._resolved_lock:
+            if generation == self._resolved_generation:
+                self._resolved[key] = (path, callable)
 
     def _resolve_location(self, location: str | URL) -> URL:
         """Resolve a possibly-relative location ('/Simple/simple') against
@@ -208,6 +259,14 @@ class Manager:
             "objects": objects,
         }
 
+    def get_trace(self, clear: bool = False) -> dict[str, Any]:
+        """The spans this bus recorded for traced requests, as Chrome-trace
+        JSON (chimera-ctl trace). `clear` empties the buffer after."""
+        trace = self._bus.tracer.dump()
+        if clear:
+            self._bus.tracer.clear()
+        return trace
+
     # reflection (console)
     def get_resources(self) -> list[str]:
         """
@@ -462,7 +521,15 @@ class Manager:
         self.stop(location)
 
         # self.adapter.disconnect(resource.instance)
+        resource = self.resources.get(location)
         self.resources.remove(location)
+        with self._resolved_lock:
+            self._resolved_generation += 1
+            self._resolved.clear()
+        if resource is not None:
+            # proxies holding its handle resolve by path from now on
+            self._bus.invalidate_handle(resource.path)
+            self._bus.forget_retained(resource.path)
 
         return True
 
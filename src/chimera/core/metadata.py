@@ -0,0 +1,65 @@
+import functools
+import logging
+import threading
+import time
+from typing import Any
+
+from chimera.core.proxy import Proxy
+
+__all__ = ["MetadataSnapshots"]
+
+log = logging.getLogger(__name__)
+
+
+class MetadataSnapshots:
+    """The last metadata snapshot (ChimeraObject.metadata_changed) of each
+    instrument a camera takes FITS headers from, kept current by
+    subscription: headers built from it cost no round trips. The event is
+    retained, so watching an instrument delivers its last snapshot at once."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # location -> (publisher's timestamp, version, arrival, metadata):
+        # the publisher's clock only orders its own snapshots, their age is
+        # counted on ours (time.monotonic() on arrival), hosts may disagree
+        self._snapshots: dict[str, tuple[float, int, float, list[Any]]] = {}
+        self._watched: set[str] = set()
+
+    def watch(self, location: str, proxy: Proxy) -> None:
+        """Subscribe to the snapshots of the object at `location`, once."""
+        with self._lock:
+            if location in self._watched:
+                return
+            self._watched.add(location)
+
+        try:
+            proxy.metadata_changed += functools.partial(self.update, location)
+        except Exception:
+            # not there (yet): try again on the next frame
+            log.debug(f"cannot watch metadata of {location}", exc_info=True)
+            with self._lock:
+                self._watched.discard(location)
+
+    def update(
+        self, location: str, version: int, timestamp: float, metadata: list[Any]
+    ) -> None:
+        with self._lock:
+            current = self._snapshots.get(location)
+            # delivered out of order: keep the newest
+            if current is not None and (current[0], current[1]) > (timestamp, version):
+                return
+            self._snapshots[location] = (
+                timestamp,
+                version,
+                time.monotonic(),
+                metadata,
+            )
+
+    def get(self, location: str, max_age: float) -> list[Any] | None:
+        """The last snapshot of `location`, if it arrived less than
+        `max_age` seconds ago."""
+        with self._lock:
+            snapshot = self._snapshots.get(location)
+        if snapshot is None or time.monotonic() - snapshot[2] > max_age:
+            return None
+        return list(snapshot[3])
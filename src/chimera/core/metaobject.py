@@ -2,13 +2,18 @@
 # SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
 import logging
 from collections.abc import Callable
+from types import MethodType
 
 from chimera.core.constants import (
     CONFIG_ATTRIBUTE_NAME,
+    DISPATCHERS_ATTRIBUTE_NAME,
     EVENT_ATTRIBUTE_NAME,
+    EVENT_RETAIN_ATTRIBUTE_NAME,
     EVENTS_ATTRIBUTE_NAME,
     INSTANCE_MONITOR_ATTRIBUTE_NAME,
     LOCK_ATTRIBUTE_NAME,
+    LOCK_SHARED_ATTRIBUTE_NAME,
+    METHOD_RWLOCK_ATTRIBUTE_NAME,
     METHODS_ATTRIBUTE_NAME,
 )
 
@@ -24,10 +29,6 @@ class MethodWrapper:
         # our wrapped function
         self.func = func
 
-        # will be bounded by the descriptor get
-        self.cls = None
-        self.instance = None
-
         self.dispatcher = dispatcher or MethodWrapperDispatcher
 
         # like a real duck!
@@ -36,10 +37,30 @@ class MethodWrapper:
     # MOST important here: descriptor to bind our dispatcher to an instance
     # and a class
     def __get__(self, instance: object, cls: type | None = None):
-        # bind ourselves to pass to our specials
-        self.cls = cls
-        self.instance = instance
+        if instance is None:
+            return self.dispatcher(self, instance, cls)
 
+        # bound once per (instance, method) and kept in the instance: every
+        # access used to build a fresh dispatcher. A copied instance shares
+        # the dict, not the binding, hence the owner check
+        try:
+            bound = instance.__dict__[DISPATCHERS_ATTRIBUTE_NAME]
+        except KeyError:
+            bound = instance.__dict__.setdefault(DISPATCHERS_ATTRIBUTE_NAME, {})
+        except AttributeError:
+            # no instance dict (__slots__): nowhere to keep it
+            return self._bind(instance, cls)
+
+        entry = bound.get(self)
+        if entry is None or entry[0] is not instance:
+            entry = bound[self] = (instance, self._bind(instance, cls))
+        return entry[1]
+
+    def _bind(self, instance: object, cls: type | None):
+        if self.dispatcher is MethodWrapperDispatcher:
+            # nothing to add to a plain method: a native bound method calls
+            # straight into it and compares equal the same way
+            return MethodType(self.func, instance)
         return self.dispatcher(self, instance, cls)
 
 
@@ -50,13 +71,17 @@ class MethodWrapperDispatcher:
         self.instance = instance
         self.cls = cls
 
-        # go duck, go!
-        self.bound_name = f"<bound method {self.cls.__name__}.{self.func.__name__}.begin of {repr(self.instance)}>"
+    # go duck, go! (built on demand: repr of the instance is not cheap)
+    @property
+    def bound_name(self) -> str:
+        return f"<bound method {self.cls.__name__}.{self.func.__name__}.begin of {repr(self.instance)}>"
 
-        self.unbound_name = f"<unbound method {self.cls.__name__}.{self.func.__name__}>"
+    @property
+    def unbound_name(self) -> str:
+        return f"<unbound method {self.cls.__name__}.{self.func.__name__}>"
 
     def __repr__(self):
-        if self.instance:
+        if self.instance is not None:
             return self.bound_name
         else:
             return self.unbound_name
@@ -74,7 +99,7 @@ class MethodWrapperDispatcher:
 
     def __call__(self, *args, **kwargs):
         # handle unbound cases (with or without instance as first argument)
-        if not self.instance:
+        if self.instance is None:
             if not args:
                 args = [None, None]
 
@@ -105,7 +130,14 @@ class EventWrapperDispatcher(MethodWrapperDispatcher):
             event=self.wrapper.func.__name__,
             args=args[1:],
             kwargs=kwargs,
+            retain=hasattr(self.wrapper.func, EVENT_RETAIN_ATTRIBUTE_NAME),
         )
+        # its state changed: so did its FITS headers
+        if self.func.__name__ in getattr(self.instance, "__metadata_events__", ()):
+            self.instance.publish_metadata()
+        derived = getattr(self.instance, "__derived_events__", {})
+        if self.func.__name__ in derived:
+            getattr(self.instance, derived[self.func.__name__])()
 
     def __iadd__(self, other):
         # the object subscribing to its own event: it is both ends
@@ -130,6 +162,7 @@ class EventWrapperDispatcher(MethodWrapperDispatcher):
 class LockWrapperDispatcher(MethodWrapperDispatcher):
     def __init__(self, wrapper, instance, cls):
         MethodWrapperDispatcher.__init__(self, wrapper, instance, cls)
+        self.shared = hasattr(self.func, LOCK_SHARED_ATTRIBUTE_NAME)
 
     def call(self, *args, **kwargs):
         """
@@ -137,19 +170,35 @@ class LockWrapperDispatcher(MethodWrapperDispatcher):
         already serializes bus-routed @lock calls per object (FIFO lane),
         but direct in-process calls bypass the bus — the monitor is what
         keeps those mutually exclusive too. The RLock makes nested @lock
-        calls on the same thread reentrant.
+        calls on the same thread reentrant. In front of it, the method
+        rwlock lets shared (@lock(shared=True)) methods run together, while
+        no exclusive one does, and upgrades a shared method calling an
+        exclusive one.
         """
 
-        lock = getattr(self.instance, INSTANCE_MONITOR_ATTRIBUTE_NAME)
+        rwlock = getattr(self.instance, METHOD_RWLOCK_ATTRIBUTE_NAME)
+
+        if self.shared:
+            rwlock.acquire_read()
+            try:
+                return self.func(*args, **kwargs)
+            finally:
+                rwlock.release()
+
+        # rwlock first: an upgrading reader must never wait for the monitor
+        # held by a writer that waits for it to leave
+        monitor = getattr(self.instance, INSTANCE_MONITOR_ATTRIBUTE_NAME)
 
-        lock.acquire()
+        rwlock.acquire_write()
+        monitor.acquire()
 
         ret = None
 
         try:
             ret = self.func(*args, **kwargs)
         finally:
-            lock.release()
+            monitor.release()
+            rwlock.release()
 
         return ret
 
@@ -0,0 +1,311 @@
+import bisect
+import collections
+import logging
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+__all__ = [
+    "BUCKETS",
+    "OTHER_PEERS",
+    "Histogram",
+    "Metrics",
+    "MetricsServer",
+    "quantile",
+    "render_prometheus",
+]
+
+log = logging.getLogger(__name__)
+
+# where the byte counts of forgotten peers go: short-lived CLI buses, each
+# on its own random port, would otherwise grow the per-peer series forever
+OTHER_PEERS = "other"
+
+# histogram bucket upper bounds, in seconds: 10 μs to 100 s, 1-2.5-5 per
+# decade. Everything slower lands in an implicit +Inf bucket
+BUCKETS: tuple[float, ...] = tuple(
+    round(m * 10.0**e, 6) for e in range(-5, 2) for m in (1, 2.5, 5)
+) + (100.0,)
+
+
+class Histogram:
+    """Counts of observations per BUCKETS bucket, plus their sum. Not
+    thread-safe on its own: Metrics updates it under its lock."""
+
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"count": self.count, "sum": self.sum, "counts": list(self.counts)}
+
+
+def quantile(histogram: dict[str, Any], q: float) -> float | None:
+    """The upper bound of the bucket holding the q-quantile of a
+    Histogram.snapshot(), None if empty. Past the last bound: inf."""
+    count = histogram["count"]
+    if not count:
+        return None
+    rank = q * count
+    seen = 0
+    for index, n in enumerate(histogram["counts"]):
+        seen += n
+        if seen >= rank and n:
+            return BUCKETS[index] if index < len(BUCKETS) else float("inf")
+    return float("inf")
+
+
+class _RequestMetrics:
+    __slots__ = ("queue", "run", "errors")
+
+    def __init__(self):
+        # from routing to a handler picking it up, and the call itself
+        self.queue = Histogram()
+        self.run = Histogram()
+        self.errors = 0
+
+
+class _EventMetrics:
+    __slots__ = ("published", "deliveries")
+
+    def __init__(self):
+        self.published = 0
+        # Events sent, one per subscriber bus the emission went to
+        self.deliveries = 0
+
+
+class Metrics:
+    """Always-on counters and latency histograms of a Bus: requests per
+    (object, method), messages by type, codec time, bytes per peer and event
+    fan-out. Every update is a few increments under one lock."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+        self._requests: dict[tuple[str, str], _RequestMetrics] = {}
+        self._received: collections.Counter[str] = collections.Counter()
+        self._sent: collections.Counter[str] = collections.Counter()
+        self._bytes_in: collections.Counter[str] = collections.Counter()
+        self._bytes_out: collections.Counter[str] = collections.Counter()
+        self._encode = Histogram()
+        self._decode = Histogram()
+        self._events: dict[tuple[str, str], _EventMetrics] = {}
+
+    def request(
+        self, object: str, method: str, queued: float, run: float, failed: bool
+    ) -> None:
+        key = (object, method)
+        with self._lock:
+            metrics = self._requests.get(key)
+            if metrics is None:
+                metrics = self._requests[key] = _RequestMetrics()
+            metrics.queue.observe(queued)
+            metrics.run.observe(run)
+            if failed:
+                metrics.errors += 1
+
+    def received(self, kind: str, peer: str, size: int, decode: float) -> None:
+        with self._lock:
+            self._received[kind] += 1
+            self._bytes_in[peer] += size
+            self._decode.observe(decode)
+
+    def encoded(self, seconds: float) -> None:
+        with self._lock:
+            self._encode.observe(seconds)
+
+    def sent(self, kind: str, peer: str | None = None, size: int = 0) -> None:
+        """A message handed on: to a peer's socket (peer and size given) or
+        to this bus itself."""
+        with self._lock:
+            self._sent[kind] += 1
+            if peer is not None:
+                self._bytes_out[peer] += size
+
+    def forget_peer(self, peer: str) -> None:
+        """Fold a gone peer's byte counts into OTHER_PEERS: totals never go
+        down, and the peer's own series ends."""
+        with self._lock:
+            for counter in (self._bytes_in, self._bytes_out):
+                size = counter.pop(peer, 0)
+                if size:
+                    counter[OTHER_PEERS] += size
+
+    def published(self, publisher: str, event: str, deliveries: int) -> None:
+        key = (publisher, event)
+        with self._lock:
+            metrics = self._events.get(key)
+            if metrics is None:
+                metrics = self._events[key] = _EventMetrics()
+            metrics.published += 1
+            metrics.deliveries += deliveries
+
+    def snapshot(self) -> dict[str, Any]:
+        """JSON-safe copy of every counter; histograms as
+        Histogram.snapshot(), bucketed by BUCKETS."""
+        with self._lock:
+            return {
+                "uptime": time.monotonic() - self._started,
+                "buckets": list(BUCKETS),
+                "requests": [
+                    {
+                        "object": object,
+                        "method": method,
+                        "errors": metrics.errors,
+                        "queue": metrics.queue.snapshot(),
+                        "run": metrics.run.snapshot(),
+                    }
+                    for (object, method), metrics in self._requests.items()
+                ],
+                "received": dict(self._received),
+                "sent": dict(self._sent),
+                "bytes_in": dict(self._bytes_in),
+                "bytes_out": dict(self._bytes_out),
+                "encode": self._encode.snapshot(),
+                "decode": self._decode.snapshot(),
+                "events": [
+                    {
+                        "publisher": publisher,
+                        "event": event,
+                        "published": metrics.published,
+                        "deliveries": metrics.deliveries,
+                    }
+                    for (publisher, event), metrics in self._events.items()
+                ],
+            }
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{key}="{_label(value)}"' for key, value in labels.items())
+
+
+def _histogram_lines(name: str, histogram: dict[str, Any], labels: str) -> list[str]:
+    sep = "," if labels else ""
+    lines = []
+    cumulative = 0
+    for bound, n in zip([*BUCKETS, "+Inf"], histogram["counts"], strict=True):
+        cumulative += n
+        lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+    braces = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{braces} {histogram['sum']}")
+    lines.append(f"{name}_count{braces} {histogram['count']}")
+    return lines
+
+
+def render_prometheus(snapshot: dict[str, Any], bus: str) -> str:
+    """A Metrics.snapshot() in the Prometheus text exposition format, every
+    series labelled with the bus it came from."""
+    lines: list[str] = []
+    base = _labels(bus=bus)
+
+    def header(name: str, kind: str, help: str) -> None:
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    header("chimera_bus_uptime_seconds", "gauge", "Seconds since the bus started.")
+    lines.append(f"chimera_bus_uptime_seconds{{{base}}} {snapshot['uptime']}")
+
+    for name, help in (
+        ("queue", "Time requests waited from routing to a handler."),
+        ("run", "Time spent executing requests."),
+    ):
+        metric = f"chimera_request_{name}_seconds"
+        header(metric, "histogram", help)
+        for entry in snapshot["requests"]:
+            labels = _labels(bus=bus, object=entry["object"], method=entry["method"])
+            lines.extend(_histogram_lines(metric, entry[name], labels))
+
+    header("chimera_request_errors_total", "counter", "Requests that raised.")
+    for entry in snapshot["requests"]:
+        labels = _labels(bus=bus, object=entry["object"], method=entry["method"])
+        lines.append(f"chimera_request_errors_total{{{labels}}} {entry['errors']}")
+
+    for direction in ("received", "sent"):
+        metric = f"chimera_messages_{direction}_total"
+        header(metric, "counter", f"Messages {direction}, by type.")
+        for kind, n in snapshot[direction].items():
+            lines.append(f"{metric}{{{_labels(bus=bus, type=kind)}}} {n}")
+
+    for direction, key in (("in", "bytes_in"), ("out", "bytes_out")):
+        metric = f"chimera_peer_bytes_{direction}_total"
+        header(metric, "counter", f"Wire bytes {direction}, by peer bus.")
+        for peer, n in snapshot[key].items():
+            lines.append(f"{metric}{{{_labels(bus=bus, peer=peer)}}} {n}")
+
+    for name in ("encode", "decode"):
+        metric = f"chimera_codec_{name}_seconds"
+        header(metric, "histogram", f"Time to {name} a wire frame.")
+        lines.extend(_histogram_lines(metric, snapshot[name], base))
+
+    for name, help in (
+        ("published", "Event emissions."),
+        ("deliveries", "Events sent to subscriber buses."),
+    ):
+        metric = f"chimera_event_{name}_total"
+        header(metric, "counter", help)
+        for entry in snapshot["events"]:
+            labels = _labels(
+                bus=bus, publisher=entry["publisher"], event=entry["event"]
+            )
+            lines.append(f"{metric}{{{labels}}} {entry[name]}")
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serves render() as Prometheus text on http://host:port/metrics, from
+    a daemon thread. Binds to localhost unless told otherwise: there is no
+    authentication."""
+
+    def __init__(self, render: Callable[[], str], port: int, host: str = "127.0.0.1"):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                try:
+                    body = render().encode()
+                except Exception:
+                    log.exception("metrics: error rendering")
+                    self.send_error(500)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                log.debug(f"metrics: {format % args}")
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name=f"chimera-metrics-{self.port}",
+            daemon=True,
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        if self._thread.is_alive():
+            self._server.shutdown()
+        self._server.server_close()
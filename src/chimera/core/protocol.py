@@ -12,7 +12,17 @@ from chimera.core.url import parse_url
 type Timestamp = int
 
 type Messages = (
-    Request | Response | Subscribe | Publish | Unsubscribe | Event | Ping | Pong
+    Request
+    | Response
+    | Cancel
+    | Subscribe
+    | Publish
+    | Unsubscribe
+    | Event
+    | Ping
+    | Pong
+    | Credit
+    | Chunk
 )
 
 
@@ -46,7 +56,18 @@ class RpcMessage(Message, frozen=True):
 class Ping(RpcMessage, frozen=True):
     id: int
 
-    def pong(self, *, ok: bool = True, resolved_url: str | None = None) -> "Pong":
+    # wire codecs the sender accepts, in preference order; None from buses
+    # that predate codec negotiation (they speak json only)
+    codecs: list[str] | None = None
+
+    def pong(
+        self,
+        *,
+        ok: bool = True,
+        resolved_url: str | None = None,
+        handle: int | None = None,
+        codecs: list[str] | None = None,
+    ) -> "Pong":
         return Pong(
             ts=Protocol.timestamp(),
             src=self.dst,
@@ -54,6 +75,8 @@ class Ping(RpcMessage, frozen=True):
             id=self.id,
             ok=ok,
             resolved_url=resolved_url,
+            handle=handle,
+            codecs=codecs,
         )
 
 
@@ -62,6 +85,19 @@ class Pong(RpcMessage, frozen=True):
     ok: bool = True
 
     resolved_url: str | None = None
+    # the resolved object's handle on that bus, for Request.handle
+    handle: int | None = None
+
+    # see Ping.codecs
+    codecs: list[str] | None = None
+
+
+class Trace(msgspec.Struct, frozen=True, array_like=True):
+    """Where a request sits in a trace (see chimera.core.trace): the trace
+    and the caller's span, parent of every span recorded for it."""
+
+    id: int
+    span: int
 
 
 class Request(RpcMessage, frozen=True):
@@ -72,6 +108,19 @@ class Request(RpcMessage, frozen=True):
     args: list[Any]
     kwargs: dict[str, Any]
 
+    # from the Pong that resolved dst: the target bus dispatches straight
+    # through it, with no URL parsing or registry lookup. Unknown or stale
+    # handles (and buses that predate them) fall back to dst
+    handle: int | None = None
+
+    # set on requests made inside a trace; None: not traced
+    trace: Trace | None = None
+
+    # nanoseconds left to the caller's deadline when sent: relative, so
+    # the hosts' clocks need not agree. The target counts it from arrival,
+    # and a request still queued past it is answered with 504 instead of run
+    budget: int | None = None
+
     def ok(self, result: Any) -> "Response":
         return Response(
             ts=Protocol.timestamp(),
@@ -102,6 +151,16 @@ class Request(RpcMessage, frozen=True):
             error=msg,
         )
 
+    def expired(self, msg: str) -> "Response":
+        return Response(
+            ts=Protocol.timestamp(),
+            src=self.dst,
+            dst=self.src,
+            id=self.id,
+            code=504,
+            error=msg,
+        )
+
     def error(self, error: Exception) -> "Response":
         tb = "".join(traceback.format_exception(error))
         return Response(
@@ -114,6 +173,31 @@ class Request(RpcMessage, frozen=True):
         )
 
 
+class Cancel(RpcMessage, frozen=True):
+    # the request to cancel: skipped if still queued, its CancelToken set
+    # if running (see chimera.core.cancel)
+    id: int
+
+
+class Credit(RpcMessage, frozen=True):
+    """Consumer -> producer: send `credit` more chunks of stream `id`."""
+
+    id: int  # the stream, as offered by the producer
+    credit: int
+
+
+class Chunk(RpcMessage, frozen=True):
+    """Producer -> consumer: one slice of an offered payload."""
+
+    id: int  # the stream
+    seq: int  # 0, 1, ... to catch a chunk lost to backpressure
+
+    data: bytes
+    eof: bool = False  # last chunk: the stream is closed on both ends
+    # the producer has no such stream (expired, cancelled, never offered)
+    error: str | None = None
+
+
 class Response(RpcMessage, frozen=True):
     id: int  # to correlate with the original request
 
@@ -129,6 +213,26 @@ class SubMessage(Message, frozen=True):
     sub: str  # an URL [tcp://]host:port/Object/[0|instance]
 
 
+# an event argument: its position, or its name for keyword arguments
+type ArgRef = int | str
+
+
+class Filter(msgspec.Struct, frozen=True):
+    """Which emissions a subscription wants, decided at the publisher: the
+    rest are never encoded nor sent. An emission is delivered when it passes
+    every `where` condition, moved one of the `deadband` arguments by more
+    than its band since the last delivered one, and comes at least
+    1/max_rate seconds after it. A missing argument fails its condition."""
+
+    # (arg, op, value); op is one of ==, !=, <, <=, >, >=, in, not in
+    where: list[tuple[ArgRef, str, Any]] = []
+    # (arg, band): numeric arguments must change by more than band, any
+    # other value must just change; the first emission always passes
+    deadband: list[tuple[ArgRef, float]] = []
+    # deliveries per second, at most; the ones in between are dropped
+    max_rate: float | None = None
+
+
 class Subscribe(SubMessage, frozen=True):
     # late-binding: someone can subscribe to events that are not yet bound to any publishers
     event: str  # slew_complete
@@ -136,6 +240,9 @@ class Subscribe(SubMessage, frozen=True):
     # an id representing the callback, as we cannot pass a reference to the callable
     callback: int  #  id(self.on_slew_complete)
 
+    # None: every emission
+    filter: Filter | None = None
+
     @cached_property
     @override
     def src_bus(self) -> str:
@@ -184,6 +291,9 @@ class Publish(PubMessage, frozen=True):
     args: list[Any]
     kwargs: dict[str, Any]
 
+    # keep it as the event's last value, delivered to new subscribers
+    retain: bool = False
+
     def callback(
         self, *, dst: str, event: str, args: list[Any], kwargs: dict[str, Any]
     ) -> "Event":
@@ -203,6 +313,10 @@ class Event(RpcMessage, frozen=True):
     args: list[Any]
     kwargs: dict[str, Any]
 
+    # the subscriptions (callback tokens) on dst this emission is for, when
+    # filters picked them; None: every subscription to the event
+    callbacks: list[int] | None = None
+
     @cached_property
     @override
     def dst_bus(self) -> str:
@@ -221,12 +335,13 @@ class Protocol:
         return time.monotonic_ns()
 
     @staticmethod
-    def ping(*, src: str, dst: str) -> Ping:
+    def ping(*, src: str, dst: str, codecs: list[str] | None = None) -> Ping:
         return Ping(
             ts=Protocol.timestamp(),
             src=src,
             dst=dst,
             id=Protocol.id(),
+            codecs=codecs,
         )
 
     @staticmethod
@@ -237,6 +352,9 @@ class Protocol:
         method: str,
         args: list[Any] | None = None,
         kwargs: dict[str, Any] | None = None,
+        handle: int | None = None,
+        trace: Trace | None = None,
+        budget: int | None = None,
     ) -> Request:
         return Request(
             id=Protocol.id(),
@@ -246,16 +364,72 @@ class Protocol:
             method=method,
             args=args or [],
             kwargs=kwargs or {},
+            handle=handle,
+            trace=trace,
+            budget=budget,
+        )
+
+    @staticmethod
+    def cancel(request: Request) -> Cancel:
+        return Cancel(
+            ts=Protocol.timestamp(),
+            src=request.src,
+            dst=request.dst,
+            id=request.id,
+        )
+
+    @staticmethod
+    def cancel_stream(*, src: str, dst: str, id: int) -> Cancel:
+        return Cancel(
+            ts=Protocol.timestamp(),
+            src=src,
+            dst=dst,
+            id=id,
+        )
+
+    @staticmethod
+    def credit(*, src: str, dst: str, id: int, credit: int) -> Credit:
+        return Credit(
+            ts=Protocol.timestamp(),
+            src=src,
+            dst=dst,
+            id=id,
+            credit=credit,
+        )
+
+    @staticmethod
+    def chunk(
+        *,
+        src: str,
+        dst: str,
+        id: int,
+        seq: int,
+        data: bytes,
+        eof: bool = False,
+        error: str | None = None,
+    ) -> Chunk:
+        return Chunk(
+            ts=Protocol.timestamp(),
+            src=src,
+            dst=dst,
+            id=id,
+            seq=seq,
+            data=data,
+            eof=eof,
+            error=error,
         )
 
     @staticmethod
-    def subscribe(*, sub: str, pub: str, event: str, callback: int) -> Subscribe:
+    def subscribe(
+        *, sub: str, pub: str, event: str, callback: int, filter: Filter | None = None
+    ) -> Subscribe:
         return Subscribe(
             ts=Protocol.timestamp(),
             sub=sub,
             pub=pub,
             event=event,
             callback=callback,
+            filter=filter,
         )
 
     @staticmethod
@@ -275,6 +449,7 @@ class Protocol:
         event: str,
         args: list[Any],
         kwargs: dict[str, Any],
+        retain: bool = False,
     ) -> Publish:
         return Publish(
             ts=Protocol.timestamp(),
@@ -282,6 +457,7 @@ class Protocol:
             event=event,
             args=args,
             kwargs=kwargs,
+            retain=retain,
         )
 
     @staticmethod
@@ -1,29 +1,66 @@
-from collections.abc import Callable
+import asyncio
+import inspect
+import logging
+from collections.abc import Callable, Coroutine
+from concurrent.futures import Future
 from typing import Any
 
-from chimera.core.bus import Bus
+from chimera.core.bus import Bus, Call
 from chimera.core.exceptions import (
     BusDeadException,
     ObjectBusyException,
     ObjectNotFoundException,
+    RequestTimeoutException,
 )
+from chimera.core.protocol import Filter, Response
 from chimera.core.url import URL, create_url, parse_url, resolve_url
 
-__all__ = ["Proxy", "ProxyMethod"]
+__all__ = ["Proxy", "ProxyMethod", "ProxyBatch", "AsyncProxy", "AsyncProxyMethod"]
+
+log = logging.getLogger(__name__)
+
+
+def _result(proxy: "Proxy | AsyncProxy", response: Response) -> Any:
+    if response.code == 404:
+        # gone, or another object took its place: new proxies for it ping
+        # again (this one keeps its handle, which falls back to the path)
+        proxy.__bus__.forget_resolution(proxy.__url__.url)
+
+    if response.code == 503:
+        raise ObjectBusyException(response.error)
+
+    if response.code == 504:
+        raise RequestTimeoutException(response.error)
+
+    if response.error:
+        raise Exception(response.error)
+
+    return response.result
 
 
 class Proxy:
     """A remote-object handle, safe to share between threads.
 
     Every attribute access builds a fresh ProxyMethod, so calls carry no
-    shared state; the only mutable field, __resolved_url__, is set once and
-    never invalidated; and the bus correlates replies by message id, so
-    concurrent calls through one proxy cannot receive each other's answers.
+    shared state; the only mutable fields, __resolved_url__ and its
+    __handle__, are set once per proxy (a stale handle falls back to the
+    path on the target bus); and the bus correlates replies by message id,
+    so concurrent calls through one proxy cannot receive each other's
+    answers.
+
+    Resolutions are shared through the bus (Bus.cached_resolution): a new
+    Proxy for a url another one resolved recently makes no round trip. The
+    bus drops a cached resolution after resolve_ttl, when its peer is
+    evicted or its link forgotten, when the object's handle is invalidated,
+    and when a call through any proxy for it gets a 404.
     """
 
     def __init__(self, url: str | URL, bus: Bus, timeout: float | None = None):
         self.__url__ = parse_url(url)
         self.__resolved_url__: URL | None = None
+        # the object's handle on its bus: requests carrying it skip the
+        # URL parsing and registry lookup over there
+        self.__handle__: int | None = None
         self.__proxy_url__ = create_url(bus=bus.url.bus, cls="Proxy")
         self.__bus__ = bus
         # per-proxy request timeout; None uses the bus default
@@ -33,6 +70,11 @@ class Proxy:
         if self.__resolved_url__ is not None:
             return
 
+        cached = self.__bus__.cached_resolution(self.__url__.url)
+        if cached is not None:
+            self.__handle__, self.__resolved_url__ = cached[1], cached[0]
+            return
+
         self.ping()
 
         if not self.__resolved_url__:
@@ -46,9 +88,24 @@ class Proxy:
             raise BusDeadException("bus is dead")
         resolved = self.__resolved_url__ is not None
         if not resolved and pong.ok and pong.resolved_url:
+            # handle first: whoever sees the url resolved also sees it
+            self.__handle__ = pong.handle
             self.__resolved_url__ = parse_url(pong.resolved_url)
+            self.__bus__.cache_resolution(
+                self.__url__.url, self.__resolved_url__, self.__handle__
+            )
         return pong.ok
 
+    def batch(self) -> "ProxyBatch":
+        """Pipeline several calls on this object:
+
+        with telescope.batch() as batch:
+            ra = batch.get_ra()
+            dec = batch.get_dec()
+        print(ra.result(), dec.result())
+        """
+        return ProxyBatch(self)
+
     def get_proxy(self, url: str) -> "Proxy":
         """Returns a Proxy for a resource relative to this Proxy's URL."""
         resolved_url = resolve_url(url, bus=self.__url__.bus)
@@ -160,18 +217,66 @@ class ProxyMethod:
             args=list(args),
             kwargs=kwargs,
             timeout=self.proxy.__timeout__,
+            handle=self.proxy.__handle__,
         )
 
-        if response.code == 503:
-            raise ObjectBusyException(response.error)
+        return _result(self.proxy, response)
 
-        if response.error:
-            raise Exception(response.error)
+    # asynchronous call
+    def future(self, *args: Any, **kwargs: Any) -> Future[Any]:
+        """Start the call and return a Future for its result at once, e.g.
+        to slew, rotate and change filters together and join on all three.
+        The first call on a proxy still resolves it (one ping) before
+        returning. Bound the wait with result(timeout); cancel() drops the
+        reply and skips the call remotely if it has not started yet."""
+        self.proxy.resolve()
+        assert self.proxy.__resolved_url__ is not None
 
-        return response.result
+        response_future = self.proxy.__bus__.request_future(
+            src=self.proxy.__proxy_url__.url,
+            dst=self.proxy.__resolved_url__,
+            method=self.method,
+            args=list(args),
+            kwargs=kwargs,
+            handle=self.proxy.__handle__,
+        )
+
+        result: Future[Any] = Future()
+
+        def relay(response_future: Future[Any]) -> None:
+            if response_future.cancelled():
+                result.cancel()
+                return
+            if not result.set_running_or_notify_cancel():
+                return
+            try:
+                result.set_result(_result(self.proxy, response_future.result()))
+            except Exception as e:
+                result.set_exception(e)
+
+        def cancel(result: Future[Any]) -> None:
+            if result.cancelled():
+                response_future.cancel()
+
+        response_future.add_done_callback(relay)
+        result.add_done_callback(cancel)
+        return result
+
+    submit = future
 
     # event handling
     def __iadd__(self, other: Callable[..., Any]):
+        self.subscribe(other)
+        return self
+
+    def subscribe(
+        self, callback: Callable[..., Any], filter: Filter | None = None
+    ) -> None:
+        """`+=` with a filter, evaluated where the event is published:
+
+        guider.offset_complete.subscribe(
+            on_offset, Filter(deadband=[(0, 0.5)], max_rate=2.0)
+        )"""
         self.proxy.resolve()
         assert self.proxy.__resolved_url__ is not None
 
@@ -179,9 +284,9 @@ class ProxyMethod:
             sub=self.proxy.__proxy_url__.url,
             pub=self.proxy.__resolved_url__,
             event=self.method,
-            callback=other,
+            callback=callback,
+            filter=filter,
         )
-        return self
 
     def __isub__(self, other: Callable[..., Any]):
         self.proxy.resolve()
@@ -194,3 +299,247 @@ class ProxyMethod:
             callback=other,
         )
         return self
+
+
+class ProxyBatch:
+    """Calls collected on one remote object and sent together when the
+    `with` block exits (Bus.request_many): N calls cost about one round trip
+    instead of N. Each call returns a Future, done once the block exits;
+    remote errors surface from its result(), while a batch that cannot be
+    sent or answered in time raises on exit like a single call would."""
+
+    def __init__(self, proxy: Proxy):
+        self._proxy = proxy
+        self._calls: list[tuple[Call, Future[Any]]] = []
+
+    def __enter__(self) -> "ProxyBatch":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *_: Any) -> None:
+        if exc_type is not None:
+            # the block failed: nothing was sent, nothing will be
+            for _, future in self._calls:
+                future.cancel()
+            self._calls.clear()
+            return
+
+        self.flush()
+
+    def __getattr__(self, attr: str) -> Callable[..., Future[Any]]:
+        # see Proxy.__getattr__
+        if attr.startswith("__") and attr.endswith("__"):
+            raise AttributeError(attr)
+
+        def call(*args: Any, **kwargs: Any) -> Future[Any]:
+            return self._add(attr, list(args), kwargs)
+
+        call.__name__ = attr
+        return call
+
+    def __getitem__(self, item: str) -> Future[Any]:
+        return self._add("__getitem__", [item], {})
+
+    def _add(self, method: str, args: list[Any], kwargs: dict[str, Any]):
+        future: Future[Any] = Future()
+        self._calls.append((Call(self._proxy.__url__, method, args, kwargs), future))
+        return future
+
+    def flush(self) -> None:
+        """Send every call collected so far and wait for all the replies."""
+        calls, self._calls = self._calls, []
+        # a future its caller cancelled is left out; the rest can no longer
+        # be cancelled, so setting their outcome below cannot fail
+        calls = [
+            (call, future)
+            for call, future in calls
+            if future.set_running_or_notify_cancel()
+        ]
+        if not calls:
+            return
+
+        try:
+            self._proxy.resolve()
+            assert self._proxy.__resolved_url__ is not None
+
+            responses = self._proxy.__bus__.request_many(
+                src=self._proxy.__proxy_url__.url,
+                calls=[
+                    call._replace(
+                        dst=self._proxy.__resolved_url__,
+                        handle=self._proxy.__handle__,
+                    )
+                    for call, _ in calls
+                ],
+                timeout=self._proxy.__timeout__,
+            )
+        except Exception as e:
+            for _, future in calls:
+                future.set_exception(e)
+            raise
+
+        for (_, future), response in zip(calls, responses):
+            try:
+                future.set_result(_result(self._proxy, response))
+            except Exception as e:
+                future.set_exception(e)
+
+
+class AsyncProxy:
+    """The asyncio flavour of Proxy: calls are awaited on the running event
+    loop instead of blocking a thread, so one loop can keep thousands of
+    requests and subscriptions in flight.
+
+        telescope = AsyncProxy("tcp://host:port/Telescope/0", bus)
+        ra, dec = await asyncio.gather(telescope.get_ra(), telescope.get_dec())
+    """
+
+    def __init__(self, url: str | URL, bus: Bus, timeout: float | None = None):
+        self.__url__ = parse_url(url)
+        self.__resolved_url__: URL | None = None
+        # see Proxy.__handle__
+        self.__handle__: int | None = None
+        self.__proxy_url__ = create_url(bus=bus.url.bus, cls="Proxy")
+        self.__bus__ = bus
+        # per-proxy request timeout; None waits as long as the call takes
+        self.__timeout__ = timeout
+
+    async def resolve(self) -> None:
+        if self.__resolved_url__ is not None:
+            return
+
+        # see Proxy.resolve
+        cached = self.__bus__.cached_resolution(self.__url__.url)
+        if cached is not None:
+            self.__handle__, self.__resolved_url__ = cached[1], cached[0]
+            return
+
+        await self.ping()
+
+        if not self.__resolved_url__:
+            raise ObjectNotFoundException(f"could not resolve proxy for {self.__url__}")
+
+    async def ping(self, timeout: float = 5.0) -> bool:
+        pong = await self.__bus__.aping(
+            src=self.__proxy_url__, dst=self.__url__, timeout=timeout
+        )
+        if pong is None:
+            raise BusDeadException("bus is dead")
+        if self.__resolved_url__ is None and pong.ok and pong.resolved_url:
+            self.__handle__ = pong.handle
+            self.__resolved_url__ = parse_url(pong.resolved_url)
+            self.__bus__.cache_resolution(
+                self.__url__.url, self.__resolved_url__, self.__handle__
+            )
+        return pong.ok
+
+    def __getattr__(self, attr: str) -> "AsyncProxyMethod":
+        # see Proxy.__getattr__
+        if attr.startswith("__") and attr.endswith("__"):
+            raise AttributeError(attr)
+        return AsyncProxyMethod(self, attr)
+
+    def __getitem__(self, item: str) -> Coroutine[Any, Any, Any]:
+        return AsyncProxyMethod(self, "__getitem__")(item)
+
+    def __repr__(self):
+        return f"<{self.__url__} async proxy at {hex(id(self))}>"
+
+    def __str__(self):
+        return f"[async proxy for {self.__url__}]"
+
+
+class _LoopCallback:
+    """An event callback that is a coroutine function: the bus calls this
+    on a handler thread, which only schedules the coroutine on the loop it
+    was subscribed from. Compares equal to the coroutine function so
+    unsubscribing with it finds the registration."""
+
+    def __init__(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Any]],
+        loop: asyncio.AbstractEventLoop,
+    ):
+        self.callback = callback
+        self.loop = loop
+
+    def __call__(self, *args: Any, **kwargs: Any) -> None:
+        future = asyncio.run_coroutine_threadsafe(
+            self.callback(*args, **kwargs), self.loop
+        )
+        future.add_done_callback(self._log_result)
+
+    def _log_result(self, future: Future[Any]) -> None:
+        # the publisher never sees handler errors: log them (see
+        # Bus._log_event_result)
+        if not future.cancelled() and future.exception() is not None:
+            log.error(
+                f"error in event handler: {self.callback!r}",
+                exc_info=future.exception(),
+            )
+
+    def __eq__(self, other: Any):
+        if isinstance(other, _LoopCallback):
+            return self.callback == other.callback
+        return self.callback == other
+
+    def __hash__(self):
+        return hash(self.callback)
+
+
+class AsyncProxyMethod:
+    def __init__(self, proxy: AsyncProxy, method: str):
+        self.proxy = proxy
+        self.method = method
+
+        self.__name__ = method
+
+    def __repr__(self):
+        return f"<{self.proxy.__proxy_url__}.{self.method} async method proxy at {hex(id(self))}>"
+
+    async def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        await self.proxy.resolve()
+        assert self.proxy.__resolved_url__ is not None
+
+        response = await self.proxy.__bus__.arequest(
+            src=self.proxy.__proxy_url__.url,
+            dst=self.proxy.__resolved_url__,
+            method=self.method,
+            args=list(args),
+            kwargs=kwargs,
+            timeout=self.proxy.__timeout__,
+            handle=self.proxy.__handle__,
+        )
+
+        return _result(self.proxy, response)
+
+    # event handling: `+=` cannot await the resolve, so these are coroutines
+    async def subscribe(
+        self, callback: Callable[..., Any], filter: Filter | None = None
+    ) -> None:
+        """Subscribe to this event, optionally filtered (see
+        ProxyMethod.subscribe). Coroutine functions run on the current event
+        loop; plain callables on the bus handler pool, as usual."""
+        await self.proxy.resolve()
+        assert self.proxy.__resolved_url__ is not None
+
+        if inspect.iscoroutinefunction(callback):
+            callback = _LoopCallback(callback, asyncio.get_running_loop())
+
+        self.proxy.__bus__.subscribe(
+            sub=self.proxy.__proxy_url__.url,
+            pub=self.proxy.__resolved_url__,
+            event=self.method,
+            callback=callback,
+            filter=filter,
+        )
+
+    async def unsubscribe(self, callback: Callable[..., Any]) -> None:
+        await self.proxy.resolve()
+        assert self.proxy.__resolved_url__ is not None
+
+        self.proxy.__bus__.unsubscribe(
+            sub=self.proxy.__proxy_url__.url,
+            pub=self.proxy.__resolved_url__,
+            event=self.method,
+            callback=callback,
+        )
@@ -24,7 +24,11 @@ class Resource:
 
 class ResourcesManager:
     def __init__(self):
-        self._res = {}
+        self._res: dict[str, Resource] = {}
+        # class and base class names -> resources in registration order:
+        # '/Camera/1' is _by_class['Camera'][1]. Tuples replaced whole on
+        # add/remove, so lookups never need the lock
+        self._by_class: dict[str, tuple[Resource, ...]] = {}
         # add/remove are check-then-act sequences called from concurrent RPC
         # handlers: they must be atomic (M5)
         self._lock = threading.Lock()
@@ -44,6 +48,8 @@ class ResourcesManager:
             if path in self:
                 raise ValueError(f"'{path}' already exists.")
             self._res[path] = resource
+            for key in self._class_keys(resource):
+                self._by_class[key] = self._by_class.get(key, ()) + (resource,)
 
     def remove(self, path: str) -> None:
         with self._lock:
@@ -54,37 +60,31 @@ class ResourcesManager:
                 raise KeyError(f"{path} not found")
 
             del self._res[resource.path]
+            for key in self._class_keys(resource):
+                remaining = tuple(r for r in self._by_class[key] if r is not resource)
+                if remaining:
+                    self._by_class[key] = remaining
+                else:
+                    del self._by_class[key]
+
+    @staticmethod
+    def _class_keys(resource: Resource) -> set[str]:
+        return {resource.cls, *resource.bases}
 
     def get(self, path: str) -> Resource | None:
         cls, name = parse_path(path)
         if isinstance(name, int):
             return self._get_by_index(cls, name)
-        return self._get(cls, name)
+        return self._res.get(path)
 
     def get_by_class(self, cls: str) -> list[Resource]:
-        resources = []
-
-        for k, v in list(self._res.items()):
-            if cls == v.cls or cls in v.bases:
-                resources.append(self._res[k])
-
-        resources.sort(key=lambda entry: entry.created)
-        return resources
+        return list(self._by_class.get(cls, ()))
 
     def _get_by_index(self, cls: str, index: int) -> Resource | None:
-        resources = self.get_by_class(cls)
-        if not resources or index >= len(resources):
+        resources = self._by_class.get(cls, ())
+        if index >= len(resources):
             return None
-        return self._res[resources[index].path]
-
-    def _get(self, cls: str, name: str) -> Resource | None:
-        path = f"/{cls}/{name}"
-
-        resources = self.get_by_class(cls)
-        for resource in resources:
-            if resource.path == path:
-                return resource
-        return None
+        return resources[index]
 
     def __contains__(self, path: str):
         return self.get(path) is not None
@@ -38,7 +38,9 @@ class ReadWriteLock:
     In case a current reader requests a write lock, this can and will be
     satisfied without giving up the read locks first, but, only one thread
     may perform this kind of lock upgrade, as a deadlock would otherwise
-    occur. After the write lock has been granted, the thread will hold a
+    occur. A second reader upgrading meanwhile gives its read locks up and
+    queues as a plain writer instead (or, with a timeout, gets a ValueError).
+    After the write lock has been granted, the thread will hold a
     full write lock, and not be downgraded after the upgrading call to
     acquire_write() has been match by a corresponding release().
     """
@@ -110,7 +112,9 @@ class ReadWriteLock:
         timeout seconds or doing a non-blocking check in case timeout is <= 0.
 
         In case the write lock cannot be serviced due to the deadlock
-        condition mentioned above, a ValueError is raised.
+        condition mentioned above and a timeout is given, a ValueError is
+        raised. Without one, the read locks of the current thread are given
+        up while it waits, and come back as write locks.
 
         In case timeout is None, the call to acquire_write blocks until the
         lock request can be serviced.
@@ -120,7 +124,7 @@ class ReadWriteLock:
 
         if timeout is not None:
             endtime = time() + timeout
-        me, upgradewriter = current_thread(), False
+        me, upgradewriter, yieldedreads = current_thread(), False, 0
         self.__condition.acquire()
         try:
             if self.__writer is me:
@@ -134,10 +138,18 @@ class ReadWriteLock:
                     # If we are a reader and want to upgrade, and someone
                     # else also wants to upgrade, there is no way we can do
                     # this except if one of us releases all his read locks.
-                    # Signal this to user.
-                    raise ValueError("Inevitable dead lock, denying write lock")
-                upgradewriter = True
-                self.__upgradewritercount = self.__readers.pop(me)
+                    if timeout is not None:
+                        # Signal this to user.
+                        raise ValueError("Inevitable dead lock, denying write lock")
+                    # Do it ourselves, and wait as a plain writer; the
+                    # upgrade writer may be waiting for just us to leave.
+                    yieldedreads = self.__readers.pop(me)
+                    self.__pendingwriters.append(me)
+                    if not self.__readers:
+                        self.__condition.notify_all()
+                else:
+                    upgradewriter = True
+                    self.__upgradewritercount = self.__readers.pop(me)
             else:
                 # We aren't a reader, so add us to the pending writers queue
                 # for synchronization with the readers.
@@ -163,7 +175,7 @@ class ReadWriteLock:
                         # from the pending writers queue.
                         # This might mean starvation for readers, though.
                         self.__writer = me
-                        self.__writercount = 1
+                        self.__writercount = yieldedreads + 1
                         self.__pendingwriters = self.__pendingwriters[1:]
                         return
                 if timeout is not None:
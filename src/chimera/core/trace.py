@@ -0,0 +1,146 @@
+import collections
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any, NamedTuple
+
+from chimera.core.protocol import Protocol, Trace
+
+__all__ = ["Tracer", "current_trace", "span", "use_trace"]
+
+# the trace (and the span) the code running here belongs to: set while a
+# bus executes a traced request, so nested proxy calls carry it on
+_current: contextvars.ContextVar[Trace | None] = contextvars.ContextVar(
+    "chimera_trace", default=None
+)
+
+
+def current_trace() -> Trace | None:
+    return _current.get()
+
+
+@contextlib.contextmanager
+def use_trace(trace: Trace) -> Iterator[None]:
+    token = _current.set(trace)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+class _Span(NamedTuple):
+    name: str
+    cat: str
+    start: float
+    end: float
+    tid: int
+    trace: Trace
+    parent: int | None
+    args: dict[str, Any] | None
+
+
+class Tracer:
+    """The spans a bus recorded for traced requests, in a ring buffer: the
+    oldest go first once `size` are kept. Times are perf_counter() seconds;
+    dump() turns them into wall-clock Chrome-trace events, so dumps of
+    several buses line up."""
+
+    def __init__(self, name: str, size: int = 10_000):
+        self.name = name
+        self._spans: collections.deque[_Span] = collections.deque(maxlen=size)
+        # perf_counter() -> time.time()
+        self._epoch = time.time() - time.perf_counter()
+
+    def record(
+        self,
+        name: str,
+        cat: str,
+        start: float,
+        end: float,
+        trace: Trace,
+        parent: int | None,
+        args: dict[str, Any] | None = None,
+    ) -> None:
+        # deque.append is atomic: no lock on the request path
+        self._spans.append(
+            _Span(name, cat, start, end, threading.get_native_id(), trace, parent, args)
+        )
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+    def dump(self) -> dict[str, Any]:
+        """The spans as Chrome-trace JSON (chrome://tracing, Perfetto). Ids
+        are hex strings: JSON viewers lose precision past 2**53."""
+        pid = os.getpid()
+        threads = {thread.native_id: thread.name for thread in threading.enumerate()}
+
+        events: list[dict[str, Any]] = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": self.name},
+            }
+        ]
+        tids = set()
+        for span in list(self._spans):
+            tids.add(span.tid)
+            args = {
+                "trace": f"{span.trace.id:x}",
+                "span": f"{span.trace.span:x}",
+            }
+            if span.parent is not None:
+                args["parent"] = f"{span.parent:x}"
+            if span.args:
+                args.update(span.args)
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.cat,
+                    "ph": "X",
+                    "ts": (span.start + self._epoch) * 1e6,
+                    "dur": (span.end - span.start) * 1e6,
+                    "pid": pid,
+                    "tid": span.tid,
+                    "args": args,
+                }
+            )
+        for tid in sorted(tid for tid in tids if tid in threads):
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": threads[tid]},
+                }
+            )
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+@contextlib.contextmanager
+def span(tracer: Tracer, name: str, /, **args: Any) -> Iterator[Trace]:
+    """Record the block as a span on `tracer`: in the current trace, or as
+    the root of a new one. Requests made inside carry the trace to every bus
+    they reach, and the nested calls made there too."""
+    parent = _current.get()
+    trace = Trace(id=parent.id if parent else Protocol.id(), span=Protocol.id())
+    start = time.perf_counter()
+    try:
+        with use_trace(trace):
+            yield trace
+    finally:
+        tracer.record(
+            name,
+            "span",
+            start,
+            time.perf_counter(),
+            trace,
+            parent.span if parent else None,
+            args or None,
+        )
@@ -13,6 +13,8 @@ class SendResult(enum.StrEnum):
 class Transport:
     def __init__(self, url: str):
         self.url = url
+        # what was actually bound/dialed: `url` or a same-host shortcut to it
+        self.address: str | None = None
 
         # invoked from a transport worker thread when an established
         # connection to the peer is lost; receivers must only schedule work,
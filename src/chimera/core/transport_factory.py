@@ -1,6 +1,85 @@
+import logging
+import os
+import tempfile
+from collections.abc import Sequence
+from urllib.parse import urlsplit
+
 from .transport import Transport
 from .transport_nng import TransportNNG
 
+log = logging.getLogger(__name__)
+
+# same-host shortcuts a bus listens on besides its tcp:// url, fastest first
+LOCAL_TRANSPORTS = ("inproc", "ipc")
+
+
+def _ipc_dir(create: bool = False) -> str | None:
+    # ipc sockets live in a directory only this user can enter: in a shared
+    # /tmp anyone could plant a socket where a bus is about to listen, or
+    # connect to one and send it requests. Buses of other users on the host
+    # are reached over tcp
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        path = os.path.join(runtime, "chimera")
+    else:
+        path = os.path.join(tempfile.gettempdir(), f"chimera-{os.getuid()}")
+
+    if create:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        log.warning(f"{path} is not private to this user, not using ipc")
+        return None
+    return path
+
+
+def _inproc_address(url: str) -> str:
+    # derived from the tcp url alone, so a peer that only knows our public
+    # identity can find the shortcut without asking (ipc alike)
+    parts = urlsplit(url)
+    return f"inproc://chimera/{parts.hostname}:{parts.port}"
+
+
+def _ipc_address(url: str, create: bool = False) -> str | None:
+    directory = _ipc_dir(create)
+    if directory is None:
+        return None
+    parts = urlsplit(url)
+    return f"ipc://{os.path.join(directory, f'{parts.hostname}-{parts.port}.ipc')}"
+
+
+def _local_address(url: str, scheme: str) -> str | None:
+    match scheme:
+        case "inproc":
+            return _inproc_address(url)
+        case "ipc":
+            return _ipc_address(url, create=True)
+        case _:
+            raise ValueError(
+                f"unknown local transport '{scheme}', "
+                f"expected one of: {', '.join(LOCAL_TRANSPORTS)}"
+            )
+
+
+def create_listener(
+    url: str, local_transports: Sequence[str] = LOCAL_TRANSPORTS
+) -> Transport:
+    """Inbound transport for a bus: listens on `url`, which stays its public
+    identity, and on the ipc/inproc shortcuts same-host peers dial instead."""
+    aliases = [_local_address(url, scheme) for scheme in local_transports]
+    return TransportNNG(url, aliases=[alias for alias in aliases if alias is not None])
+
 
 def create_transport(url: str) -> Transport:
-    return TransportNNG(url)
+    """Outbound transport to the bus at `url`: inproc if it lives in this
+    process, ipc if on this host, tcp otherwise. Each shortcut exists only
+    when the peer bound it, so nothing here needs to know which addresses are
+    local; connect() falls through to the next on refusal."""
+    aliases = [_inproc_address(url)]
+    ipc = _ipc_address(url)
+    if ipc is not None and os.path.exists(ipc.removeprefix("ipc://")):
+        aliases.append(ipc)
+    return TransportNNG(url, aliases=aliases)
@@ -9,9 +9,13 @@ log = logging.getLogger(__name__)
 
 
 class TransportNNG(Transport):
-    def __init__(self, url: str):
+    def __init__(self, url: str, aliases: list[str] | None = None):
         super().__init__(url)
 
+        # same-host shortcuts to `url` (ipc://, inproc://): bind listens on
+        # each as well, connect tries them in order before `url` itself
+        self.aliases = aliases or []
+
         self._sk = None
 
     @override
@@ -24,6 +28,15 @@ class TransportNNG(Transport):
             self._sk.close()
             self._sk = None
             raise
+        self.address = self.url
+
+        for alias in self.aliases:
+            # a shortcut that cannot be bound (stale ipc file owned by another
+            # user, path too long) only costs peers the faster path
+            try:
+                self._sk.listen(alias)
+            except Exception as e:
+                log.debug(f"bind {alias} failed, peers will use {self.url}: {e}")
 
     @override
     def connect(self):
@@ -36,13 +49,17 @@ class TransportNNG(Transport):
         self._sk.send_buffer_size = 128
         # registered before dial so no removal event can be missed
         self._sk.add_post_pipe_remove_cb(self._pipe_removed)
-        try:
-            self._sk.dial(f"{self.url}", block=True)
-        except Exception as e:
-            log.debug(f"connect failed: {e}")
-            self._sk.close()
-            self._sk = None
-            raise
+        for address in [*self.aliases, self.url]:
+            try:
+                self._sk.dial(address, block=True)
+                self.address = address
+                return
+            except Exception as e:
+                log.debug(f"connect to {address} failed: {e}")
+                error = e
+        self._sk.close()
+        self._sk = None
+        raise error
 
     def _pipe_removed(self, pipe: pynng.Pipe) -> None:
         # runs on an nng worker thread: socket operations are not allowed here
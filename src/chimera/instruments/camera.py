@@ -7,8 +7,10 @@ from math import cos, pi, sin
 
 from chimera.controllers.imageserver.imagerequest import ImageRequest
 from chimera.controllers.imageserver.util import get_image_server
+from chimera.core.cancel import cancel_token
 from chimera.core.chimeraobject import ChimeraObject
 from chimera.core.lock import lock
+from chimera.core.metadata import MetadataSnapshots
 from chimera.interfaces.camera import (
     CameraExpose,
     CameraInformation,
@@ -30,6 +32,10 @@ class CameraBase(ChimeraObject, CameraExpose, CameraTemperature, CameraInformati
 
         self.extra_header_info = dict()
 
+        # what the instruments last published, for the FITS headers (see
+        # the metadata_max_age option)
+        self.metadata_snapshots = MetadataSnapshots()
+
     def __stop__(self):
         self.abort_exposure(readout=False)
 
@@ -81,19 +87,21 @@ class CameraBase(ChimeraObject, CameraExpose, CameraTemperature, CameraInformati
 
         # clear abort setting
         self.abort.clear()
+        # set if our caller cancels or gives up on us
+        token = cancel_token()
 
         images = []
 
         for frame_num in range(frames):
             # [ABORT POINT]
-            if self.abort.is_set():
+            if self.abort.is_set() or token.cancelled:
                 return tuple(images)
 
             image_request.begin_exposure(self)
             self._expose(image_request)
 
             # [ABORT POINT]
-            if self.abort.is_set():
+            if self.abort.is_set() or token.cancelled:
                 return tuple(images)
 
             image = self._readout(image_request)
@@ -102,7 +110,7 @@ class CameraBase(ChimeraObject, CameraExpose, CameraTemperature, CameraInformati
                 image_request.end_exposure(self)
 
             # [ABORT POINT]
-            if self.abort.is_set():
+            if self.abort.is_set() or token.cancelled:
                 return tuple(images)
 
             if (interval > 0 and frame_num < frames) and (not frames == 1):
@@ -226,11 +234,11 @@ class CameraBase(ChimeraObject, CameraExpose, CameraTemperature, CameraInformati
     def is_cooling(self):
         raise NotImplementedError()
 
-    @lock
+    @lock(shared=True)
     def get_temperature(self):
         raise NotImplementedError()
 
-    @lock
+    @lock(shared=True)
     def get_set_point(self):
         raise NotImplementedError()
 
@@ -16,6 +16,22 @@ __all__ = ["DomeBase"]
 
 
 class DomeBase(ChimeraObject, DomeSlew, DomeSlit, DomeSync):
+    __metadata_events__ = (
+        "slew_complete",
+        "slit_opened",
+        "slit_closed",
+        "flap_opened",
+        "flap_closed",
+        "wind_screen_move_complete",
+        "sync_complete",
+    )
+    # every driver gets the retained slit_state for free: it follows the
+    # slit_opened/slit_closed edges the driver already emits
+    __derived_events__ = {
+        "slit_opened": "_publish_slit_state",
+        "slit_closed": "_publish_slit_state",
+    }
+
     def __init__(self):
         ChimeraObject.__init__(self)
 
@@ -32,6 +48,9 @@ class DomeBase(ChimeraObject, DomeSlew, DomeSlit, DomeSync):
         self._telescope_is_slewing = threading.Event()
         self._telescope_is_slewing.clear()
 
+        # serializes slit_state publications (see _publish_slit_state)
+        self._slit_state_lock = threading.Lock()
+
     def __start__(self):
         self.set_hz(1 / 4.0)
 
@@ -68,6 +87,12 @@ class DomeBase(ChimeraObject, DomeSlew, DomeSlit, DomeSync):
             except Exception as e:
                 self.log.warning("Unable to close dome: %s", str(e))
 
+    def _publish_slit_state(self) -> None:
+        # publish what the slit is now, not what the edge said: with edges
+        # racing on two threads, the last slit_state retained is still right
+        with self._slit_state_lock:
+            self.slit_state(self.is_slit_open(), self.get_az())
+
     def control(self) -> bool:
         if self.get_mode() == Mode.Stand:
             return True
@@ -207,7 +232,7 @@ class DomeBase(ChimeraObject, DomeSlew, DomeSlit, DomeSync):
     def abort_slew(self) -> None:
         raise NotImplementedError()
 
-    @lock
+    @lock(shared=True)
     def get_az(self) -> float:
         raise NotImplementedError()
 
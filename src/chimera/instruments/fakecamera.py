@@ -12,6 +12,7 @@ import urllib.request
 import numpy as np
 from astropy.io import fits
 
+from chimera.core.cancel import cancel_token
 from chimera.core.lock import lock
 from chimera.instruments.camera import CameraBase
 from chimera.interfaces.camera import CameraFeature, CameraStatus, ReadoutMode
@@ -105,10 +106,11 @@ class FakeCamera(CameraBase):
         status = CameraStatus.OK
 
         t = 0
+        token = cancel_token()
         self.__last_frame_start = dt.datetime.now(dt.UTC)
         while t < image_request["exptime"]:
             # [ABORT POINT]
-            if self.abort.is_set():
+            if self.abort.is_set() or token.cancelled:
                 status = CameraStatus.ABORTED
                 break
 
@@ -325,7 +327,7 @@ class FakeCamera(CameraBase):
     def is_cooling(self):
         return self.__cooling
 
-    @lock
+    @lock(shared=True)
     def get_temperature(self):
         return self.__temperature + random.random()
 
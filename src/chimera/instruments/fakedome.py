@@ -89,7 +89,7 @@ class FakeDome(DomeBase, DomeFlap, DomeWindScreen):
         while self.is_slewing():
             time.sleep(0.1)
 
-    @lock
+    @lock(shared=True)
     def get_az(self) -> float:
         return self._position
 
@@ -174,7 +174,7 @@ class FakeDome(DomeBase, DomeFlap, DomeWindScreen):
         self._wind_screen_moving = False
         self.wind_screen_move_complete(self.get_wind_screen_alt(), status)
 
-    @lock
+    @lock(shared=True)
     def get_wind_screen_alt(self) -> float:
         return self._wind_screen_alt
 
@@ -68,7 +68,7 @@ class FakeFocuser(FocuserBase):
                 f"{int(position)} is outside focuser boundaries."
             )
 
-    @lock
+    @lock(shared=True)
     def get_position(self, axis=FocuserAxis.Z):
         self._check_axis(axis)
         return int(self._position)
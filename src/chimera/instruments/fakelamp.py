@@ -46,7 +46,7 @@ class FakeLamp(LampBase, LampDimmer):
                 f"Intensity {intensity:.2f} out of range. Must be between ({range_start:.2f}:{range_end:.2f}]."
             )
 
-    @lock
+    @lock(shared=True)
     def get_intensity(self):
         return self._intensity
 
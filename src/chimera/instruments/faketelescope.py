@@ -197,38 +197,38 @@ class FakeTelescope(TelescopeBase, TelescopePier):
         self._slewing = False
         self.slew_complete(self._ra, self._dec, TelescopeStatus.OK)
 
-    @lock
+    @lock(shared=True)
     @override
     def get_ra(self) -> float:
         return self._ra
 
-    @lock
+    @lock(shared=True)
     @override
     def get_dec(self) -> float:
         return self._dec
 
-    @lock
+    @lock(shared=True)
     def get_az(self):
         return self._az
 
-    @lock
+    @lock(shared=True)
     def get_alt(self):
         return self._alt
 
-    @lock
+    @lock(shared=True)
     def get_position_ra_dec(self):
         return self.get_ra(), self.get_dec()
 
-    @lock
+    @lock(shared=True)
     def get_position_alt_az(self):
         pos = Position.from_alt_az(self.get_alt(), self.get_az())
         return float(pos.alt), float(pos.az)
 
-    @lock
+    @lock(shared=True)
     def get_target_ra_dec(self):
         return self.get_position_ra_dec()
 
-    @lock
+    @lock(shared=True)
     def get_target_alt_az(self):
         return self.get_position_alt_az()
 
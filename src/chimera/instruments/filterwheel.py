@@ -12,6 +12,8 @@ from chimera.interfaces.filterwheel import (
 
 
 class FilterWheelBase(ChimeraObject, FilterWheel):
+    __metadata_events__ = ("filter_change",)
+
     def __init__(self):
         ChimeraObject.__init__(self)
 
@@ -29,7 +29,7 @@ class FocuserBase(ChimeraObject, Focuser):
     def move_to(self, position, axis=FocuserAxis.Z):
         raise NotImplementedError()
 
-    @lock
+    @lock(shared=True)
     def get_position(self, axis=FocuserAxis.Z):
         raise NotImplementedError()
 
@@ -21,6 +21,15 @@ __all__ = ["TelescopeBase"]
 class TelescopeBase(
     ChimeraObject, TelescopeSlew, TelescopeSync, TelescopePark, TelescopeTracking
 ):
+    __metadata_events__ = (
+        "slew_complete",
+        "sync_complete",
+        "park_complete",
+        "unpark_complete",
+        "tracking_started",
+        "tracking_stopped",
+    )
+
     def __init__(self):
         super().__init__()
 
@@ -114,6 +114,12 @@ class Camera(Interface):
         "ccd_height": 1,  # CCD height (in pixels)
         "pixel_size_x": 1.0,  # Pixel size along X axis (in micrometers)
         "pixel_size_y": 1.0,  # Pixel size along Y axis (in micrometers)
+        # Build FITS headers from the snapshots instruments publish on each
+        # state change (metadata_changed) when no older than this (in
+        # seconds), without asking them. 0 asks every instrument each frame
+        "metadata_max_age": 0.0,
+        # Ask instruments with no fresh snapshot (False leaves them out)
+        "metadata_pull": True,
     }
 
     # List of supported features by this camera. e.g. {CameraFeature.TEMPERATURE_CONTROL: True}
@@ -278,7 +284,7 @@ class CameraTemperature(Camera):
     def is_fanning(self):
         pass
 
-    @event
+    @event(retain=True)
     def temperature_change(self, new_temp_c, delta):
         """
         Camera temperature probe. Will be fired everytime that the camera
@@ -247,6 +247,19 @@ class DomeSlit(Dome):
         @type  az: float
         """
 
+    @event(retain=True)
+    def slit_state(self, open: bool, az: float) -> None:
+        """
+        Indicates the slit state after each open or close. Retained, so a
+        new subscriber gets the current state first.
+
+        @param open: True when the slit is open, False when closed.
+        @type  open: bool
+
+        @param az: The azimuth when the slit moved.
+        @type  az: float
+        """
+
 
 class DomeFlap(Dome):
     """
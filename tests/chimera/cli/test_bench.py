@@ -0,0 +1,94 @@
+import json
+
+import msgspec
+
+from chimera.cli.bench import BENCHMARKS, Settings, compare, main, run_suite
+
+TINY = Settings(
+    requests=20,
+    clients=(2,),
+    duration=0.05,
+    payload_size=300_000,
+    payload_count=1,
+    subscribers=2,
+    events=20,
+)
+
+
+def test_run_suite():
+    steps: list[str] = []
+    document = run_suite(TINY, progress=steps.append)
+
+    assert steps == [
+        f"{mode} {bench}" for mode in ("inproc", "subprocess") for bench in BENCHMARKS
+    ]
+    assert document["version"] == 1
+    assert document["meta"]["settings"]["clients"] == [2]
+
+    results = document["results"]
+    for mode in ("inproc", "subprocess"):
+        assert set(name for name in results if name.startswith(f"{mode}.")) == {
+            f"{mode}.rtt.p50",
+            f"{mode}.rtt.p99",
+            f"{mode}.throughput.c2",
+            f"{mode}.lane.c2",
+            f"{mode}.payload.inline",
+            f"{mode}.payload.stream",
+            f"{mode}.fanout.deliveries",
+            f"{mode}.fanout.lost",
+        }
+        assert results[f"{mode}.rtt.p50"]["unit"] == "μs"
+        assert (
+            0
+            < results[f"{mode}.rtt.p50"]["value"]
+            <= results[f"{mode}.rtt.p99"]["value"]
+        )
+        assert results[f"{mode}.throughput.c2"]["better"] == "higher"
+        assert results[f"{mode}.fanout.lost"]["value"] == 0
+    assert msgspec.json.decode(msgspec.json.encode(document)) == document
+
+
+def _document(commit: str, **values: float) -> dict:
+    better = {"rtt": "lower", "rps": "higher", "lost": "lower"}
+    return {
+        "version": 1,
+        "meta": {"commit": commit},
+        "results": {
+            name: {"value": value, "unit": "", "better": better[name]}
+            for name, value in values.items()
+        },
+    }
+
+
+def test_compare():
+    base = _document("a", rtt=100.0, rps=1000.0, lost=0)
+
+    rows = compare(base, _document("b", rtt=105.0, rps=850.0, lost=0), threshold=10)
+    assert {row["name"]: row["status"] for row in rows} == {
+        "rtt": "ok",
+        "rps": "regression",
+        "lost": "ok",
+    }
+    assert rows[0]["change"] == -5.0
+    assert rows[1]["change"] == -15.0
+    assert rows[2]["change"] == 0.0
+
+    # lower is better: latency down is an improvement
+    rows = compare(base, _document("c", rtt=50.0, lost=3), threshold=10)
+    assert {row["name"]: row["status"] for row in rows} == {
+        "rtt": "improved",
+        "lost": "regression",
+    }
+    assert rows[0]["change"] == 50.0
+    assert rows[1]["change"] == float("-inf")
+
+
+def test_compare_exit_status(tmp_path):
+    base, same, worse = tmp_path / "a.json", tmp_path / "b.json", tmp_path / "c.json"
+    base.write_text(json.dumps(_document("a", rtt=100.0, rps=1000.0, lost=0)))
+    same.write_text(json.dumps(_document("b", rtt=101.0, rps=990.0, lost=0)))
+    worse.write_text(json.dumps(_document("c", rtt=200.0, rps=990.0, lost=0)))
+
+    assert main(["--compare", str(base), str(same)]) == 0
+    assert main(["--compare", str(base), str(worse)]) == 1
+    assert main(["--compare", str(base), str(worse), "--threshold", "150"]) == 0
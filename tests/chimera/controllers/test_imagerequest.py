@@ -0,0 +1,76 @@
+import time
+
+from chimera.controllers.imageserver.imagerequest import ImageRequest
+from chimera.core.cancel import cancel_token
+from chimera.core.chimeraobject import ChimeraObject
+from chimera.core.lock import lock
+
+
+class Source(ChimeraObject):
+    __config__ = {"delay": 0.0}
+
+    def get_metadata(self, request):
+        time.sleep(self["delay"])
+        return [(self.get_location().split("/")[-1].upper(), True, "")]
+
+
+class LockedSource(ChimeraObject):
+    @lock
+    def get_metadata(self, request):
+        return [(self.get_location().split("/")[-1].upper(), True, "")]
+
+
+class Exposer(ChimeraObject):
+    @lock
+    def expose(self):
+        request = ImageRequest()
+        request.metadata_post = ["/LockedSource/a", "/LockedSource/b"]
+        request.end_exposure(self)
+        return [header[0] for header in request.headers]
+
+
+class StuckSource(ChimeraObject):
+    def get_metadata(self, request):
+        # until its caller gives up on it
+        cancel_token().wait(10)
+        return [("STUCK", True, "")]
+
+
+def test_metadata_collected_concurrently(manager):
+    for name in ("a", "b", "c"):
+        manager.add_class(Source, name, config={"delay": 0.3}, start=False)
+    manager.add_class(StuckSource, "stuck", start=False)
+
+    request = ImageRequest()
+    request.metadata_timeout = 1.0
+    request.metadata_post = [
+        "/Source/c",
+        "/StuckSource/stuck",
+        "/Missing/0",
+        "/Source/a",
+        "/Source/b",
+    ]
+
+    t0 = time.monotonic()
+    request.end_exposure(manager)
+    elapsed = time.monotonic() - t0
+
+    # in the order listed, without the stuck and missing sources
+    assert [header[0] for header in request.headers] == ["C", "A", "B"]
+    # the frame waited for the stuck source no longer than the timeout
+    assert elapsed < 1.0 + 0.5
+
+
+def test_metadata_from_locked_sources_inside_a_locked_method(manager):
+    """A locked exposure waiting on locked header sources holds its lane
+    thread: even with a single one, the sources still get to run."""
+    manager._bus._lane_pool.size = 1
+
+    for name in ("a", "b"):
+        manager.add_class(LockedSource, name, start=False)
+    manager.add_class(Exposer, "cam", start=False)
+
+    t0 = time.monotonic()
+    assert manager.get_proxy("/Exposer/cam").expose() == ["A", "B"]
+    # well within metadata_timeout: no source was given up on
+    assert time.monotonic() - t0 < 2
@@ -1,3 +1,5 @@
+import asyncio
+import contextlib
 import logging
 import os
 import threading
@@ -8,21 +10,34 @@ from typing import Any
 from unittest.mock import MagicMock
 
 import msgspec
+import numpy as np
 import pytest
 
-from chimera.core.bus import Bus, EventId, _Peer
+from chimera.core.bus import (
+    Bus,
+    Call,
+    EventId,
+    PushResult,
+    _EventFilter,
+    _FanOut,
+    _Peer,
+)
+from chimera.core.cancel import CancelToken, cancel_token, use_cancel_token
 from chimera.core.chimeraobject import ChimeraObject
+from chimera.core.codec import decode_message
 from chimera.core.exceptions import (
     BusDeadException,
     ObjectBusyException,
     RequestTimeoutException,
+    StreamException,
 )
 from chimera.core.lock import lock
 from chimera.core.manager import Manager
-from chimera.core.protocol import Protocol, Subscribe
+from chimera.core.protocol import Event, Filter, Protocol, Subscribe
 from chimera.core.proxy import Proxy
+from chimera.core.trace import span
 from chimera.core.transport import SendResult, Transport
-from chimera.core.transport_factory import create_transport
+from chimera.core.transport_factory import create_listener, create_transport
 from chimera.core.url import parse_url
 
 
@@ -1582,6 +1597,150 @@ def test_lane_idle_eviction_and_respawn(create_bus: Callable[..., Bus]):
     pool.shutdown()
 
 
+def test_lanes_share_a_bounded_pool(create_bus: Callable[..., Bus]):
+    """Lanes are mailboxes, not threads: many locked objects run on the
+    lane pool's few workers, each still one request at a time, in order."""
+    bus = create_bus("tcp://127.0.0.1:15325", lane_pool_size=3)
+
+    objects = 30
+    calls: dict[str, list[int]] = {f"/L/{i}": [] for i in range(objects)}
+    running: dict[str, int] = dict.fromkeys(calls, 0)
+    overlapped = False
+    guard = threading.Lock()
+
+    def step(resource: str, i: int) -> int:
+        nonlocal overlapped
+        with guard:
+            running[resource] += 1
+            overlapped = overlapped or running[resource] > 1
+        time.sleep(0.001)
+        calls[resource].append(i)
+        with guard:
+            running[resource] -= 1
+        return i
+
+    def resolve(object: str, method: str):
+        @lock
+        def locked_step(i: int) -> int:
+            return step(object, i)
+
+        return object, locked_step
+
+    bus.resolve_request = resolve
+
+    pool = ThreadPoolExecutor()
+    bus_future = pool.submit(bus.run_forever)
+    assert bus._bus_started.wait(5)
+    threads = threading.active_count()
+
+    futures = [
+        bus.request_future(
+            src=f"{bus.url.bus}/Proxy/0",
+            dst=f"{bus.url.bus}{resource}",
+            method="locked_step",
+            args=[i],
+        )
+        for i in range(5)
+        for resource in calls
+    ]
+    for future in futures:
+        assert future.result(timeout=10).code == 200
+
+    assert not overlapped
+    assert all(order == list(range(5)) for order in calls.values())
+    assert len(bus._lanes) == objects
+    assert len(bus.stats()["lane_pool"]["threads"]) <= 3
+    # the workers, and the watcher the backlog started
+    assert threading.active_count() <= threads + 3 + 1
+
+    bus.shutdown()
+    bus_future.result()
+    pool.shutdown()
+
+
+def test_lane_pool_grows_under_nested_locked_calls(
+    create_bus: Callable[..., Bus],
+):
+    """A locked method waiting on another locked object's method holds its
+    lane thread: with every thread held like that, the pool starts one more
+    instead of deadlocking, and lets it go once idle."""
+    bus = create_bus("tcp://127.0.0.1:15330", lane_pool_size=1, lane_idle_timeout=0.5)
+    src = f"{bus.url.bus}/Proxy/0"
+
+    @lock
+    def outer() -> int:
+        response = bus.request(
+            src=src, dst=f"{bus.url.bus}/Inner/0", method="inner", timeout=5
+        )
+        return response.result + 1
+
+    @lock
+    def inner() -> int:
+        return 41
+
+    methods = {"outer": outer, "inner": inner}
+    bus.resolve_request = lambda object, method: (object, methods[method])
+
+    pool = ThreadPoolExecutor()
+    bus_future = pool.submit(bus.run_forever)
+    assert bus._bus_started.wait(5)
+
+    response = bus.request(
+        src=src, dst=f"{bus.url.bus}/Outer/0", method="outer", timeout=10
+    )
+    assert response.result == 42
+    assert len(bus.stats()["lane_pool"]["threads"]) == 2
+
+    deadline = time.monotonic() + 5
+    while len(bus.stats()["lane_pool"]["threads"]) > 1:
+        assert time.monotonic() < deadline, "extra lane thread never retired"
+        time.sleep(0.05)
+
+    bus.shutdown()
+    bus_future.result()
+    pool.shutdown()
+
+
+def test_blocked_lane_does_not_stall_other_lanes(create_bus: Callable[..., Bus]):
+    """A locked method blocking its lane thread for long (an exposure), not
+    on a bus call the bus could see, still leaves the other objects'
+    lanes running."""
+    bus = create_bus("tcp://127.0.0.1:15336", lane_pool_size=1)
+    src = f"{bus.url.bus}/Proxy/0"
+    release = threading.Event()
+
+    @lock
+    def expose() -> bool:
+        return release.wait(10)
+
+    @lock
+    def get_position() -> int:
+        return 42
+
+    methods = {"expose": expose, "get_position": get_position}
+    bus.resolve_request = lambda object, method: (object, methods[method])
+
+    pool = ThreadPoolExecutor()
+    bus_future = pool.submit(bus.run_forever)
+    assert bus._bus_started.wait(5)
+
+    exposing = bus.request_future(
+        src=src, dst=f"{bus.url.bus}/Camera/0", method="expose"
+    )
+    response = bus.request(
+        src=src, dst=f"{bus.url.bus}/Telescope/0", method="get_position", timeout=5
+    )
+    assert response.result == 42
+    assert not exposing.done()
+
+    release.set()
+    assert exposing.result(timeout=5).result is True
+
+    bus.shutdown()
+    bus_future.result()
+    pool.shutdown()
+
+
 def test_unlocked_methods_not_routed_to_lane(create_bus: Callable[..., Bus]):
     bus = create_bus("tcp://127.0.0.1:15038")
 
@@ -1611,6 +1770,90 @@ def test_unlocked_methods_not_routed_to_lane(create_bus: Callable[..., Bus]):
     pool.shutdown()
 
 
+def test_lane_shared_reads_run_together(create_bus: Callable[..., Bus]):
+    """@lock(shared=True) reads of one object run side by side, but never
+    alongside its exclusive methods: a write waits for the reads before it,
+    and the reads after it wait for the write."""
+    bus = create_bus("tcp://127.0.0.1:15324", lane_readers=4)
+
+    running = 0
+    max_running = 0
+    writing = False
+    overlapped = False
+    counter_lock = threading.Lock()
+    events: list[str] = []
+
+    def enter() -> None:
+        nonlocal running, max_running, overlapped
+        with counter_lock:
+            running += 1
+            max_running = max(max_running, running)
+            overlapped = overlapped or writing
+
+    def leave() -> None:
+        nonlocal running
+        with counter_lock:
+            running -= 1
+
+    @lock(shared=True)
+    def read(i: int) -> int:
+        enter()
+        time.sleep(0.2)
+        leave()
+        events.append(f"read {i}")
+        return i
+
+    @lock
+    def write() -> None:
+        nonlocal writing, overlapped
+        with counter_lock:
+            overlapped = overlapped or running > 0
+            writing = True
+        time.sleep(0.1)
+        with counter_lock:
+            writing = False
+        events.append("write")
+
+    methods = {"read": read, "write": write}
+    bus.resolve_request = lambda object, method: ("/Locked/0", methods[method])
+
+    pool = ThreadPoolExecutor()
+    bus_future = pool.submit(bus.run_forever)
+    assert bus._bus_started.wait(5)
+
+    def call(method: str, *args: Any):
+        return bus.request_future(
+            src=f"{bus.url.bus}/Proxy/0",
+            dst=f"{bus.url.bus}/Locked/0",
+            method=method,
+            args=list(args),
+        )
+
+    t0 = time.monotonic()
+    reads = [call("read", i) for i in range(4)]
+    deadline = time.monotonic() + 5
+    while not any(lane["readers"] for lane in bus.stats()["lanes"]):
+        assert time.monotonic() < deadline, "reads never started"
+        time.sleep(0.01)
+    written = call("write")
+    after = call("read", 4)
+
+    assert [f.result(timeout=5).result for f in reads] == [0, 1, 2, 3]
+    assert written.result(timeout=5).code == 200
+    assert after.result(timeout=5).result == 4
+    elapsed = time.monotonic() - t0
+
+    # four reads at once (~0.2s), then the write, then the last read
+    assert max_running == 4
+    assert not overlapped
+    assert events[4:] == ["write", "read 4"]
+    assert elapsed < 0.2 * 5
+
+    bus.shutdown()
+    bus_future.result()
+    pool.shutdown()
+
+
 #
 # soak: everything at once, sustained
 #
@@ -2009,3 +2252,1668 @@ def test_remote_unserializable_result_returns_error(create_bus: Callable[..., Bu
     dst_bus_future.result()
     src_bus_future.result()
     pool.shutdown()
+
+
+#
+# wire codec negotiation
+#
+
+
+def test_codec_negotiated_per_peer(create_bus: Callable[..., Bus]):
+    """Two buses that both offer msgpack switch to it after one Ping/Pong;
+    a json-only bus (like one predating negotiation) keeps getting json,
+    and requests work over both links."""
+    bus = create_bus("tcp://127.0.0.1:15100")
+    msgpack_bus = create_bus("tcp://127.0.0.1:15101")
+    json_bus = create_bus("tcp://127.0.0.1:15102", codec="json")
+
+    for other in (msgpack_bus, json_bus):
+        other.resolve_request = resolve_request
+
+    pool = ThreadPoolExecutor()
+    futures = [pool.submit(b.run_forever) for b in (bus, msgpack_bus, json_bus)]
+    for b in (bus, msgpack_bus, json_bus):
+        assert b._bus_started.wait(5)
+
+    src = f"{bus.url.bus}/Proxy/0"
+    for other in (msgpack_bus, json_bus):
+        # nothing negotiated yet: json is what every bus understands
+        assert bus._peer_codecs.get(other.url.bus) is None
+        pong = bus.ping(src=src, dst=f"{other.url.bus}/Telescope/0")
+        assert pong is not None and pong.ok
+
+    assert bus.stats()["codecs"] == {
+        msgpack_bus.url.bus: "msgpack",
+        json_bus.url.bus: "json",
+    }
+    # the Ping taught the other side too: replies come back negotiated
+    assert msgpack_bus.stats()["codecs"] == {bus.url.bus: "msgpack"}
+    assert json_bus.stats()["codecs"] == {bus.url.bus: "json"}
+
+    for other in (msgpack_bus, json_bus):
+        response = bus.request(
+            src=src, dst=f"{other.url.bus}/Telescope/0", method="get_az"
+        )
+        assert response.code == 200 and response.result == 42.0
+
+    for b in (bus, msgpack_bus, json_bus):
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+
+def test_codec_renegotiated_after_eviction(create_bus: Callable[..., Bus]):
+    bus = create_bus("tcp://127.0.0.1:15103")
+    peer_url = "tcp://127.0.0.1:15104"
+
+    bus._negotiate_codec(peer_url, ["msgpack", "json"])
+    assert bus._peer_codecs[peer_url].name == "msgpack"
+
+    bus._peers[peer_url] = _Peer(AlwaysAgainTransport(peer_url))
+    bus._evict_peer(peer_url)
+    assert peer_url not in bus._peer_codecs
+
+    # an offer without our codec falls back to json
+    bus._negotiate_codec(peer_url, ["json"])
+    assert peer_url not in bus._peer_codecs
+
+
+def test_codec_wide_int_falls_back_to_json(create_bus: Callable[..., Bus]):
+    """msgpack cannot carry ints wider than 64 bits; such a message still
+    goes out, as a json frame."""
+    bus = create_bus("tcp://127.0.0.1:15105")
+    peer_url = "tcp://127.0.0.1:15106"
+    bus._negotiate_codec(peer_url, ["msgpack"])
+
+    # a reply travelling back to the peer
+    request = Protocol.request(
+        src=f"{peer_url}/Proxy/0", dst=f"{bus.url.bus}/Big/0", method="echo"
+    )
+    data = bus._encode(request.ok(2**70))
+    assert data is not None and data.startswith(b"{")
+    assert bus._encode(request.ok(1)) is not None
+    assert not bus._encode(request.ok(1)).startswith(b"{")
+
+
+#
+# in-process delivery: no encoding, serializability checked per signature
+#
+
+
+def test_local_serializability_checked_once(create_bus: Callable[..., Bus]):
+    """Local messages are never encoded; whether they would survive the
+    wire is checked (and logged) once per method, not on every call."""
+    bus = create_bus("tcp://127.0.0.1:15110")
+
+    def bad_result() -> UnserializableResult:
+        return UnserializableResult()
+
+    bus.resolve_request = lambda object, method: ("/Bad/0", bad_result)
+
+    pool = ThreadPoolExecutor()
+    bus_future = pool.submit(bus.run_forever)
+    assert bus._bus_started.wait(5)
+
+    encode = MagicMock(wraps=bus._json.encode)
+    bus._json.encode = encode
+
+    src, dst = f"{bus.url.bus}/Proxy/0", f"{bus.url.bus}/Bad/0"
+    for _ in range(3):
+        response = bus.request(src=src, dst=dst, method="bad_result", timeout=10.0)
+        # in-process callers still get the object itself
+        assert response.code == 200
+        assert isinstance(response.result, UnserializableResult)
+
+    # one check for the Request signature, one for the Response
+    assert encode.call_count == 2
+
+    bus.shutdown()
+    bus_future.result()
+    pool.shutdown()
+
+
+def test_local_serializability_checks_nested_payloads(
+    create_bus: Callable[..., Bus], caplog: pytest.LogCaptureFixture
+):
+    """A result whose nested content changes type is checked again: an
+    unencodable value inside a dict is still reported."""
+    bus = create_bus("tcp://127.0.0.1:15332")
+
+    results: list[Any] = [{"ra": 1.0}, {"ra": 2.0}, {"ra": UnserializableResult()}]
+
+    def get_status() -> Any:
+        return results.pop(0)
+
+    bus.resolve_request = lambda object, method: ("/Status/0", get_status)
+
+    pool = ThreadPoolExecutor()
+    bus_future = pool.submit(bus.run_forever)
+    assert bus._bus_started.wait(5)
+
+    encode = MagicMock(wraps=bus._json.encode)
+    bus._json.encode = encode
+
+    src, dst = f"{bus.url.bus}/Proxy/0", f"{bus.url.bus}/Status/0"
+    with caplog.at_level(logging.ERROR, logger="chimera.core.bus"):
+        for _ in range(3):
+            response = bus.request(src=src, dst=dst, method="get_status", timeout=10)
+            assert response.code == 200
+
+    # the Request once, then one Response per result shape
+    assert encode.call_count == 3
+    assert "won't work on remote buses" in caplog.text
+
+    bus.shutdown()
+    bus_future.result()
+    pool.shutdown()
+
+
+def test_strict_local_refuses_unserializable(create_bus: Callable[..., Bus]):
+    """Strict mode makes local calls fail exactly as remote ones would."""
+    bus = create_bus("tcp://127.0.0.1:15111", strict_local=True)
+
+    def bad_result() -> UnserializableResult:
+        return UnserializableResult()
+
+    bus.resolve_request = lambda object, method: ("/Bad/0", bad_result)
+
+    pool = ThreadPoolExecutor()
+    bus_future = pool.submit(bus.run_forever)
+    assert bus._bus_started.wait(5)
+
+    src, dst = f"{bus.url.bus}/Proxy/0", f"{bus.url.bus}/Bad/0"
+    response = bus.request(src=src, dst=dst, method="bad_result", timeout=10.0)
+    assert response.code == 500
+    assert response.error is not None and "UnserializableResult" in response.error
+
+    with pytest.raises(TypeError, match="not serializable"):
+        bus.request(
+            src=src,
+            dst=dst,
+            method="bad_result",
+            args=[UnserializableResult()],
+            timeout=10.0,
+        )
+
+    bus.shutdown()
+    bus_future.result()
+    pool.shutdown()
+
+
+def test_local_delivery_bench(create_bus: Callable[..., Bus]):
+    """Local request/response with a status-sized reply: strict mode (encode
+    every message, the old behaviour) against per-signature checks."""
+    print()
+
+    status = {
+        "objects": [
+            {"path": f"/Fake/fake{i}", "state": "RUNNING", "age": 1.5 * i}
+            for i in range(200)
+        ]
+    }
+
+    def get_status() -> dict[str, Any]:
+        return status
+
+    n = 2_000
+    for port, strict in ((15112, True), (15113, False)):
+        bus = create_bus(f"tcp://127.0.0.1:{port}", strict_local=strict)
+        bus.resolve_request = lambda object, method: ("/Manager/0", get_status)
+
+        pool = ThreadPoolExecutor()
+        bus_future = pool.submit(bus.run_forever)
+        assert bus._bus_started.wait(5)
+
+        src, dst = f"{bus.url.bus}/Proxy/0", f"{bus.url.bus}/Manager/0"
+        t0 = time.monotonic()
+        for _ in range(n):
+            assert bus.request(src=src, dst=dst, method="get_status").code == 200
+        print_results("rpc-strict" if strict else "rpc-local", n, time.monotonic() - t0)
+
+        bus.shutdown()
+        bus_future.result()
+        pool.shutdown()
+
+
+#
+# pipelined requests
+#
+
+
+def test_request_many_pipelined(create_bus: Callable[..., Bus]):
+    """A batch gets every reply, in call order, for about the cost of one
+    round trip: all requests are in flight before the first reply."""
+    print()
+    src_bus = create_bus("tcp://127.0.0.1:15120")
+    dst_bus = create_bus("tcp://127.0.0.1:15121")
+
+    in_flight = threading.Barrier(3, timeout=5)
+
+    def wait_siblings(x: int) -> int:
+        # only returns once all three requests of the batch arrived
+        in_flight.wait()
+        return x
+
+    def echo(x: int) -> int:
+        return x
+
+    methods = {"wait_siblings": wait_siblings, "echo": echo}
+    dst_bus.resolve_request = lambda object, method: ("/Echo/0", methods[method])
+
+    pool = ThreadPoolExecutor()
+    futures = [pool.submit(b.run_forever) for b in (src_bus, dst_bus)]
+
+    src, dst = f"{src_bus.url.bus}/Proxy/0", f"{dst_bus.url.bus}/Echo/0"
+    responses = src_bus.request_many(
+        src=src,
+        calls=[Call(dst, "wait_siblings", [i]) for i in range(3)],
+        timeout=10.0,
+    )
+    assert [response.result for response in responses] == [0, 1, 2]
+    assert len(src_bus._mailboxes._boxes) == 0
+
+    n, size = 200, 10
+    t0 = time.monotonic()
+    for _ in range(n):
+        for i in range(size):
+            src_bus.request(src=src, dst=dst, method="echo", args=[i])
+    print_results("rpc-sequential", n * size, time.monotonic() - t0)
+
+    t0 = time.monotonic()
+    for _ in range(n):
+        src_bus.request_many(
+            src=src, calls=[Call(dst, "echo", [i]) for i in range(size)]
+        )
+    print_results("rpc-batched", n * size, time.monotonic() - t0)
+
+    for b in (src_bus, dst_bus):
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+
+def test_request_many_timeout_bounds_whole_batch(create_bus: Callable[..., Bus]):
+    bus = create_bus("tcp://127.0.0.1:15122")
+
+    release = threading.Event()
+
+    def slow() -> bool:
+        release.wait(10)
+        return True
+
+    bus.resolve_request = lambda object, method: ("/Slow/0", slow)
+
+    pool = ThreadPoolExecutor()
+    bus_future = pool.submit(bus.run_forever)
+    assert bus._bus_started.wait(5)
+
+    dst = f"{bus.url.bus}/Slow/0"
+    t0 = time.monotonic()
+    with pytest.raises(RequestTimeoutException):
+        bus.request_many(
+            src=f"{bus.url.bus}/Proxy/0",
+            calls=[Call(dst, "slow") for _ in range(3)],
+            timeout=0.3,
+        )
+    assert time.monotonic() - t0 < 2
+    assert len(bus._mailboxes._boxes) == 0
+
+    release.set()
+    bus.shutdown()
+    bus_future.result()
+    pool.shutdown()
+
+
+def test_request_many_cancels_sent_calls_on_send_failure(
+    create_bus: Callable[..., Bus],
+):
+    """A call that cannot be sent fails the batch, and the calls sent
+    before it are cancelled instead of running for nobody."""
+    bus = create_bus("tcp://127.0.0.1:15333", strict_local=True)
+
+    cancelled = threading.Event()
+
+    def slow(*args: Any) -> None:
+        if cancel_token().wait(5):
+            cancelled.set()
+
+    bus.resolve_request = lambda object, method: ("/Slow/0", slow)
+
+    pool = ThreadPoolExecutor()
+    bus_future = pool.submit(bus.run_forever)
+    assert bus._bus_started.wait(5)
+
+    dst = f"{bus.url.bus}/Slow/0"
+    with pytest.raises(TypeError, match="not serializable"):
+        bus.request_many(
+            src=f"{bus.url.bus}/Proxy/0",
+            calls=[Call(dst, "slow"), Call(dst, "slow", [UnserializableResult()])],
+        )
+    assert cancelled.wait(5)
+    assert len(bus._mailboxes._boxes) == 0
+
+    bus.shutdown()
+    bus_future.result()
+    pool.shutdown()
+
+
+#
+# asyncio client
+#
+
+
+def test_arequest_thousands_in_flight(create_bus: Callable[..., Bus]):
+    """One event loop keeps every request in flight at once: none of them
+    holds a thread while waiting for its reply."""
+    print()
+    src_bus = create_bus("tcp://127.0.0.1:15130")
+    dst_bus = create_bus("tcp://127.0.0.1:15131")
+
+    release = threading.Event()
+    n = 2_000
+
+    def echo(x: int) -> int:
+        return x
+
+    def gated(x: int) -> int:
+        release.wait(10)
+        return x
+
+    methods = {"echo": echo, "gated": gated}
+    dst_bus.resolve_request = lambda object, method: ("/Echo/0", methods[method])
+
+    pool = ThreadPoolExecutor()
+    futures = [pool.submit(b.run_forever) for b in (src_bus, dst_bus)]
+    for b in (src_bus, dst_bus):
+        assert b._bus_started.wait(5)
+
+    src, dst = f"{src_bus.url.bus}/Proxy/0", f"{dst_bus.url.bus}/Echo/0"
+
+    async def main():
+        t0 = time.monotonic()
+        results = await asyncio.gather(
+            *(
+                src_bus.arequest(src=src, dst=dst, method="echo", args=[i])
+                for i in range(n)
+            )
+        )
+        print_results("arequest", n, time.monotonic() - t0)
+        assert [response.result for response in results] == list(range(n))
+
+        # counted after the burst: sends that would have waited (the first
+        # dial, a full send queue) ran on the loop's executor threads
+        threads = threading.active_count()
+
+        # parked on the remote side, yet no client thread is spent on them
+        pending = [
+            asyncio.ensure_future(
+                src_bus.arequest(src=src, dst=dst, method="gated", args=[i])
+            )
+            for i in range(100)
+        ]
+        while len(src_bus._mailboxes._boxes) < 100:
+            await asyncio.sleep(0.01)
+        assert threading.active_count() <= threads + dst_bus._handler_pool._max_workers
+        release.set()
+        assert [r.result for r in await asyncio.gather(*pending)] == list(range(100))
+
+        release.clear()
+        with pytest.raises(RequestTimeoutException):
+            await src_bus.arequest(
+                src=src, dst=dst, method="gated", args=[0], timeout=0.1
+            )
+        release.set()
+
+        pong = await src_bus.aping(src=src, dst=dst)
+        assert pong is not None and pong.ok is False  # nobody answers get_location
+
+    asyncio.run(main())
+    assert len(src_bus._mailboxes._boxes) == 0
+
+    for b in (src_bus, dst_bus):
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+
+def test_arequest_bus_shutdown_wakes_waiters(create_bus: Callable[..., Bus]):
+    bus = create_bus("tcp://127.0.0.1:15132")
+
+    release = threading.Event()
+
+    def slow() -> bool:
+        release.wait(10)
+        return True
+
+    bus.resolve_request = lambda object, method: ("/Slow/0", slow)
+
+    pool = ThreadPoolExecutor()
+    bus_future = pool.submit(bus.run_forever)
+    assert bus._bus_started.wait(5)
+
+    async def main():
+        call = asyncio.ensure_future(
+            bus.arequest(
+                src=f"{bus.url.bus}/Proxy/0", dst=f"{bus.url.bus}/Slow/0", method="slow"
+            )
+        )
+        while not bus._mailboxes._boxes:
+            await asyncio.sleep(0.01)
+        # let the handler finish only after shutdown woke the waiter
+        threading.Timer(0.2, release.set).start()
+        bus.shutdown()
+        with pytest.raises(BusDeadException):
+            await call
+
+    asyncio.run(main())
+    release.set()
+    bus_future.result()
+    pool.shutdown()
+
+
+#
+# request futures and cancellation
+#
+
+
+def test_request_future_and_remote_cancel(create_bus: Callable[..., Bus]):
+    """request_future() returns at once; cancelling it drops the reply and
+    tells a negotiated peer to skip the request if still queued."""
+    src_bus = create_bus("tcp://127.0.0.1:15140")
+    dst_bus = create_bus("tcp://127.0.0.1:15141")
+
+    release = threading.Event()
+    executed: list[str] = []
+
+    @lock
+    def hold() -> None:
+        executed.append("hold")
+        release.wait(10)
+
+    @lock
+    def later() -> None:
+        executed.append("later")
+
+    def get_location() -> str:
+        return f"{dst_bus.url.bus}/Locked/0"
+
+    methods = {"hold": hold, "later": later, "get_location": get_location}
+    dst_bus.resolve_request = lambda object, method: ("/Locked/0", methods[method])
+
+    pool = ThreadPoolExecutor()
+    futures = [pool.submit(b.run_forever) for b in (src_bus, dst_bus)]
+    for b in (src_bus, dst_bus):
+        assert b._bus_started.wait(5)
+
+    src, dst = f"{src_bus.url.bus}/Proxy/0", f"{dst_bus.url.bus}/Locked/0"
+    # negotiate: only then does src_bus know the peer understands Cancel
+    assert src_bus.ping(src=src, dst=dst).ok
+
+    held = src_bus.request_future(src=src, dst=dst, method="hold")
+    while executed != ["hold"]:
+        time.sleep(0.01)
+
+    cancelled = src_bus.request_future(src=src, dst=dst, method="later")
+    while not dst_bus._queued:
+        time.sleep(0.01)
+    assert cancelled.cancel()
+
+    deadline = time.monotonic() + 5
+    while dst_bus._queued:
+        assert time.monotonic() < deadline, "Cancel never reached the peer"
+        time.sleep(0.01)
+
+    release.set()
+    assert held.result(timeout=5).code == 200
+    # FIFO lane: once this one ran, the cancelled one was skipped
+    assert src_bus.request(src=src, dst=dst, method="later", timeout=5).code == 200
+    assert executed == ["hold", "later"]
+    assert not src_bus._mailboxes._boxes
+
+    for b in (src_bus, dst_bus):
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+
+def test_request_timeout_cancels_queued_and_running(create_bus: Callable[..., Bus]):
+    """A request that times out is cancelled on the target: skipped if still
+    queued (its lane slot freed at once), its token set if running."""
+    src_bus = create_bus("tcp://127.0.0.1:15320")
+    dst_bus = create_bus("tcp://127.0.0.1:15321", lane_queue_size=1)
+
+    release = threading.Event()
+    executed: list[str] = []
+    tokens: list[CancelToken] = []
+
+    @lock
+    def hold() -> None:
+        executed.append("hold")
+        release.wait(10)
+
+    @lock
+    def later() -> None:
+        executed.append("later")
+
+    def poll() -> bool:
+        token = cancel_token()
+        tokens.append(token)
+        # a long operation, checking in between steps
+        while not token.wait(0.01):
+            pass
+        executed.append("poll cancelled")
+        return False
+
+    def get_location() -> str:
+        return f"{dst_bus.url.bus}/Locked/0"
+
+    methods = {"hold": hold, "later": later, "poll": poll}
+    methods["get_location"] = get_location
+    dst_bus.resolve_request = lambda object, method: ("/Locked/0", methods[method])
+
+    pool = ThreadPoolExecutor()
+    futures = [pool.submit(b.run_forever) for b in (src_bus, dst_bus)]
+    for b in (src_bus, dst_bus):
+        assert b._bus_started.wait(5)
+
+    src, dst = f"{src_bus.url.bus}/Proxy/0", f"{dst_bus.url.bus}/Locked/0"
+    assert src_bus.ping(src=src, dst=dst).ok
+
+    held = src_bus.request_future(src=src, dst=dst, method="hold")
+    while executed != ["hold"]:
+        time.sleep(0.01)
+
+    # fills the only lane slot, then gives up
+    with pytest.raises(RequestTimeoutException):
+        src_bus.request(src=src, dst=dst, method="later", timeout=0.2)
+    deadline = time.monotonic() + 5
+    while dst_bus._queued:
+        assert time.monotonic() < deadline, "Cancel never reached the peer"
+        time.sleep(0.01)
+    assert dst_bus.stats()["lanes"][0]["queued"] == 0
+    # the slot is free again, though the stale entry still sits in the queue
+    queued = src_bus.request_future(src=src, dst=dst, method="later")
+
+    release.set()
+    assert held.result(timeout=5).code == 200
+    assert queued.result(timeout=5).code == 200
+    assert executed == ["hold", "later"]
+
+    # running: by its caller's timeout the method sees its token cancelled
+    # (the deadline passed, a Cancel is on its way) and returns early; the
+    # reply may even beat the caller's own timeout
+    with contextlib.suppress(RequestTimeoutException):
+        src_bus.request(src=src, dst=dst, method="poll", timeout=0.2)
+    deadline = time.monotonic() + 5
+    while executed[-1] != "poll cancelled" or dst_bus._running_requests:
+        assert time.monotonic() < deadline, "running request never cancelled"
+        time.sleep(0.01)
+    assert tokens[0].deadline is not None
+
+    running = src_bus.request_future(src=src, dst=dst, method="poll")
+    while len(tokens) < 2:
+        time.sleep(0.01)
+    assert tokens[1].deadline is None and not tokens[1].cancelled
+    assert running.cancel()
+    assert tokens[1].wait(5)
+    assert tokens[1].cancelled
+
+    for b in (src_bus, dst_bus):
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+
+def test_request_deadline(create_bus: Callable[..., Bus]):
+    """Requests carry the time left to their deadline: their own timeout's,
+    or the sooner one of the request they are made for. The target counts
+    it down on its own clock; past it, a queued request is answered with
+    504 instead of run."""
+    src_bus = create_bus("tcp://127.0.0.1:15322")
+    dst_bus = create_bus("tcp://127.0.0.1:15323")
+
+    deadlines: list[int | None] = []
+
+    def get_deadline() -> int | None:
+        deadlines.append(cancel_token().deadline)
+        return cancel_token().deadline
+
+    def get_location() -> str:
+        return f"{dst_bus.url.bus}/Clock/0"
+
+    methods = {"get_deadline": get_deadline, "get_location": get_location}
+    dst_bus.resolve_request = lambda object, method: ("/Clock/0", methods[method])
+
+    pool = ThreadPoolExecutor()
+    futures = [pool.submit(b.run_forever) for b in (src_bus, dst_bus)]
+
+    src, dst = f"{src_bus.url.bus}/Proxy/0", f"{dst_bus.url.bus}/Clock/0"
+    assert src_bus.request(src=src, dst=dst, method="get_deadline").result is None
+
+    before = time.monotonic_ns()
+    response = src_bus.request(src=src, dst=dst, method="get_deadline", timeout=5)
+    assert before + 5e9 <= response.result <= time.monotonic_ns() + 5e9
+
+    # a call made on behalf of a request inherits its deadline, if sooner
+    # (later by the time in transit, which the budget does not count)
+    soon = time.monotonic_ns() + 1_000_000_000
+    with use_cancel_token(CancelToken(soon)):
+        response = src_bus.request(src=src, dst=dst, method="get_deadline", timeout=60)
+        assert soon <= response.result < soon + 500_000_000
+
+        # ... and past it, nothing runs
+        expired = CancelToken(time.monotonic_ns() - 1)
+        with use_cancel_token(expired):
+            response = src_bus.request(src=src, dst=dst, method="get_deadline")
+    assert response.code == 504
+    assert "deadline expired" in response.error
+    assert len(deadlines) == 3
+
+    proxy = Proxy(dst, src_bus)
+    with use_cancel_token(CancelToken(time.monotonic_ns() - 1)):
+        with pytest.raises(RequestTimeoutException, match="deadline expired"):
+            proxy.get_deadline()
+
+    for b in (src_bus, dst_bus):
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+
+def test_request_future_fails_on_dead_bus(create_bus: Callable[..., Bus]):
+    bus = create_bus("tcp://127.0.0.1:15142")
+    bus.shutdown()
+
+    future = bus.request_future(
+        src=f"{bus.url.bus}/Proxy/0", dst=f"{bus.url.bus}/X/0", method="x"
+    )
+    with pytest.raises(BusDeadException):
+        future.result(timeout=1)
+
+
+#
+# same-host transports: inproc within a process, ipc within a host
+#
+
+
+def test_local_transport_selected(create_bus: Callable[..., Bus]):
+    """Peers are dialed over the fastest shortcut they listen on, while the
+    tcp url stays their identity on the wire."""
+    src_bus = create_bus("tcp://127.0.0.1:15150")
+    dst_buses = {
+        "inproc": create_bus("tcp://127.0.0.1:15151"),
+        "ipc": create_bus("tcp://127.0.0.1:15152", local_transports=["ipc"]),
+        "tcp": create_bus("tcp://127.0.0.1:15153", local_transports=[]),
+    }
+
+    pool = ThreadPoolExecutor()
+    futures = [pool.submit(b.run_forever) for b in (src_bus, *dst_buses.values())]
+
+    src = f"{src_bus.url.bus}/Proxy/0"
+    for transport, dst_bus in dst_buses.items():
+        # nothing to resolve there: any pong proves the round trip
+        pong = src_bus.ping(src=src, dst=f"{dst_bus.url.bus}/Bus/0")
+        assert pong is not None
+        assert pong.src == f"{dst_bus.url.bus}/Bus/0"
+        assert src_bus.stats()["transports"][dst_bus.url.bus] == transport
+
+    for b in (src_bus, *dst_buses.values()):
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+
+def test_local_transport_falls_back_to_tcp():
+    # a stale ipc file left by a crashed bus: refused, tcp still works
+    ipc = create_listener("tcp://127.0.0.1:15154", ["ipc"]).aliases[0]
+    open(ipc.removeprefix("ipc://"), "w").close()
+
+    listener = create_listener("tcp://127.0.0.1:15154", [])
+    listener.bind()
+    sender = create_transport("tcp://127.0.0.1:15154")
+    try:
+        sender.connect()
+        assert sender.address == "tcp://127.0.0.1:15154"
+    finally:
+        sender.close()
+        listener.close()
+        os.unlink(ipc.removeprefix("ipc://"))
+
+
+def test_ipc_sockets_in_private_dir(tmp_path, monkeypatch):
+    """ipc sockets go to a directory only their user can enter; one anybody
+    else could write to is not used."""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+
+    listener = create_listener("tcp://127.0.0.1:15331", ["ipc"])
+    assert listener.aliases == [f"ipc://{tmp_path}/chimera/127.0.0.1-15331.ipc"]
+    assert (tmp_path / "chimera").stat().st_mode & 0o777 == 0o700
+
+    (tmp_path / "chimera").chmod(0o777)
+    assert create_listener("tcp://127.0.0.1:15331", ["ipc"]).aliases == []
+
+
+def test_transport_bench(create_bus: Callable[..., Bus]):
+    """Round-trip latency (sequential requests) and throughput (pipelined
+    requests) between two buses of this process, per transport."""
+    print()
+
+    def echo(x: int) -> int:
+        return x
+
+    for port, transport, local_transports in (
+        (15155, "tcp", []),
+        (15157, "ipc", ["ipc"]),
+        (15159, "inproc", ["inproc"]),
+    ):
+        # both ways: replies travel over the same kind of transport
+        src_bus = create_bus(
+            f"tcp://127.0.0.1:{port}", local_transports=local_transports
+        )
+        dst_bus = create_bus(
+            f"tcp://127.0.0.1:{port + 1}", local_transports=local_transports
+        )
+        dst_bus.resolve_request = lambda object, method: ("/Echo/0", echo)
+
+        pool = ThreadPoolExecutor()
+        futures = [pool.submit(b.run_forever) for b in (src_bus, dst_bus)]
+
+        src, dst = f"{src_bus.url.bus}/Proxy/0", f"{dst_bus.url.bus}/Echo/0"
+        assert src_bus.request(src=src, dst=dst, method="echo", args=[0]).code == 200
+        assert src_bus.stats()["transports"][dst_bus.url.bus] == transport
+
+        n = 2000
+        t0 = time.monotonic()
+        for i in range(n):
+            src_bus.request(src=src, dst=dst, method="echo", args=[i])
+        print_results(f"{transport}-latency", n, time.monotonic() - t0)
+
+        size = 50
+        t0 = time.monotonic()
+        for _ in range(n // size):
+            src_bus.request_many(
+                src=src, calls=[Call(dst, "echo", [i]) for i in range(size)]
+            )
+        print_results(f"{transport}-throughput", n, time.monotonic() - t0)
+
+        for b in (src_bus, dst_bus):
+            b.shutdown()
+        for future in futures:
+            future.result()
+        pool.shutdown()
+
+
+#
+# streamed transfers: offer() a payload, pull() it in flow-controlled chunks
+#
+
+
+def test_stream_pull(create_bus: Callable[..., Bus]):
+    """A frame offered by a method reaches a remote consumer intact, and the
+    producer forgets it once pulled."""
+    src_bus = create_bus("tcp://127.0.0.1:15170")
+    dst_bus = create_bus("tcp://127.0.0.1:15171")
+
+    frame = np.random.default_rng(42).integers(0, 65535, (512, 768), dtype=np.uint16)
+
+    def get_frame() -> dict[str, Any]:
+        return dst_bus.offer(
+            frame,
+            meta={"dtype": str(frame.dtype), "shape": frame.shape},
+            chunk_size=64 * 1024,
+        )
+
+    def resolve_request(object: str, method: str):
+        if object == "/Camera/0" and method == "get_frame":
+            return "/Camera/0", get_frame
+        return None, None
+
+    dst_bus.resolve_request = resolve_request
+
+    pool = ThreadPoolExecutor()
+    futures = [pool.submit(b.run_forever) for b in (src_bus, dst_bus)]
+
+    src, dst = f"{src_bus.url.bus}/Guider/0", f"{dst_bus.url.bus}/Camera/0"
+    handle = src_bus.request(src=src, dst=dst, method="get_frame").result
+    assert handle["size"] == frame.nbytes
+
+    data = b"".join(src_bus.pull(handle, src=src))
+    pixels = np.frombuffer(data, dtype=handle["meta"]["dtype"])
+    assert np.array_equal(pixels.reshape(handle["meta"]["shape"]), frame)
+
+    assert dst_bus.stats()["streams"] == []
+    assert not src_bus._mailboxes._boxes
+
+    # a stream is pulled once
+    with pytest.raises(StreamException, match="no stream"):
+        list(src_bus.pull(handle, src=src))
+
+    for b in (src_bus, dst_bus):
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+
+def test_stream_window_and_abort(create_bus: Callable[..., Bus]):
+    """A slow consumer bounds what the producer sends; pings still get
+    through mid-transfer, and leaving the loop early frees the producer."""
+    src_bus = create_bus("tcp://127.0.0.1:15172")
+    dst_bus = create_bus("tcp://127.0.0.1:15173")
+
+    pool = ThreadPoolExecutor()
+    futures = [pool.submit(b.run_forever) for b in (src_bus, dst_bus)]
+
+    chunk_size, window = 1024, 4
+    handle = dst_bus.offer(bytes(100 * chunk_size), chunk_size=chunk_size)
+    stream = dst_bus._streams[handle["stream"]]
+
+    src = f"{src_bus.url.bus}/Guider/0"
+    received = 0
+    for chunk in src_bus.pull(handle, src=src, window=window):
+        received += len(chunk)
+        time.sleep(0.01)
+        # never more than a window ahead of the consumer
+        assert stream.sent - received <= window * chunk_size
+
+        t0 = time.monotonic()
+        pong = src_bus.ping(src=src, dst=f"{dst_bus.url.bus}/Bus/0")
+        assert pong is not None
+        assert time.monotonic() - t0 < 0.5
+
+        if received >= 20 * chunk_size:
+            break
+
+    deadline = time.monotonic() + 5
+    while dst_bus._streams:
+        assert time.monotonic() < deadline, "abort never reached the producer"
+        time.sleep(0.01)
+    assert stream.sent < 30 * chunk_size
+
+    for b in (src_bus, dst_bus):
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+
+def test_stream_expires(create_bus: Callable[..., Bus]):
+    bus = create_bus("tcp://127.0.0.1:15174", stream_idle_timeout=0.0)
+    bus.offer(b"never pulled")
+    bus._expire_streams()
+    assert bus.stats()["streams"] == []
+
+
+def test_stream_bench(create_bus: Callable[..., Bus]):
+    """Pulling a 32 MB frame between two buses of this process."""
+    print()
+    src_bus = create_bus("tcp://127.0.0.1:15175", local_transports=[])
+    dst_bus = create_bus("tcp://127.0.0.1:15176", local_transports=[])
+
+    pool = ThreadPoolExecutor()
+    futures = [pool.submit(b.run_forever) for b in (src_bus, dst_bus)]
+
+    frame = np.zeros((4096, 4096), dtype=np.uint16)
+    src = f"{src_bus.url.bus}/Viewer/0"
+    for window in (1, 8, 32):
+        handle = dst_bus.offer(frame)
+        t0 = time.monotonic()
+        size = sum(len(chunk) for chunk in src_bus.pull(handle, src=src, window=window))
+        dt = time.monotonic() - t0
+        assert size == frame.nbytes
+        print(f"stream window={window:<3} {size / dt / 1e6:.0f} MB/s ({dt:.3f}s)")
+
+    for b in (src_bus, dst_bus):
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+
+#
+# publish fan-out: routes kept per EventId, payload encoded once
+#
+
+
+def test_fanout_routes_follow_subscriptions(create_bus: Callable[..., Bus]):
+    bus = create_bus("tcp://127.0.0.1:15180")
+    pub = f"{bus.url.bus}/Dome/0"
+    bus_a, bus_b = "tcp://127.0.0.1:15998", "tcp://127.0.0.1:15999"
+
+    def subscribe(sub_bus: str, token: int) -> None:
+        bus._handle_subscribe(
+            Protocol.subscribe(
+                sub=f"{sub_bus}/Proxy/0", pub=pub, event="slew", callback=token
+            )
+        )
+
+    def unsubscribe(sub_bus: str, token: int) -> None:
+        bus._handle_unsubscribe(
+            Protocol.unsubscribe(
+                sub=f"{sub_bus}/Proxy/0", pub=pub, event="slew", callback=token
+            )
+        )
+
+    event_id = EventId(pub, "slew")
+    subscribe(bus_a, 1)
+    subscribe(bus_a, 2)
+    subscribe(bus_a, 2)  # duplicate: no second route entry
+    subscribe(bus_b, 3)
+    assert bus._fanout[event_id].buses == (bus_a, bus_b)
+
+    unsubscribe(bus_a, 1)
+    unsubscribe(bus_a, 1)  # unknown: must not drop bus_a's other one
+    assert bus._fanout[event_id].buses == (bus_a, bus_b)
+    unsubscribe(bus_a, 2)
+    assert bus._fanout[event_id].buses == (bus_b,)
+
+    bus._cleanup_dead_subscribers(bus_b)
+    assert event_id not in bus._fanout
+
+
+def test_publish_reaches_every_codec(create_bus: Callable[..., Bus]):
+    """One publish, subscribers speaking different codecs: each gets the
+    event, including payloads only json can carry."""
+    pub_bus = create_bus("tcp://127.0.0.1:15181")
+    msgpack_bus = create_bus("tcp://127.0.0.1:15182")
+    json_bus = create_bus("tcp://127.0.0.1:15183", codec="json")
+    buses = (pub_bus, msgpack_bus, json_bus)
+
+    pool = ThreadPoolExecutor()
+    futures = [pool.submit(b.run_forever) for b in buses]
+
+    pub = f"{pub_bus.url.bus}/Dome/0"
+    received: dict[str, list[Any]] = {}
+    done = threading.Barrier(3, timeout=5)
+
+    for sub_bus in (msgpack_bus, json_bus):
+
+        def on_slew(position: Any, *, bus: str = sub_bus.url.bus) -> None:
+            received.setdefault(bus, []).append(position)
+            done.wait()
+
+        sub = f"{sub_bus.url.bus}/Proxy/0"
+        assert sub_bus.ping(src=sub, dst=pub) is not None
+        sub_bus.subscribe(sub=sub, pub=pub, event="slew", callback=on_slew)
+
+    deadline = time.monotonic() + 5
+    while len(pub_bus._fanout.get(EventId(pub, "slew"), _FanOut()).buses) < 2:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert pub_bus.stats()["codecs"] == {
+        msgpack_bus.url.bus: "msgpack",
+        json_bus.url.bus: "json",
+    }
+
+    # 2**70 does not fit msgpack: that bus gets json for this event
+    for position in ({"az": 42.0}, {"az": 2**70}):
+        pub_bus.publish(pub=pub, event="slew", args=[position])
+        done.wait()
+
+    assert received == {
+        msgpack_bus.url.bus: [{"az": 42.0}, {"az": 2**70}],
+        json_bus.url.bus: [{"az": 42.0}, {"az": 2**70}],
+    }
+
+    for b in buses:
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+
+def test_publish_fanout_bench(create_bus: Callable[..., Bus]):
+    """Cost of fanning one status event (100 sensors) out to 1, 10 and 100
+    subscriber buses, publisher side only: routing, encoding and send."""
+    print()
+    pub_bus = create_bus("tcp://127.0.0.1:15184")
+    pub = f"{pub_bus.url.bus}/Telescope/0"
+
+    pool = ThreadPoolExecutor(max_workers=128)
+    futures = [pool.submit(pub_bus.run_forever)]
+
+    status = {f"sensor_{i}": 20.0 + i / 7 for i in range(100)}
+    publish = Protocol.publish(pub=pub, event="status", args=[status], kwargs={})
+
+    sub_buses: list[Bus] = []
+    for n in (1, 10, 100):
+        while len(sub_buses) < n:
+            sub_bus = create_bus(
+                f"tcp://127.0.0.1:{15200 + len(sub_buses)}",
+                handler_pool_size=1,
+                control_pool_size=1,
+            )
+            futures.append(pool.submit(sub_bus.run_forever))
+            assert sub_bus._bus_started.wait(5)
+            sub = f"{sub_bus.url.bus}/Proxy/0"
+            assert sub_bus.ping(src=sub, dst=pub) is not None
+            pub_bus._handle_subscribe(
+                Protocol.subscribe(sub=sub, pub=pub, event="status", callback=1)
+            )
+            sub_buses.append(sub_bus)
+
+        # dial the new peers outside the measurement
+        pub_bus._handle_publish(publish)
+
+        # CPU time of the publishing thread: the subscriber buses share this
+        # process (and its GIL) and would drown the numbers in wall time
+        rounds = 5000 // n
+        t0 = time.thread_time()
+        for _ in range(rounds):
+            pub_bus._handle_publish(publish)
+        print_results(f"publish-fanout-{n}", rounds, time.thread_time() - t0)
+
+    for b in (pub_bus, *sub_buses):
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+
+#
+# per-peer send queues: backpressure never stalls the sender
+#
+
+
+class GatedTransport(AlwaysAgainTransport):
+    """Backpressure until the gate opens, then takes everything, in order."""
+
+    def __init__(self, url: str):
+        super().__init__(url)
+        self.gate = threading.Event()
+        self.sent: list[bytes] = []
+
+    def send(self, data: bytes) -> SendResult:
+        self.send_count += 1
+        if not self.gate.is_set():
+            return SendResult.AGAIN
+        self.sent.append(data)
+        return SendResult.OK
+
+
+def test_send_queue_absorbs_backpressure(create_bus: Callable[..., Bus]):
+    """A backed-up socket queues frames for the peer's writer: the sender
+    returns at once and the frames go out in order once it drains."""
+    bus = create_bus("tcp://127.0.0.1:15190")
+    peer_url = "tcp://127.0.0.1:15191"
+    fake = GatedTransport(peer_url)
+    bus._peers[peer_url] = _Peer(fake)
+
+    requests = [
+        Protocol.request(src=f"{bus.url.bus}/Proxy/0", dst=f"{peer_url}/X/0", method=m)
+        for m in ("a", "b", "c")
+    ]
+    t0 = time.monotonic()
+    assert [bus._push(request) for request in requests] == [PushResult.QUEUED] * 3
+    # no sleeping under the peer lock anymore
+    assert time.monotonic() - t0 < 0.05
+    assert bus.stats()["send_queues"][peer_url]["depth"] == 3
+
+    fake.gate.set()
+    deadline = time.monotonic() + 5
+    while len(fake.sent) < 3:
+        assert time.monotonic() < deadline, "writer never drained the queue"
+        time.sleep(0.01)
+
+    assert [decode_message(data).method for data in fake.sent] == ["a", "b", "c"]
+    assert bus.stats()["send_queues"][peer_url] == {
+        "depth": 0,
+        "queued": 3,
+        "dropped": 0,
+        "conflated": 0,
+    }
+
+    # drained: straight to the socket again
+    assert bus._push(requests[0]) is PushResult.OK
+
+
+def test_send_queue_policies(create_bus: Callable[..., Bus]):
+    """With the queue full: pings are dropped, telemetry replaces its
+    queued sample, replies wait for room and fail only when the peer goes."""
+    bus = create_bus("tcp://127.0.0.1:15192", send_queue_size=2)
+    peer_url = "tcp://127.0.0.1:15193"
+    bus._peers[peer_url] = _Peer(AlwaysAgainTransport(peer_url))
+
+    pub = f"{bus.url.bus}/Weather/0"
+    publish = Protocol.publish(pub=pub, event="temperature", args=[1], kwargs={})
+
+    def temperature(value: float) -> Event:
+        return publish.callback(
+            dst=peer_url, event="temperature", args=[value], kwargs={}
+        )
+
+    assert bus._push(temperature(20.0)) is PushResult.QUEUED
+    assert bus._push(temperature(20.5)) is PushResult.QUEUED
+    # full: the newest queued sample is replaced, nothing else moves
+    assert bus._push(temperature(21.0)) is PushResult.QUEUED
+    peer = bus._peers[peer_url]
+    assert [decode_message(o.data).args for o in peer.pending] == [[20.0], [21.0]]
+
+    ping = Protocol.ping(src=f"{bus.url.bus}/Bus/0", dst=f"{peer_url}/Bus/0")
+    assert bus._push(ping) is PushResult.DROPPED
+
+    request = Protocol.request(src=f"{peer_url}/Proxy/0", dst=pub, method="x")
+    reply = ThreadPoolExecutor(max_workers=1)
+    blocked = reply.submit(bus._push, request.ok(42))
+    time.sleep(0.1)
+    assert not blocked.done()
+
+    bus._evict_peer(peer_url)
+    assert blocked.result(timeout=5) is PushResult.SEND_DEAD
+    reply.shutdown()
+
+    assert (peer.dropped, peer.conflated) == (1, 1)
+
+
+def test_blocked_send_gives_up(create_bus: Callable[..., Bus]):
+    """A sender waiting for room in a wedged peer's queue gives up after
+    send_timeout, or sooner when its request's budget runs out."""
+    bus = create_bus("tcp://127.0.0.1:15328", send_queue_size=1, send_timeout=0.5)
+    peer_url = "tcp://127.0.0.1:15329"
+    bus._peers[peer_url] = _Peer(AlwaysAgainTransport(peer_url))
+
+    pub = f"{bus.url.bus}/Weather/0"
+    request = Protocol.request(src=f"{peer_url}/Proxy/0", dst=pub, method="x")
+    assert bus._push(request.ok(1)) is PushResult.QUEUED
+
+    t0 = time.monotonic()
+    assert bus._push(request.ok(2)) is PushResult.SEND_DEAD
+    assert 0.5 <= time.monotonic() - t0 < 2
+
+    hurried = Protocol.request(
+        src=pub, dst=f"{peer_url}/Clock/0", method="x", budget=100_000_000
+    )
+    t0 = time.monotonic()
+    assert bus._push(hurried) is PushResult.SEND_DEAD
+    assert time.monotonic() - t0 < 0.4
+
+    assert bus._peers[peer_url].dropped == 2
+
+
+def test_arequest_never_blocks_the_loop(create_bus: Callable[..., Bus]):
+    """A request to a peer with a full send queue waits for room on a worker
+    thread: the event loop keeps running meanwhile."""
+    bus = create_bus("tcp://127.0.0.1:15334", send_queue_size=1, send_timeout=0.5)
+    peer_url = "tcp://127.0.0.1:15335"
+    bus._peers[peer_url] = _Peer(AlwaysAgainTransport(peer_url))
+
+    src = f"{bus.url.bus}/Proxy/0"
+    filler = Protocol.request(src=f"{peer_url}/Proxy/0", dst=src, method="x")
+    assert bus._push(filler.ok(1)) is PushResult.QUEUED
+
+    async def main() -> int:
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        with pytest.raises(BusDeadException):
+            await bus.arequest(src=src, dst=f"{peer_url}/Clock/0", method="x")
+        ticker.cancel()
+        return ticks
+
+    assert asyncio.run(main()) >= 20
+
+
+def test_conflation_keeps_subscriptions_apart(create_bus: Callable[..., Bus]):
+    """A sample for some subscriptions only never replaces one queued for
+    others: each gets the newest of its own samples."""
+    bus = create_bus("tcp://127.0.0.1:15326", send_queue_size=2)
+    peer_url = "tcp://127.0.0.1:15327"
+    bus._peers[peer_url] = _Peer(AlwaysAgainTransport(peer_url))
+
+    pub = f"{bus.url.bus}/Weather/0"
+    publish = Protocol.publish(pub=pub, event="temperature", args=[1], kwargs={})
+
+    def temperature(value: float, callbacks: list[int] | None) -> Event:
+        event = publish.callback(
+            dst=peer_url, event="temperature", args=[value], kwargs={}
+        )
+        return msgspec.structs.replace(event, callbacks=callbacks)
+
+    assert bus._push(temperature(20.0, None)) is PushResult.QUEUED
+    assert bus._push(temperature(20.5, [7])) is PushResult.QUEUED
+    assert bus._push(temperature(21.0, [7])) is PushResult.QUEUED
+    assert bus._push(temperature(21.5, None)) is PushResult.QUEUED
+
+    peer = bus._peers[peer_url]
+    assert [
+        (decode_message(o.data).args, decode_message(o.data).callbacks)
+        for o in peer.pending
+    ] == [([21.5], None), ([21.0], [7])]
+    assert (peer.dropped, peer.conflated) == (0, 2)
+
+
+def test_idle_peers_reaped_and_redialed(create_bus: Callable[..., Bus]):
+    src_bus = create_bus("tcp://127.0.0.1:15300", peer_idle_timeout=0)
+    dst_bus = create_bus("tcp://127.0.0.1:15301")
+
+    pool = ThreadPoolExecutor()
+    futures = [pool.submit(b.run_forever) for b in (src_bus, dst_bus)]
+
+    src = f"{src_bus.url.bus}/Proxy/0"
+    dst = f"{dst_bus.url.bus}/Bus/0"
+    assert src_bus.ping(src=src, dst=dst) is not None
+    assert dst_bus.url.bus in src_bus._peers
+
+    src_bus._reap_idle_peers()
+    assert dst_bus.url.bus not in src_bus._peers
+    assert dst_bus.url.bus not in src_bus._negotiated_peers
+
+    # the next message simply dials again
+    assert src_bus.ping(src=src, dst=dst) is not None
+    assert dst_bus.url.bus in src_bus._peers
+
+    for b in (src_bus, dst_bus):
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+
+def test_max_peers_closes_least_recently_used(create_bus: Callable[..., Bus]):
+    src_bus = create_bus("tcp://127.0.0.1:15302", max_peers=2)
+    dst_buses = [
+        create_bus(f"tcp://127.0.0.1:{port}") for port in (15303, 15304, 15305)
+    ]
+
+    pool = ThreadPoolExecutor()
+    futures = [pool.submit(b.run_forever) for b in (src_bus, *dst_buses)]
+
+    src = f"{src_bus.url.bus}/Proxy/0"
+    for dst_bus in dst_buses:
+        assert src_bus.ping(src=src, dst=f"{dst_bus.url.bus}/Bus/0") is not None
+
+    assert set(src_bus._peers) == {dst_buses[1].url.bus, dst_buses[2].url.bus}
+    # closing a link is not evicting the peer: it stays negotiated
+    assert dst_buses[0].url.bus in src_bus._negotiated_peers
+
+    for b in (src_bus, *dst_buses):
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+
+def test_dial_connects_ahead_and_keeps_peer(create_bus: Callable[..., Bus]):
+    src_bus = create_bus("tcp://127.0.0.1:15306", peer_idle_timeout=0)
+    dst_bus = create_bus("tcp://127.0.0.1:15307")
+
+    pool = ThreadPoolExecutor()
+    futures = [pool.submit(b.run_forever) for b in (src_bus, dst_bus)]
+
+    src_bus.dial(["127.0.0.1:15307"])
+    deadline = time.monotonic() + 5
+    while dst_bus.url.bus not in src_bus._negotiated_peers:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    src_bus._reap_idle_peers()
+    assert dst_bus.url.bus in src_bus._peers
+
+    for b in (src_bus, dst_bus):
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+
+#
+# server-side subscription filters
+#
+
+
+def test_event_filter_semantics():
+    where = _EventFilter(Filter(where=[(0, ">", 5), ("unit", "in", ["C", "K"])]))
+    assert where.accept([6], {"unit": "C"})
+    assert not where.accept([5], {"unit": "C"})
+    assert not where.accept([6], {"unit": "F"})
+    assert not where.accept([6], {})  # missing: fails
+    assert not where.accept(["hot"], {"unit": "C"})  # not comparable: fails
+
+    deadband = _EventFilter(Filter(deadband=[(0, 1.0), ("state", 0)]))
+    assert deadband.accept([20.0], {"state": "ok"})  # the first one passes
+    assert not deadband.accept([20.6], {"state": "ok"})
+    # measured from the last delivered value: the drift adds up
+    assert deadband.accept([21.2], {"state": "ok"})
+    assert deadband.accept([21.2], {"state": "alarm"})
+
+    throttle = _EventFilter(Filter(max_rate=10))
+    assert throttle.accept([], {})
+    assert not throttle.accept([], {})
+    time.sleep(0.11)
+    assert throttle.accept([], {})
+
+
+def test_filtered_subscriptions(create_bus: Callable[..., Bus]):
+    """Filters run at the publisher: per subscription even when several share
+    a bus, and a bus with no taker gets nothing at all."""
+    pub_bus = create_bus("tcp://127.0.0.1:15310")
+    sub_bus = create_bus("tcp://127.0.0.1:15311")
+    quiet_bus = create_bus("tcp://127.0.0.1:15312")
+
+    pool = ThreadPoolExecutor()
+    futures = [pool.submit(b.run_forever) for b in (pub_bus, sub_bus, quiet_bus)]
+
+    pub = f"{pub_bus.url.bus}/Weather/0"
+    received: dict[str, list[float]] = {"all": [], "hot": [], "never": []}
+    done = threading.Event()
+
+    def on_all(value: float) -> None:
+        received["all"].append(value)
+        if len(received["all"]) == 10:
+            done.set()
+
+    def on_hot(value: float) -> None:
+        received["hot"].append(value)
+
+    def on_never(value: float) -> None:
+        received["never"].append(value)
+
+    sub = f"{sub_bus.url.bus}/Proxy/0"
+    sub_bus.subscribe(sub=sub, pub=pub, event="temperature", callback=on_all)
+    sub_bus.subscribe(
+        sub=sub,
+        pub=pub,
+        event="temperature",
+        callback=on_hot,
+        filter=Filter(where=[(0, ">=", 25)]),
+    )
+    quiet_bus.subscribe(
+        sub=f"{quiet_bus.url.bus}/Proxy/0",
+        pub=pub,
+        event="temperature",
+        callback=on_never,
+        filter=Filter(where=[(0, ">", 100)]),
+    )
+    with pytest.raises(ValueError, match="unknown filter operator"):
+        sub_bus.subscribe(
+            sub=sub,
+            pub=pub,
+            event="temperature",
+            callback=on_never,
+            filter=Filter(where=[(0, "~", 1)]),
+        )
+
+    deadline = time.monotonic() + 5
+    while len(pub_bus.subscribers(EventId(pub, "temperature"))) < 3:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    sent: list[str] = []
+    send = pub_bus._send
+
+    def spy(dst_bus: str, data: bytes, message: Any) -> PushResult:
+        sent.append(dst_bus)
+        return send(dst_bus, data, message)
+
+    pub_bus._send = spy  # type: ignore[method-assign]
+
+    for value in range(20, 30):
+        pub_bus.publish(pub=pub, event="temperature", args=[float(value)])
+
+    assert done.wait(5)
+    time.sleep(0.2)
+    assert sorted(received["all"]) == [float(v) for v in range(20, 30)]
+    assert sorted(received["hot"]) == [float(v) for v in range(25, 30)]
+    assert received["never"] == []
+    assert quiet_bus.url.bus not in sent
+
+    for b in (pub_bus, sub_bus, quiet_bus):
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+
+def test_bus_metrics(create_bus: Callable[..., Bus]):
+    """Requests are timed per (object, method), split into wait and run;
+    messages, wire bytes, codec time and event fan-out are counted."""
+    server = create_bus("tcp://127.0.0.1:15315")
+    client = create_bus("tcp://127.0.0.1:15316")
+
+    def get_az() -> float:
+        time.sleep(0.002)
+        return 42.0
+
+    @lock
+    def park() -> None:
+        pass
+
+    def boom() -> None:
+        raise ValueError("boom")
+
+    methods = {"get_az": get_az, "park": park, "boom": boom}
+    server.resolve_request = lambda object, method: (  # type: ignore[method-assign]
+        "/FakeTelescope/fake",
+        methods.get(method),
+    )
+
+    pool = ThreadPoolExecutor()
+    futures = [pool.submit(b.run_forever) for b in (server, client)]
+
+    src = f"{client.url.bus}/Proxy/0"
+    dst = f"{server.url.bus}/Telescope/0"
+    for _ in range(5):
+        response = client.request(src=src, dst=dst, method="get_az")
+        assert response is not None and response.result == 42.0
+    client.request(src=src, dst=dst, method="park")
+    response = client.request(src=src, dst=dst, method="boom")
+    assert response is not None and response.error
+
+    received: list[int] = []
+    pub = f"{server.url.bus}/FakeTelescope/fake"
+    client.subscribe(sub=src, pub=pub, event="slew_begin", callback=received.append)
+    deadline = time.monotonic() + 5
+    while not server.subscribers(EventId(pub, "slew_begin")):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    server.publish(pub=pub, event="slew_begin", args=[1])
+    server.publish(pub=pub, event="slew_complete", args=[1])
+    deadline = time.monotonic() + 5
+    while not received:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    metrics = server.stats()["metrics"]
+    requests = {entry["method"]: entry for entry in metrics["requests"]}
+    assert {entry["object"] for entry in metrics["requests"]} == {"/FakeTelescope/fake"}
+    assert requests["get_az"]["run"]["count"] == 5
+    assert requests["get_az"]["run"]["sum"] >= 5 * 0.002
+    assert requests["get_az"]["queue"]["count"] == 5
+    assert requests["get_az"]["errors"] == 0
+    # @lock methods go through their lane, and are timed all the same
+    assert requests["park"]["run"]["count"] == 1
+    assert requests["boom"]["errors"] == 1
+    assert metrics["received"]["Request"] == 7
+    assert metrics["sent"]["Response"] == 7
+    assert metrics["bytes_in"][client.url.bus] > 0
+    assert metrics["decode"]["count"] >= 7
+    events = {entry["event"]: entry for entry in metrics["events"]}
+    assert events["slew_begin"]["published"] == 1
+    assert events["slew_begin"]["deliveries"] == 1
+    assert events["slew_complete"]["deliveries"] == 0
+
+    metrics = client.stats()["metrics"]
+    assert metrics["sent"]["Request"] == 7
+    assert metrics["received"]["Response"] == 7
+    assert metrics["received"]["Event"] == 1
+    assert metrics["bytes_out"][server.url.bus] > 0
+    assert metrics["encode"]["count"] >= 7
+    # the whole snapshot travels in a Response
+    assert msgspec.json.decode(msgspec.json.encode(metrics)) == metrics
+
+    for b in (server, client):
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+
+def test_request_tracing(create_bus: Callable[..., Bus]):
+    """A request made inside a span carries its trace, and so do the calls
+    its handler makes on to other buses; each bus records its own phases.
+    Untraced requests record nothing."""
+    client = create_bus("tcp://127.0.0.1:15317")
+    relay = create_bus("tcp://127.0.0.1:15318")
+    server = create_bus("tcp://127.0.0.1:15319")
+
+    def get_az() -> float:
+        return 42.0
+
+    def relay_az() -> float:
+        response = relay.request(
+            src=f"{relay.url.bus}/Proxy/0",
+            dst=f"{server.url.bus}/Telescope/0",
+            method="get_az",
+        )
+        assert response is not None
+        return response.result
+
+    relay.resolve_request = lambda object, method: (  # type: ignore[method-assign]
+        "/Relay/0",
+        relay_az if method == "relay_az" else None,
+    )
+    server.resolve_request = lambda object, method: (  # type: ignore[method-assign]
+        "/Telescope/0",
+        get_az if method == "get_az" else None,
+    )
+
+    pool = ThreadPoolExecutor()
+    futures = [pool.submit(b.run_forever) for b in (client, relay, server)]
+
+    src = f"{client.url.bus}/Proxy/0"
+    dst = f"{relay.url.bus}/Relay/0"
+    response = client.request(src=src, dst=dst, method="relay_az")
+    assert response is not None and response.result == 42.0
+    for b in (client, relay, server):
+        assert b.tracer.dump()["traceEvents"][1:] == []
+
+    with span(client.tracer, "root") as root:
+        response = client.request(src=src, dst=dst, method="relay_az")
+    assert response is not None and response.result == 42.0
+
+    def spans(b: Bus, n: int) -> dict[str, dict[str, Any]]:
+        # a bus records its side after replying: give it a moment
+        deadline = time.monotonic() + 5
+        while True:
+            events = b.tracer.dump()["traceEvents"]
+            found = {e["name"]: e for e in events if e["ph"] == "X"}
+            if len(found) >= n or time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+        assert events[0]["args"] == {"name": b.url.bus}
+        return found
+
+    trace_id = f"{root.id:x}"
+    on_client, on_relay, on_server = spans(client, 2), spans(relay, 4), spans(server, 3)
+    assert set(on_client) == {"root", "call relay_az"}
+    assert set(on_relay) == {"queue", "/Relay/0.relay_az", "reply", "call get_az"}
+    assert set(on_server) == {"queue", "/Telescope/0.get_az", "reply"}
+    for e in [*on_client.values(), *on_relay.values(), *on_server.values()]:
+        assert e["args"]["trace"] == trace_id
+        assert e["dur"] >= 0
+
+    assert "parent" not in on_client["root"]["args"]
+    call = on_client["call relay_az"]["args"]
+    assert call["parent"] == on_client["root"]["args"]["span"]
+    assert call["dst"] == dst
+    # the relay's phases are children of the client's call, and its own
+    # call to the server a child of the method it ran in
+    execute = on_relay["/Relay/0.relay_az"]["args"]
+    assert execute["parent"] == call["span"]
+    assert execute["src"] == src
+    assert on_relay["call get_az"]["args"]["parent"] == execute["span"]
+    assert (
+        on_server["/Telescope/0.get_az"]["args"]["parent"]
+        == on_relay["call get_az"]["args"]["span"]
+    )
+    assert msgspec.json.decode(msgspec.json.encode(client.tracer.dump()))
+
+    client.tracer.clear()
+    assert client.tracer.dump()["traceEvents"][1:] == []
+
+    for b in (client, relay, server):
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+
+def test_retained_event_snapshot(create_bus: Callable[..., Bus]):
+    """A retained event's last emission goes to each new subscription (its
+    filter permitting) before anything newer; plain events keep nothing."""
+    pub_bus = create_bus("tcp://127.0.0.1:15313")
+    sub_bus = create_bus("tcp://127.0.0.1:15314")
+
+    pool = ThreadPoolExecutor()
+    futures = [pool.submit(b.run_forever) for b in (pub_bus, sub_bus)]
+
+    pub = f"{pub_bus.url.bus}/Scheduler/0"
+    state = EventId(pub, "state_changed")
+
+    pub_bus.publish(pub=pub, event="program_begin", args=[1])
+    pub_bus.publish(pub=pub, event="state_changed", args=["IDLE", "OFF"], retain=True)
+    pub_bus.publish(pub=pub, event="state_changed", args=["BUSY", "IDLE"], retain=True)
+
+    deadline = time.monotonic() + 5
+    while pub_bus._retained.get(state, (0, None))[1] != ["BUSY", "IDLE"]:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert list(pub_bus._retained) == [state]
+
+    received: dict[str, list[str]] = {"state": [], "off": [], "program": []}
+    done = threading.Event()
+
+    def on_state(new_state: str, old_state: str) -> None:
+        received["state"].append(new_state)
+        if new_state == "OFF":
+            done.set()
+
+    def on_off(new_state: str, old_state: str) -> None:
+        received["off"].append(new_state)
+
+    def on_program(program_id: int) -> None:
+        received["program"].append(str(program_id))
+
+    sub = f"{sub_bus.url.bus}/Proxy/0"
+    sub_bus.subscribe(sub=sub, pub=pub, event="state_changed", callback=on_state)
+    sub_bus.subscribe(
+        sub=sub,
+        pub=pub,
+        event="state_changed",
+        callback=on_off,
+        filter=Filter(where=[(0, "==", "OFF")]),
+    )
+    sub_bus.subscribe(sub=sub, pub=pub, event="program_begin", callback=on_program)
+
+    deadline = time.monotonic() + 5
+    while received["state"] != ["BUSY"]:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    pub_bus.publish(pub=pub, event="state_changed", args=["OFF", "BUSY"], retain=True)
+    assert done.wait(5)
+    time.sleep(0.2)
+    assert received == {"state": ["BUSY", "OFF"], "off": ["OFF"], "program": []}
+
+    # the object is gone: nothing left to replay
+    pub_bus.forget_retained("/Scheduler/0")
+    assert pub_bus._retained == {}
+
+    for b in (pub_bus, sub_bus):
+        b.shutdown()
+    for future in futures:
+        future.result()
+    pool.shutdown()
@@ -0,0 +1,53 @@
+import threading
+import time
+
+import pytest
+
+from chimera.core.cancel import (
+    CancelToken,
+    cancel_token,
+    current_deadline,
+    use_cancel_token,
+)
+from chimera.core.exceptions import RequestCancelledException
+
+
+def test_cancel_token():
+    token = CancelToken()
+    assert not token.cancelled
+    assert token.remaining() is None
+    token.check()
+    assert token.wait(0.01) is False
+
+    threading.Timer(0.05, token.cancel).start()
+    t0 = time.monotonic()
+    assert token.wait(5) is True
+    assert time.monotonic() - t0 < 1
+    with pytest.raises(RequestCancelledException, match="cancelled"):
+        token.check()
+
+
+def test_cancel_token_deadline():
+    token = CancelToken(time.monotonic_ns() + 50_000_000)
+    assert not token.cancelled
+    assert 0 < token.remaining() <= 0.05
+
+    # wakes up at the deadline, however long it was asked to sleep
+    t0 = time.monotonic()
+    assert token.wait(5) is True
+    assert time.monotonic() - t0 < 1
+    assert token.remaining() == 0
+    with pytest.raises(RequestCancelledException, match="deadline expired"):
+        token.check()
+
+
+def test_current_token():
+    outside = cancel_token()
+    assert not outside.cancelled and outside.deadline is None
+    assert current_deadline() is None
+
+    token = CancelToken(time.monotonic_ns() + 10**9)
+    with use_cancel_token(token):
+        assert cancel_token() is token
+        assert current_deadline() == token.deadline
+    assert current_deadline() is None
@@ -134,6 +134,22 @@ class TestChimeraConfig:
         assert sites[0][0].port == 10000
         assert sites[0][1]["config0"] == "value0"
 
+    def test_peers(self):
+        s = """
+        chimera:
+            peers:
+              - 192.168.1.10:7666
+              - tcp://dome.local:7667
+        """
+
+        system = parse(s)
+        assert system.peers == ["tcp://192.168.1.10:7666", "tcp://dome.local:7667"]
+        assert parse("site: {}").peers == []
+
+    def test_metrics_port(self):
+        assert parse("chimera: {metrics_port: 9464}").metrics_port == 9464
+        assert parse("site: {}").metrics_port is None
+
     def test_auto_host_port(self):
         s = """
         site:
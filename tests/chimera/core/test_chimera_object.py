@@ -1,9 +1,12 @@
+import time
+
 import pytest
 
 from chimera.core.chimeraobject import ChimeraObject
 from chimera.core.config import OptionConversionException
 from chimera.core.constants import CONFIG_ATTRIBUTE_NAME
 from chimera.core.event import event
+from chimera.core.lock import lock
 from chimera.core.metaobject import MethodWrapper
 from chimera.core.state import State
 from chimera.core.url import parse_url
@@ -111,6 +114,34 @@ class TestChimeraObject:
 
         assert t.do_foo(1, 2, 3) is True
 
+    def test_method_binding_cached(self):
+        class Test(ChimeraObject):
+            def do_foo(self):
+                return self
+
+            @lock
+            def do_locked(self):
+                return self
+
+        t, other = Test(), Test()
+
+        # bound once per instance: no allocation on the call path
+        assert t.do_foo is t.do_foo
+        assert t.do_locked is t.do_locked
+        assert t.do_foo == other.do_foo.__func__.__get__(t)
+        assert t.do_locked == Test.__dict__["do_locked"].dispatcher(
+            Test.__dict__["do_locked"], t, Test
+        )
+        assert other.do_foo() is other and other.do_locked() is other
+        assert "bound method" in repr(t.do_locked)
+
+        # a shallow copy shares the cache dict, never the binding
+        clone = Test.__new__(Test)
+        clone.__dict__.update(t.__dict__)
+        assert clone.do_foo() is clone
+        assert clone.do_locked() is clone
+        assert t.do_foo() is t
+
     def test_config(self):
         class ConfigTest(ChimeraObject):
             __config__ = {"key1": True, "key2": False}
@@ -298,3 +329,30 @@ class TestChimeraObject:
         # features
         assert m.features("BaseClass")  # Minimo is a BaseClass subclass
         assert not m.features("str")  # But not a basestring subclass
+
+
+def test_method_call_bench():
+    """In-process calls on a ChimeraObject, plain and @lock."""
+    print()
+
+    class Telescope(ChimeraObject):
+        def get_az(self) -> float:
+            return 42.0
+
+        @lock
+        def slew(self) -> float:
+            return 42.0
+
+    telescope = Telescope()
+    n = 200_000
+    for label, method in (("plain", telescope.get_az), ("@lock", telescope.slew)):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            method()
+        call = time.perf_counter() - t0
+        print(f"{label} call {call * 1e9 / n:.0f} ns")
+
+    t0 = time.perf_counter()
+    for _ in range(n):
+        telescope.get_az()
+    print(f"plain lookup + call {(time.perf_counter() - t0) * 1e9 / n:.0f} ns")
@@ -0,0 +1,160 @@
+import time
+
+import msgspec
+import pytest
+
+from chimera.core.codec import (
+    JsonCodec,
+    MsgpackCodec,
+    create_codec,
+    decode_message,
+)
+from chimera.core.protocol import Filter, Messages, Ping, Pong, Protocol, Trace
+
+SRC = "tcp://127.0.0.1:1234/Proxy/0"
+DST = "tcp://127.0.0.1:5678/Telescope/0"
+
+
+def all_messages() -> list[Messages]:
+    request = Protocol.request(
+        src=SRC,
+        dst=DST,
+        method="slew_to_ra_dec",
+        args=[123.456789, -27.604167],
+        kwargs={"epoch": "J2000"},
+    )
+    publish = Protocol.publish(
+        pub=DST, event="offset_complete", args=[0.12, -0.34], kwargs={}
+    )
+    ping = Protocol.ping(src=SRC, dst=DST, codecs=["msgpack", "json"])
+    return [
+        request,
+        Protocol.request(
+            src=SRC,
+            dst=DST,
+            method="expose",
+            args=[],
+            kwargs={},
+            trace=Trace(id=1 << 62, span=12345),
+            budget=5_000_000_000,
+        ),
+        request.ok({"ra": 123.456789, "dec": -27.604167, "parked": False}),
+        request.not_found("'Telescope' not found"),
+        request.expired("slew_to_ra_dec: deadline expired before it started"),
+        Protocol.subscribe(sub=SRC, pub=DST, event="slew_begin", callback=42),
+        Protocol.subscribe(
+            sub=SRC,
+            pub=DST,
+            event="temperature_change",
+            callback=43,
+            filter=Filter(
+                where=[(0, ">", 10.5), ("unit", "in", ["C", "K"])],
+                deadband=[(0, 0.5)],
+                max_rate=2.0,
+            ),
+        ),
+        Protocol.unsubscribe(sub=SRC, pub=DST, event="slew_begin", callback=42),
+        publish,
+        Protocol.publish(
+            pub=DST, event="state_changed", args=["IDLE", "OFF"], kwargs={}, retain=True
+        ),
+        publish.callback(
+            dst="tcp://127.0.0.1:1234",
+            event=publish.event,
+            args=publish.args,
+            kwargs=publish.kwargs,
+        ),
+        msgspec.structs.replace(
+            publish.callback(
+                dst="tcp://127.0.0.1:1234", event=publish.event, args=[], kwargs={}
+            ),
+            callbacks=[42, 43],
+        ),
+        ping,
+        ping.pong(resolved_url=DST, handle=1 << 62, codecs=["json"]),
+        Protocol.credit(src=SRC, dst=DST, id=7, credit=8),
+        Protocol.chunk(src=DST, dst=SRC, id=7, seq=0, data=bytes(range(256))),
+    ]
+
+
+@pytest.mark.parametrize("name", ["json", "msgpack"])
+def test_roundtrip_every_message_type(name: str):
+    codec = create_codec(name)
+    for message in all_messages():
+        data = codec.encode(message)
+        assert codec.decode(data) == message
+        # frames are self-describing: no need to know the sender's codec
+        assert decode_message(data) == message
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError, match="unknown codec"):
+        create_codec("xml")
+
+
+def test_ping_from_bus_without_negotiation_decodes():
+    """A Ping/Pong from a bus that predates codec negotiation has no codecs
+    field: it must still decode, and say nothing about what it accepts."""
+    old_ping = b'{"type":"ping","ts":1,"src":"%s","dst":"%s","id":7}' % (
+        SRC.encode(),
+        DST.encode(),
+    )
+    ping = decode_message(old_ping)
+    assert isinstance(ping, Ping)
+    assert ping.codecs is None
+
+    old_pong = msgspec.json.encode(
+        {"type": "pong", "ts": 1, "src": DST, "dst": SRC, "id": 7, "ok": True}
+    )
+    pong = decode_message(old_pong)
+    assert isinstance(pong, Pong)
+    assert pong.codecs is None
+
+
+def test_msgpack_frames_are_smaller():
+    json, msgpack = JsonCodec(), MsgpackCodec()
+    for message in all_messages():
+        assert len(msgpack.encode(message)) < len(json.encode(message))
+
+
+def test_codec_bench():
+    """Encode/decode cost and frame size of each codec over the Messages
+    union (a position poll, its reply and an autoguider event)."""
+    print()
+
+    request = Protocol.request(src=SRC, dst=DST, method="get_position_ra_dec")
+    messages: list[Messages] = [
+        request,
+        request.ok([123.45678901234, -27.60416666667, 2000.0]),
+        Protocol.publish(
+            pub=DST,
+            event="offset_complete",
+            args=[{"x": 0.123456789, "y": -0.987654321}],
+            kwargs={},
+        ),
+    ]
+
+    n = 20_000
+    for name in ("json", "msgpack"):
+        codec = create_codec(name)
+        frames = [codec.encode(message) for message in messages]
+
+        t0 = time.perf_counter()
+        for _ in range(n):
+            for message in messages:
+                codec.encode(message)
+        encode = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for _ in range(n):
+            for frame in frames:
+                decode_message(frame)
+        decode = time.perf_counter() - t0
+
+        ops = n * len(messages)
+        size = sum(len(frame) for frame in frames) / len(frames)
+        print(
+            f"{name:8} encode {encode * 1e6 / ops:.3f} μs/msg "
+            f"decode {decode * 1e6 / ops:.3f} μs/msg "
+            f"{size:.0f} bytes/msg"
+        )
@@ -34,6 +34,13 @@ class Publisher(ChimeraObject):
     def foo_done(self, when):
         pass
 
+    def set_level(self, level):
+        self.level_changed(level)
+
+    @event(retain=True)
+    def level_changed(self, level):
+        pass
+
     def foo_done_clbk(self, when):
         self.counter += 1
 
@@ -46,6 +53,7 @@ class Subscriber(ChimeraObject):
         ChimeraObject.__init__(self)
         self.counter = 0
         self.results = []
+        self.levels = []
 
     def foo_done_clbk(self, when):
         self.results.append((when, time.time()))
@@ -58,6 +66,12 @@ class Subscriber(ChimeraObject):
     def get_results(self):
         return self.results
 
+    def level_clbk(self, level):
+        self.levels.append(level)
+
+    def get_levels(self):
+        return self.levels
+
 
 class TestEvents:
     def test_publish(self, manager, wait_for):
@@ -90,6 +104,29 @@ class TestEvents:
         assert s.get_counter() == 2
         assert p.get_counter() == 2
 
+    def test_retained_event(self, manager, wait_for):
+        assert manager.add_class(Publisher, "p") is not False
+        assert manager.add_class(Subscriber, "s") is not False
+
+        p = manager.get_proxy("/Publisher/p")
+        s = manager.get_proxy("/Subscriber/s")
+
+        p.set_level(1)
+        p.set_level(2)
+
+        retained = manager._bus._retained
+        assert wait_for(lambda: [list(v[1]) for v in retained.values()] == [[2]])
+
+        # the last emission arrives right after subscribing, then every new one
+        s_level = s.level_clbk
+        p.level_changed += s_level
+        assert wait_for(lambda: s.get_levels() == [2])
+
+        p.set_level(3)
+        assert wait_for(lambda: s.get_levels() == [2, 3])
+
+        p.level_changed -= s_level
+
     def test_performance(self, manager):
         assert manager.add_class(Publisher, "p") is not False
         assert manager.add_class(Subscriber, "s") is not False
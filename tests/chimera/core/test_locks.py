@@ -127,6 +127,152 @@ class TestLock:
         p = manager.get_proxy("/Minimo/m")
         do_test(p)
 
+    def test_shared_lock(self):
+        """@lock(shared=True) methods of an object run concurrently with each
+        other, never alongside its exclusive ones, and nest either way."""
+
+        class Minimo(ChimeraObject):
+            def __init__(self):
+                ChimeraObject.__init__(self)
+                self.running = 0
+                self.max_running = 0
+                self.writing = False
+                self.overlapped = False
+                self.guard = threading.Lock()
+
+            @lock(shared=True)
+            def do_read(self):
+                with self.guard:
+                    self.running += 1
+                    self.max_running = max(self.max_running, self.running)
+                    self.overlapped = self.overlapped or self.writing
+                time.sleep(0.2)
+                with self.guard:
+                    self.running -= 1
+                return True
+
+            @lock
+            def do_write(self):
+                with self.guard:
+                    self.overlapped = self.overlapped or self.running > 0
+                    self.writing = True
+                time.sleep(0.1)
+                with self.guard:
+                    self.writing = False
+                return True
+
+            @lock(shared=True)
+            def do_nested_read(self):
+                return self.do_read()
+
+            @lock
+            def do_write_then_read(self):
+                return self.do_read()
+
+        m = Minimo()
+
+        readers = [threading.Thread(target=m.do_read) for _ in range(4)]
+        for t in readers:
+            t.start()
+        # all four got in at once
+        deadline = time.time() + 5
+        while m.max_running < 4:
+            assert time.time() < deadline, "reads did not run together"
+            time.sleep(0.01)
+
+        writers = [threading.Thread(target=m.do_write) for _ in range(2)]
+        for t in writers:
+            t.start()
+        for t in readers + writers:
+            t.join()
+
+        assert not m.overlapped
+
+        assert m.do_nested_read() is True
+        assert m.do_write_then_read() is True
+
+    def test_shared_inside_exclusive_lets_no_writer_in(self):
+        """A shared call made from an exclusive method, while another writer
+        waits, must not hand the object over to that writer."""
+
+        class Minimo(ChimeraObject):
+            def __init__(self):
+                ChimeraObject.__init__(self)
+                self.inside = 0
+                self.overlapped = False
+                self.guard = threading.Lock()
+
+            @lock(shared=True)
+            def do_read(self):
+                time.sleep(0.05)
+
+            @lock
+            def do_write(self, nested: bool):
+                with self.guard:
+                    self.inside += 1
+                    self.overlapped = self.overlapped or self.inside > 1
+                if nested:
+                    self.do_read()
+                time.sleep(0.05)
+                with self.guard:
+                    self.inside -= 1
+
+        m = Minimo()
+
+        for _ in range(5):
+            writers = [
+                threading.Thread(target=m.do_write, args=(nested,))
+                for nested in (True, False)
+            ]
+            for t in writers:
+                t.start()
+            for t in writers:
+                t.join()
+
+        assert not m.overlapped
+
+    def test_concurrent_upgrades(self):
+        """Two shared methods calling an exclusive one at once: one upgrades,
+        the other gives its read up and waits its turn, no deadlock."""
+
+        class Minimo(ChimeraObject):
+            def __init__(self):
+                ChimeraObject.__init__(self)
+                self.both_reading = threading.Barrier(2)
+                self.inside = 0
+                self.overlapped = False
+                self.writes = 0
+                self.guard = threading.Lock()
+
+            @lock(shared=True)
+            def do_read_then_write(self):
+                self.both_reading.wait(5)
+                self.do_write()
+
+            @lock
+            def do_write(self):
+                with self.guard:
+                    self.inside += 1
+                    self.overlapped = self.overlapped or self.inside > 1
+                time.sleep(0.05)
+                with self.guard:
+                    self.inside -= 1
+                    self.writes += 1
+
+        m = Minimo()
+
+        threads = [threading.Thread(target=m.do_read_then_write) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+
+        assert not any(t.is_alive() for t in threads), "upgrades deadlocked"
+        assert m.writes == 2
+        assert not m.overlapped
+        # and the object is free again
+        assert m.do_write() is None
+
     def test_lock_config(self):
         class Minimo(ChimeraObject):
             __config__ = {"config": 0}
@@ -133,6 +133,25 @@ class TestManager:
 
         assert p.answer() == 42
 
+    def test_resolution_cached_until_remove(self, manager):
+        manager.add_class(Simple, "first", start=False)
+        manager.add_class(Simple, "second", start=False)
+
+        path, answer = manager._resolve_request("/Simple/0", "answer")
+        assert path == "/Simple/first"
+        # a hit hands back the very same bound method: nothing allocated
+        assert manager._resolve_request("/Simple/0", "answer")[1] is answer
+        assert manager._resolve_request("/Simple/0", "nothing") == (
+            "/Simple/first",
+            None,
+        )
+
+        # index paths shift when an object goes away
+        manager.remove("/Simple/first")
+        path, method = manager._resolve_request("/Simple/0", "answer")
+        assert path == "/Simple/second"
+        assert method is not answer and method() == 42
+
     def test_stop_joins_control_loop(self, manager):
         class Looper(ChimeraObject):
             def control(self):
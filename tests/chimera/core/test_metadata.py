@@ -0,0 +1,133 @@
+import time
+
+from chimera.controllers.imageserver.imagerequest import ImageRequest
+from chimera.core.chimeraobject import ChimeraObject
+from chimera.core.event import event
+from chimera.core.metadata import MetadataSnapshots
+
+
+class Publisher(ChimeraObject):
+    __config__ = {"value": 0}
+    __metadata_events__ = ("changed",)
+
+    def __init__(self):
+        ChimeraObject.__init__(self)
+        self.pulls = 0
+        self.snapshots = 0
+
+    def get_metadata(self, request):
+        if request is not None:
+            # asked by a camera, not taking its own snapshot
+            self.pulls += 1
+        else:
+            self.snapshots += 1
+            # a slow instrument: changes pile up while one is taken
+            time.sleep(0.005)
+        return [("VALUE", self["value"], "")]
+
+    @event
+    def changed(self): ...
+
+    def change(self, value):
+        self["value"] = value
+        self.changed()
+
+    def get_pulls(self):
+        return self.pulls
+
+    def get_snapshots(self):
+        return self.snapshots
+
+    def burst(self, n):
+        for value in range(n):
+            self.change(value)
+
+
+class SnapshotCamera(ChimeraObject):
+    # the bits of CameraBase ImageRequest takes headers with
+    __config__ = {"metadata_max_age": 60.0, "metadata_pull": True}
+
+    def __init__(self):
+        ChimeraObject.__init__(self)
+        self.metadata_snapshots = MetadataSnapshots()
+
+
+def test_snapshots_keep_the_newest():
+    snapshots = MetadataSnapshots()
+    assert snapshots.get("/Telescope/0", 60) is None
+
+    now = time.time()
+    snapshots.update("/Telescope/0", 2, now, [("RA", "2", "")])
+    # older, delivered late
+    snapshots.update("/Telescope/0", 1, now - 1, [("RA", "1", "")])
+    assert snapshots.get("/Telescope/0", 60) == [("RA", "2", "")]
+
+    # aged on our clock from arrival: a publisher an hour behind is fresh
+    snapshots.update("/Dome/0", 1, now - 3600, [("DOME_SLT", "Open", "")])
+    assert snapshots.get("/Dome/0", 60) is not None
+    time.sleep(0.05)
+    assert snapshots.get("/Dome/0", 0.01) is None
+
+
+def _headers(camera, location):
+    request = ImageRequest()
+    request.metadata_post = [location]
+    request.end_exposure(camera)
+    return request.headers
+
+
+def test_headers_from_pushed_snapshots(manager):
+    publisher = manager.add_class(Publisher, "p")
+    manager.add_class(SnapshotCamera, "cam")
+    camera = manager.resources.get("/SnapshotCamera/cam").instance
+
+    # nothing published yet: asked, and watched from now on
+    assert _headers(camera, "/Publisher/p") == [("VALUE", 0, "")]
+    assert publisher.get_pulls() == 1
+
+    publisher.change(5)
+    deadline = time.monotonic() + 5
+    while camera.metadata_snapshots.get("/Publisher/p", 60) is None:
+        assert time.monotonic() < deadline, "snapshot never arrived"
+        time.sleep(0.01)
+
+    # from the snapshot, no round trip
+    assert _headers(camera, "/Publisher/p") == [("VALUE", 5, "")]
+    assert publisher.get_pulls() == 1
+
+    # stale: asked again, or left out when pulling is off
+    time.sleep(0.05)
+    camera["metadata_max_age"] = 0.01
+    assert _headers(camera, "/Publisher/p") == [("VALUE", 5, "")]
+    assert publisher.get_pulls() == 2
+    camera["metadata_pull"] = False
+    assert _headers(camera, "/Publisher/p") == []
+    assert publisher.get_pulls() == 2
+
+    # the last snapshot is retained: a new camera gets it on watching
+    late = MetadataSnapshots()
+    late.watch("/Publisher/p", manager.get_proxy("/Publisher/p"))
+    deadline = time.monotonic() + 5
+    while late.get("/Publisher/p", 60) is None:
+        assert time.monotonic() < deadline, "retained snapshot never arrived"
+        time.sleep(0.01)
+
+
+def test_snapshots_only_for_watchers(manager):
+    publisher = manager.add_class(Publisher, "p")
+
+    # nobody watches: emitting costs no snapshot
+    publisher.burst(10)
+    time.sleep(0.2)
+    assert publisher.get_snapshots() == 0
+
+    snapshots = MetadataSnapshots()
+    snapshots.watch("/Publisher/p", manager.get_proxy("/Publisher/p"))
+    publisher.burst(100)
+    deadline = time.monotonic() + 5
+    while snapshots.get("/Publisher/p", 60) != [("VALUE", 99, "")]:
+        assert time.monotonic() < deadline, "last change never published"
+        time.sleep(0.01)
+
+    # a burst folds into few snapshots, the last one taken after it
+    assert 1 <= publisher.get_snapshots() < 100
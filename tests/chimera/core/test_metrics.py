@@ -0,0 +1,100 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from chimera.core.metrics import (
+    BUCKETS,
+    OTHER_PEERS,
+    Histogram,
+    Metrics,
+    MetricsServer,
+    quantile,
+    render_prometheus,
+)
+
+
+def test_histogram_quantiles():
+    histogram = Histogram()
+    assert quantile(histogram.snapshot(), 0.5) is None
+
+    for _ in range(90):
+        histogram.observe(0.0003)
+    for _ in range(10):
+        histogram.observe(0.2)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 100
+    assert snapshot["sum"] == pytest.approx(90 * 0.0003 + 10 * 0.2)
+    assert len(snapshot["counts"]) == len(BUCKETS) + 1
+    # the upper bound of the bucket the quantile falls in
+    assert quantile(snapshot, 0.5) == 0.0005
+    assert quantile(snapshot, 0.9) == 0.0005
+    assert quantile(snapshot, 0.99) == 0.25
+
+    histogram.observe(1000.0)
+    assert quantile(histogram.snapshot(), 1.0) == float("inf")
+
+
+def test_render_prometheus():
+    metrics = Metrics()
+    metrics.request('/Camera/"0"', "expose", 0.001, 12.0, failed=False)
+    metrics.request('/Camera/"0"', "expose", 0.001, 0.5, failed=True)
+    metrics.received("Request", "tcp://127.0.0.1:7667", 120, 0.00001)
+    metrics.sent("Response", "tcp://127.0.0.1:7667", 80)
+    metrics.sent("Event")
+    metrics.published("tcp://127.0.0.1:7666/Dome/0", "slit_opened", 2)
+
+    text = render_prometheus(metrics.snapshot(), "tcp://127.0.0.1:7666")
+    lines = text.splitlines()
+
+    labels = 'bus="tcp://127.0.0.1:7666",object="/Camera/\\"0\\"",method="expose"'
+    assert f'chimera_request_run_seconds_bucket{{{labels},le="+Inf"}} 2' in lines
+    assert f'chimera_request_run_seconds_bucket{{{labels},le="1.0"}} 1' in lines
+    assert f"chimera_request_run_seconds_count{{{labels}}} 2" in lines
+    assert f"chimera_request_errors_total{{{labels}}} 1" in lines
+    assert (
+        'chimera_messages_sent_total{bus="tcp://127.0.0.1:7666",type="Event"} 1'
+        in lines
+    )
+    assert (
+        'chimera_peer_bytes_in_total{bus="tcp://127.0.0.1:7666",'
+        'peer="tcp://127.0.0.1:7667"} 120' in lines
+    )
+    assert (
+        'chimera_event_deliveries_total{bus="tcp://127.0.0.1:7666",'
+        'publisher="tcp://127.0.0.1:7666/Dome/0",event="slit_opened"} 2' in lines
+    )
+    assert "# TYPE chimera_codec_decode_seconds histogram" in lines
+    assert text.endswith("\n")
+
+
+def test_forget_peer():
+    metrics = Metrics()
+    for port in (7667, 7668):
+        metrics.received("Request", f"tcp://127.0.0.1:{port}", 100, 0.00001)
+        metrics.sent("Response", f"tcp://127.0.0.1:{port}", 40)
+
+    metrics.forget_peer("tcp://127.0.0.1:7667")
+    metrics.forget_peer("tcp://127.0.0.1:7668")
+    metrics.forget_peer("tcp://127.0.0.1:7669")
+
+    snapshot = metrics.snapshot()
+    assert snapshot["bytes_in"] == {OTHER_PEERS: 200}
+    assert snapshot["bytes_out"] == {OTHER_PEERS: 80}
+
+
+def test_metrics_server():
+    server = MetricsServer(lambda: "chimera_up 1\n", port=0)
+    server.start()
+    try:
+        url = f"http://127.0.0.1:{server.port}"
+        with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+            assert response.status == 200
+            assert response.read() == b"chimera_up 1\n"
+
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{url}/", timeout=5)
+        assert error.value.code == 404
+    finally:
+        server.shutdown()
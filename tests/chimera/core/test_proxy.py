@@ -1,8 +1,15 @@
+import asyncio
 import copy
+import threading
+import time
 
 import pytest
 
-from chimera.core.proxy import Proxy, ProxyMethod
+from chimera.core.chimeraobject import ChimeraObject
+from chimera.core.event import event
+from chimera.core.exceptions import ObjectNotFoundException
+from chimera.core.lock import lock
+from chimera.core.proxy import AsyncProxy, Proxy, ProxyMethod
 from chimera.core.url import parse_url
 
 
@@ -22,6 +29,7 @@ def proxy():
         {
             "__url__": parse_url("tcp://localhost:7777/Telescope/tel"),
             "__resolved_url__": parse_url("tcp://localhost:7778/Telescope/tel"),
+            "__handle__": None,
             "__proxy_url__": parse_url("tcp://localhost:7777/Proxy/p"),
             "__bus__": ExplodingBus(),
             "__timeout__": None,
@@ -55,3 +63,283 @@ class TestProxyCopy:
         assert clone is not proxy
         assert clone.__bus__ is proxy.__bus__
         assert isinstance(clone.abort_slew, ProxyMethod)
+
+
+class BatchTarget(ChimeraObject):
+    __config__ = {"device": "/dev/null"}
+
+    def get_az(self) -> float:
+        return 42.0
+
+    def echo(self, value, *, scale=1):
+        return value * scale
+
+    def fail(self):
+        raise ValueError("boom")
+
+
+class TestProxyBatch:
+    def test_batch_results(self, manager):
+        proxy = manager.add_class(BatchTarget, "target", start=False)
+
+        with proxy.batch() as batch:
+            az = batch.get_az()
+            echo = batch.echo(2, scale=3)
+            device = batch["device"]
+            failed = batch.fail()
+            # nothing is sent until the block exits
+            assert not az.done()
+
+        assert az.result() == 42.0
+        assert echo.result() == 6
+        assert device.result() == "/dev/null"
+        with pytest.raises(Exception, match="boom"):
+            failed.result()
+
+    def test_batch_not_sent_when_block_raises(self, manager):
+        proxy = manager.add_class(BatchTarget, "target", start=False)
+
+        with pytest.raises(RuntimeError):
+            with proxy.batch() as batch:
+                az = batch.get_az()
+                raise RuntimeError()
+
+        assert az.cancelled()
+
+    def test_batch_skips_cancelled_calls(self, manager):
+        proxy = manager.add_class(BatchTarget, "target", start=False)
+
+        with proxy.batch() as batch:
+            az = batch.get_az()
+            echo = batch.echo(2)
+            assert echo.cancel()
+
+        assert az.result() == 42.0
+        assert echo.cancelled()
+
+    def test_batch_to_unknown_object_raises_on_exit(self, manager):
+        proxy = manager.get_proxy("/BatchTarget/missing")
+
+        with pytest.raises(ObjectNotFoundException):
+            with proxy.batch() as batch:
+                az = batch.get_az()
+
+        with pytest.raises(ObjectNotFoundException):
+            az.result()
+
+
+class TestProxyHandles:
+    def test_calls_go_by_handle(self, manager):
+        proxy = manager.add_class(BatchTarget, "target", start=False)
+        assert proxy.get_az() == 42.0
+        assert proxy.__handle__ is not None
+
+        # the handle alone reaches the object: dst is not even looked at
+        proxy.__resolved_url__ = parse_url(f"{manager._bus.url.bus}/Nothing/here")
+        assert proxy.get_az() == 42.0
+        with proxy.batch() as batch:
+            echo = batch.echo(2)
+        assert echo.result() == 2
+        assert proxy.echo.future(3).result(timeout=5) == 3
+
+    def test_removed_object_invalidates_handle(self, manager):
+        proxy = manager.add_class(BatchTarget, "target", start=False)
+        assert proxy.get_az() == 42.0
+
+        manager.remove("/BatchTarget/target")
+        with pytest.raises(Exception, match="not found"):
+            proxy.get_az()
+
+        # same path, new object: the stale handle falls back to the path
+        manager.add_class(BatchTarget, "target", start=False)
+        assert proxy.get_az() == 42.0
+
+
+class TestResolutionCache:
+    def test_new_proxies_skip_the_ping(self, manager):
+        manager.add_class(BatchTarget, "target", start=False)
+        bus = manager._bus
+
+        pings = 0
+        ping = bus.ping
+
+        def counting_ping(**kwargs):
+            nonlocal pings
+            pings += 1
+            return ping(**kwargs)
+
+        bus.ping = counting_ping
+        try:
+            for _ in range(5):
+                assert manager.get_proxy("/BatchTarget/0").get_az() == 42.0
+        finally:
+            del bus.ping
+        assert pings == 1
+
+        proxy = manager.get_proxy("/BatchTarget/0")
+        proxy.resolve()
+        assert proxy.__resolved_url__.path == "/BatchTarget/target"
+        assert proxy.__handle__ is not None
+        assert bus.stats()["resolutions"] >= 1
+
+    def test_removed_object_is_resolved_again(self, manager):
+        manager.add_class(BatchTarget, "target", start=False)
+        url = f"{manager._bus.url.bus}/BatchTarget/target"
+        assert Proxy(url, manager._bus).get_az() == 42.0
+        assert manager._bus.cached_resolution(url) is not None
+
+        manager.remove("/BatchTarget/target")
+        assert manager._bus.cached_resolution(url) is None
+        with pytest.raises(ObjectNotFoundException):
+            Proxy(url, manager._bus).resolve()
+
+    def test_not_found_forgets_the_resolution(self, manager):
+        bus = manager._bus
+        url = f"{bus.url.bus}/BatchTarget/moved"
+        # resolved some time ago, since gone
+        bus.cache_resolution(url, parse_url(f"{bus.url.bus}/BatchTarget/old"), None)
+
+        with pytest.raises(Exception, match="not found"):
+            Proxy(url, bus).get_az()
+        assert bus.cached_resolution(url) is None
+
+    def test_expiry_and_peer_loss(self, manager):
+        bus = manager._bus
+        resolved = parse_url("tcp://127.0.0.1:1/Telescope/tel")
+        bus.cache_resolution("tcp://127.0.0.1:1/Telescope/0", resolved, 7)
+        assert bus.cached_resolution("tcp://127.0.0.1:1/Telescope/0") == (resolved, 7)
+
+        bus._close_peer("tcp://127.0.0.1:1", forget=True)
+        assert bus.cached_resolution("tcp://127.0.0.1:1/Telescope/0") is None
+
+        bus._resolve_ttl = 0
+        bus.cache_resolution("tcp://127.0.0.1:1/Telescope/0", resolved, 7)
+        assert bus.cached_resolution("tcp://127.0.0.1:1/Telescope/0") is None
+
+
+class AsyncTarget(ChimeraObject):
+    def get_az(self) -> float:
+        return 42.0
+
+    def fail(self):
+        raise ValueError("boom")
+
+    @event
+    def az_changed(self, az: float): ...
+
+    def move(self, az: float):
+        self.az_changed(az)
+
+
+class TestAsyncProxy:
+    def test_calls_and_errors(self, manager):
+        manager.add_class(AsyncTarget, "target", start=False)
+
+        async def main():
+            proxy = AsyncProxy(
+                f"{manager._bus.url.bus}/AsyncTarget/0", manager._bus, timeout=10
+            )
+            assert await proxy.get_az() == 42.0
+            assert (
+                await asyncio.gather(*(proxy.get_az() for _ in range(50)))
+                == [42.0] * 50
+            )
+            assert await proxy.ping() is True
+
+            with pytest.raises(Exception, match="boom"):
+                await proxy.fail()
+
+            missing = AsyncProxy(f"{manager._bus.url.bus}/Missing/0", manager._bus)
+            with pytest.raises(ObjectNotFoundException):
+                await missing.get_az()
+
+        asyncio.run(main())
+
+    def test_coroutine_event_subscription(self, manager):
+        target = manager.add_class(AsyncTarget, "target", start=False)
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            received: asyncio.Queue[float] = asyncio.Queue()
+
+            async def on_az_changed(az: float):
+                # runs on our loop, not on a bus handler thread
+                assert asyncio.get_running_loop() is loop
+                await received.put(az)
+
+            proxy = AsyncProxy(f"{manager._bus.url.bus}/AsyncTarget/0", manager._bus)
+            await proxy.az_changed.subscribe(on_az_changed)
+
+            await asyncio.to_thread(target.move, 10.0)
+            assert await asyncio.wait_for(received.get(), 5) == 10.0
+
+            await proxy.az_changed.unsubscribe(on_az_changed)
+            await asyncio.to_thread(target.move, 20.0)
+            await asyncio.sleep(0.2)
+            assert received.empty()
+
+        asyncio.run(main())
+
+
+class FutureTarget(ChimeraObject):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.calls: list[str] = []
+
+    def move(self, seconds: float) -> float:
+        time.sleep(seconds)
+        return seconds
+
+    def fail(self):
+        raise ValueError("boom")
+
+    @lock
+    def hold(self):
+        self.calls.append("hold")
+        self.release.wait(10)
+
+    @lock
+    def queued(self):
+        self.calls.append("queued")
+
+
+class TestProxyMethodFuture:
+    def test_futures_run_concurrently(self, manager):
+        proxies = [
+            manager.add_class(FutureTarget, name, start=False)
+            for name in ("telescope", "dome", "wheel")
+        ]
+
+        t0 = time.monotonic()
+        futures = [proxy.move.future(0.5) for proxy in proxies]
+        assert [future.result(timeout=5) for future in futures] == [0.5] * 3
+        # joined on all three: not one after another
+        assert time.monotonic() - t0 < 1.2
+
+        with pytest.raises(Exception, match="boom"):
+            proxies[0].fail.submit().result(timeout=5)
+
+    def test_cancel_skips_queued_call(self, manager):
+        proxy = manager.add_class(FutureTarget, "target", start=False)
+        target = manager.resources.get("/FutureTarget/target").instance
+
+        hold = proxy.hold.future()
+        deadline = time.monotonic() + 5
+        while target.calls != ["hold"]:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        # queued behind hold on the object's lane
+        queued = proxy.queued.future()
+        assert queued.cancel()
+        assert queued.cancelled()
+
+        target.release.set()
+        assert hold.result(timeout=5) is None
+
+        # the lane is FIFO: a call made after hold ran means queued was seen
+        proxy.queued()
+        assert target.calls == ["hold", "queued"]
+        assert not manager._bus._mailboxes._boxes
+        assert not manager._bus._queued
@@ -1,4 +1,5 @@
 import threading
+import time
 
 import pytest
 
@@ -110,6 +111,36 @@ class TestResources:
         with pytest.raises(ValueError):
             resources.get("wrong location")
 
+    def test_index_follows_registration(self, resources: ResourcesManager):
+        class Base:
+            pass
+
+        class A(Base):
+            pass
+
+        for path in ("/A/a0", "/A/a1", "/A/a2"):
+            resources.add(path, A())
+
+        # restarting an object (Manager.start resets created) keeps its index
+        first = resources.get("/A/a0")
+        assert first is not None
+        first.created = time.time() + 1
+        assert [r.path for r in resources.get_by_class("Base")] == [
+            "/A/a0",
+            "/A/a1",
+            "/A/a2",
+        ]
+
+        resources.remove("/A/1")
+        resource = resources.get("/Base/1")
+        assert resource is not None and resource.path == "/A/a2"
+        assert resources.get("/A/2") is None
+
+        resources.remove("/A/a0")
+        resources.remove("/A/a2")
+        assert resources.get_by_class("Base") == []
+        assert resources.get("/A/0") is None
+
     def test_get_by_index_boundary(self, resources: ResourcesManager):
         resources.add("/Location/l1")
         resources.add("/Location/l2")
@@ -158,3 +189,28 @@ class TestResources:
         for k, v in resources.items():
             assert k == expected_paths.pop(0)
             assert v == expected_resources.pop(0)
+
+
+def test_lookup_bench():
+    """Lookup cost must stay flat as the registry grows."""
+    print()
+
+    class Camera:
+        pass
+
+    n = 20_000
+    for size in (10, 100, 1000):
+        resources = ResourcesManager()
+        for i in range(size):
+            resources.add(f"/Camera/cam{i}", Camera())
+
+        middle = size // 2
+        for label, path in (
+            ("name", f"/Camera/cam{middle}"),
+            ("index", f"/Camera/{middle}"),
+        ):
+            t0 = time.perf_counter()
+            for _ in range(n):
+                resources.get(path)
+            elapsed = time.perf_counter() - t0
+            print(f"{size:5} objects, by {label:5}: {elapsed * 1e6 / n:.3f} μs/get")
@@ -0,0 +1,57 @@
+import threading
+
+import msgspec
+
+from chimera.core.trace import Tracer, current_trace, span
+
+
+def test_span_nesting():
+    tracer = Tracer("tcp://127.0.0.1:7666")
+    assert current_trace() is None
+
+    with span(tracer, "program", name="flats") as outer:
+        assert current_trace() == outer
+        with span(tracer, "action") as inner:
+            assert inner.id == outer.id
+            assert inner.span != outer.span
+        assert current_trace() == outer
+    assert current_trace() is None
+
+    with span(tracer, "other") as other:
+        assert other.id != outer.id
+
+    events = tracer.dump()["traceEvents"]
+    assert events[0] == {
+        "name": "process_name",
+        "ph": "M",
+        "pid": events[0]["pid"],
+        "args": {"name": "tcp://127.0.0.1:7666"},
+    }
+    spans = {e["name"]: e for e in events if e["ph"] == "X"}
+    # recorded as they end: inner first
+    assert list(spans) == ["action", "program", "other"]
+    assert spans["program"]["args"] == {
+        "trace": f"{outer.id:x}",
+        "span": f"{outer.span:x}",
+        "name": "flats",
+    }
+    assert spans["action"]["args"]["parent"] == f"{outer.span:x}"
+    assert spans["program"]["ts"] <= spans["action"]["ts"]
+    assert spans["program"]["dur"] >= spans["action"]["dur"]
+
+    names = {e["tid"]: e["args"]["name"] for e in events if e["name"] == "thread_name"}
+    assert names[threading.get_native_id()] == threading.current_thread().name
+    assert msgspec.json.decode(msgspec.json.encode(tracer.dump()))
+
+
+def test_tracer_ring_buffer():
+    tracer = Tracer("bus", size=3)
+    for n in range(5):
+        with span(tracer, f"span {n}"):
+            pass
+
+    spans = [e["name"] for e in tracer.dump()["traceEvents"] if e["ph"] == "X"]
+    assert spans == ["span 2", "span 3", "span 4"]
+
+    tracer.clear()
+    assert [e for e in tracer.dump()["traceEvents"] if e["ph"] == "X"] == []
@@ -145,3 +145,20 @@ class TestFakeDome:
 
         dome.close_slit()
         assert dome.is_slit_open() is False
+
+    def test_slit_state_is_retained(self, dome, wait_for):
+        # DomeBase derives slit_state from the driver's slit_opened and
+        # slit_closed: a late subscriber still learns where the slit is
+        for move, expected in ((dome.open_slit, True), (dome.close_slit, False)):
+            move()
+
+            states = []
+
+            def slit_state_clbk(open, az):
+                states.append(open)
+
+            dome.slit_state += slit_state_clbk
+            try:
+                assert wait_for(lambda: states and states[-1] == expected)
+            finally:
+                dome.slit_state -= slit_state_clbk